@@ -25,4 +25,5 @@ from app import *
 
 # Application code
 if __name__ == '__main__':
-    Invaders(width=GAME_WIDTH,height=GAME_HEIGHT).run()
+    Invaders(width=GAME_WIDTH,height=GAME_HEIGHT,step=FRAME_STEP,max_steps=MAX_STEPS,
+             retained=True,atlas=ATLAS_CACHE,overlay=PROFILE_OVERLAY).run()
@@ -11,8 +11,11 @@ Cole Breen (ctb93) Luke Kulm (lbk73)
 December 9, 2021
 """
 from consts import *
-from game2d import *
+from game2d import GameApp, GLabel
 from wave import *
+from replay import ReplayRecorder
+import random
+import sys
 
 
 # PRIMARY RULE: Invaders can only access attributes in wave.py via getters/setters
@@ -73,6 +76,13 @@ class Invaders(GameApp):
     # Attribute _keypressed: determines whether keys were previously pressed
     # Invariant: _keypressed is an int, either 1 or 0... It is 1 if key was
     # previously pressed and 0 if key was not previously pressed
+    #
+    # Attribute _recorder: the recorder for the replay of the current wave
+    # Invariant: _recorder is a ReplayRecorder object, or None if REPLAY_FILE
+    # is None or the wave is complete
+    #
+    # Attribute _config: the settings of every wave, from the command line
+    # Invariant: _config is a GameConfig object
 
     # DO NOT MAKE A NEW INITIALIZER!
 
@@ -94,6 +104,8 @@ class Invaders(GameApp):
         self._state = STATE_INACTIVE
         self._wave = None
         self._keypressed = 0
+        self._recorder = None
+        self._config = GameConfig.fromArgs(sys.argv[1:])
         if self._state == STATE_INACTIVE:
             self._text = GLabel(text= "Press 's' to Play", x = GAME_WIDTH/2, \
             y= GAME_HEIGHT/2, font_name = "Arcade", font_size = 64)
@@ -178,6 +190,9 @@ class Invaders(GameApp):
         if self._state == STATE_CONTINUE:
             self._wave.setNewShip()
             self._state = STATE_ACTIVE
+        if self._state == STATE_COMPLETE and self._recorder != None:
+            self._recorder.close()
+            self._recorder = None
 
     def draw(self):
         """
@@ -192,6 +207,10 @@ class Invaders(GameApp):
         getters for these attributes or you need to add a draw method to
         class Wave.  We suggest the latter.  See the example subcontroller.py
         from class.
+
+        While the wave is active, it is drawn alpha of the way between its
+        last two updates (see GameApp). Otherwise the wave is not updated, so
+        it is drawn as the last update left it.
         """
         if self._state == STATE_PAUSED and self._wave.getLives() > 0:
             self._wave.draw(self.view)
@@ -199,7 +218,8 @@ class Invaders(GameApp):
         elif self._text != None:
             self._text.draw(self.view)
         elif self._wave != None:
-            self._wave.draw(self.view)
+            alpha = self.alpha if self._state == STATE_ACTIVE else 1.0
+            self._wave.draw(self.view,alpha)
 
     # HELPER METHODS FOR THE STATES GO HERE
     def _new_wave(self):
@@ -229,8 +249,17 @@ class Invaders(GameApp):
 
         Creates a Wave object and stores it inside of hidden attribute
         self._wave. It also sets self._state to STATE_ACTIVE.
+
+        The wave gets a fresh random seed. If REPLAY_FILE is not None, the
+        wave is also recorded to that file, so that it can be replayed with
+        the replay module. If the game is profiled, the wave times its stages
+        with the same profiler. The settings of the wave are the ones given on
+        the command line (see GameConfig.fromArgs).
         """
-        self._wave = Wave()
+        seed = random.randrange(2**63)
+        if REPLAY_FILE != None:
+            self._recorder = ReplayRecorder(REPLAY_FILE,seed)
+        self._wave = Wave(seed,self._recorder,self.profiler,self._config)
         self._state = STATE_ACTIVE
 
     def _continue_wave(self):
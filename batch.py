@@ -0,0 +1,507 @@
+"""
+Batch simulation module for Alien Invaders
+
+This module contains the class BatchWave, which plays many independent waves
+of Alien Invaders at once. It follows the same rules as Wave (marching, the
+ALIEN_H_WALK drop at the edges, alien bolts every 1..bolt rate steps, the
+defense line loss and the ship explosion), but stores the state of every game
+in NumPy arrays so that a frame of all N games is a handful of array
+operations. It never creates a GObject, so it does not need game2d at all.
+
+We use this module to tune the difficulty of the game. Every game of a
+batch uses the settings of one GameConfig, as in Wave. The alien speed and
+bolt rate of that config may also be overridden per game, so a single batch
+can sweep across many settings at once.
+
+Cole Breen (ctb93) Luke Kulm (lbk73)
+December 9, 2021
+"""
+from consts import *
+import numpy as np
+
+
+class BatchWave(object):
+    """
+    A class to play N independent waves of Alien Invaders in lockstep.
+
+    The aliens of all games are stored in an (N, rows, cols) array of alive
+    flags. Aliens in a wave always march together, so the position of every
+    alien is its place in the starting grid plus a per-game offset. The
+    bolts are stored in (N, max_bolts) arrays, where a velocity of 0 marks an
+    empty slot. If every slot of a game is in use, new shots in that game are
+    dropped.
+
+    Each call to step advances every game that is not over by one frame, as
+    if Wave.update had been called with STATE_ACTIVE. As in the Simulation
+    class of simulate.py, a destroyed ship is replaced at once while there
+    are lives left. The random choices are drawn from a NumPy generator, so
+    the games follow the rules of Wave but not the exact random sequence of
+    the random module.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _n: the number of games
+    # Invariant: _n is an int > 0
+    #
+    # Attribute _rng: the source of all random choices
+    # Invariant: _rng is a numpy.random.Generator
+    #
+    # Attribute _config: the settings of every game
+    # Invariant: _config is a GameConfig object
+    #
+    # Attribute _speed: the number of seconds between alien steps in each game
+    # Invariant: _speed is an (N,) array of floats > 0
+    #
+    # Attribute _rate: the maximum number of steps between alien bolts
+    # Invariant: _rate is an (N,) array of ints >= 1
+    #
+    # Attribute _alive: whether each alien of each game is alive
+    # Invariant: _alive is an (N, rows, cols) array of bools
+    #
+    # Attribute _colx: the starting x value of each column of aliens
+    # Invariant: _colx is a (cols,) array of floats
+    #
+    # Attribute _rowy: the starting y value of each row of aliens
+    # Invariant: _rowy is a (rows,) array of floats
+    #
+    # Attribute _ox: how far each formation has moved horizontally
+    # Invariant: _ox is an (N,) array of floats
+    #
+    # Attribute _oy: how far each formation has moved vertically
+    # Invariant: _oy is an (N,) array of floats
+    #
+    # Attribute _right: whether each formation is marching right
+    # Invariant: _right is an (N,) array of bools
+    #
+    # Attribute _time: the time since the last alien step of each game
+    # Invariant: _time is an (N,) array of floats >= 0
+    #
+    # Attribute _steps: the alien steps since the last alien bolt of each game
+    # Invariant: _steps is an (N,) array of ints >= 0
+    #
+    # Attribute _next: the number of steps until the next alien bolt
+    # Invariant: _next is an (N,) array of ints in 1.._rate
+    #
+    # Attribute _shipx: the x value of each ship
+    # Invariant: _shipx is an (N,) array of floats
+    #
+    # Attribute _lives: the number of lives left in each game
+    # Invariant: _lives is an (N,) array of ints >= 0
+    #
+    # Attribute _dying: whether the ship of each game is exploding
+    # Invariant: _dying is an (N,) array of bools
+    #
+    # Attribute _dtime: the time since each explosion started
+    # Invariant: _dtime is an (N,) array of floats >= 0
+    #
+    # Attribute _bx, _by: the position of each bolt
+    # Invariant: _bx and _by are (N, max_bolts) arrays of floats
+    #
+    # Attribute _bv: the velocity of each bolt, 0 for an empty slot
+    # Invariant: _bv is an (N, max_bolts) array of floats
+    #
+    # Attribute _bseq: the order in which the bolts were fired
+    # Invariant: _bseq is an (N, max_bolts) array of ints >= 0
+    #
+    # Attribute _seq: the number of bolts fired so far
+    # Invariant: _seq is an int >= 0
+    #
+    # Attribute _won, _lost: whether each game has been won or lost
+    # Invariant: _won and _lost are (N,) arrays of bools
+    #
+    # Attribute _frames: the number of frames each game has played
+    # Invariant: _frames is an (N,) array of ints >= 0
+
+    # GETTERS
+    def getConfig(self):
+        """
+        Returns the GameConfig with the settings of every game.
+        """
+        return self._config
+
+    def getWon(self):
+        """
+        Returns an (N,) array of bools, True for every game that was won.
+        """
+        return self._won.copy()
+
+    def getLost(self):
+        """
+        Returns an (N,) array of bools, True for every game that was lost.
+        """
+        return self._lost.copy()
+
+    def getLives(self):
+        """
+        Returns an (N,) array with the number of lives left in every game.
+        """
+        return self._lives.copy()
+
+    def getFrames(self):
+        """
+        Returns an (N,) array with the number of frames every game has played.
+        """
+        return self._frames.copy()
+
+    def getAliens(self):
+        """
+        Returns an (N,) array with the number of aliens alive in every game.
+        """
+        return self._alive.sum(axis=(1,2))
+
+    def isOver(self):
+        """
+        Returns True if every game has been won or lost, False otherwise.
+        """
+        return bool(np.all(self._won | self._lost))
+
+    # INITIALIZER
+    def __init__(self, n, config=None, alien_speed=None, bolt_rate=None,
+                 max_bolts=16, seed=None):
+        """
+        Initializes N brand new games.
+
+        Parameter n: The number of games
+        Precondition: n is an int > 0
+
+        Parameter config: The settings of every game
+        Precondition: config is a GameConfig object, or None for the defaults
+
+        Parameter alien_speed: The seconds between alien steps
+        Precondition: alien_speed is a float > 0, an (N,) array of them, or
+        None for the alien speed of config
+
+        Parameter bolt_rate: The maximum alien steps between alien bolts
+        Precondition: bolt_rate is an int >= 1, an (N,) array of them, or None
+        for the bolt rate of config
+
+        Parameter max_bolts: The number of bolt slots of each game
+        Precondition: max_bolts is an int > 0
+
+        Parameter seed: The seed of the random generator
+        Precondition: seed is an int, None, or a numpy.random.Generator
+        """
+        self._n = n
+        if isinstance(seed, np.random.Generator):
+            self._rng = seed
+        else:
+            self._rng = np.random.default_rng(seed)
+        if config is None:
+            config = GameConfig()
+        if alien_speed is None:
+            alien_speed = config.getAlienSpeed()
+        if bolt_rate is None:
+            bolt_rate = config.getBoltRate()
+        rows = config.getAlienRows()
+        cols = config.getAliensInRow()
+        self._config = config
+        self._speed = np.broadcast_to(np.asarray(alien_speed,dtype=float),(n,)).copy()
+        self._rate = np.broadcast_to(np.asarray(bolt_rate,dtype=int),(n,)).copy()
+
+        self._alive = np.ones((n,rows,cols),dtype=bool)
+        self._colx = ALIEN_H_SEP+ALIEN_WIDTH/2.0+np.arange(cols)*(ALIEN_WIDTH+ALIEN_H_SEP)
+        self._rowy = GAME_HEIGHT-ALIEN_CEILING-ALIEN_HEIGHT/2.0 \
+                     -np.arange(rows)*(ALIEN_V_SEP+ALIEN_HEIGHT)
+        self._ox = np.zeros(n)
+        self._oy = np.zeros(n)
+        self._right = np.ones(n,dtype=bool)
+        self._time = np.zeros(n)
+        self._steps = np.zeros(n,dtype=int)
+        self._next = self._rng.integers(1,self._rate+1)
+
+        self._shipx = np.full(n,GAME_WIDTH/2.0)
+        self._lives = np.full(n,config.getShipLives())
+        self._dying = np.zeros(n,dtype=bool)
+        self._dtime = np.zeros(n)
+
+        self._bx = np.zeros((n,max_bolts))
+        self._by = np.zeros((n,max_bolts))
+        self._bv = np.zeros((n,max_bolts))
+        self._bseq = np.zeros((n,max_bolts),dtype=int)
+        self._seq = 0
+
+        self._won = np.zeros(n,dtype=bool)
+        self._lost = np.zeros(n,dtype=bool)
+        self._frames = np.zeros(n,dtype=int)
+
+    # METHODS TO PLAY THE GAMES
+    def step(self, left, right, fire, dt=1/60):
+        """
+        Plays a single frame of every game that is not over.
+
+        Each key parameter says, for every game, whether that key is held down
+        in this frame.
+
+        Parameter left: Whether the 'left' key is down in each game
+        Precondition: left is a bool or an (N,) array of bools
+
+        Parameter right: Whether the 'right' key is down in each game
+        Precondition: right is a bool or an (N,) array of bools
+
+        Parameter fire: Whether the 'up' key is down in each game
+        Precondition: fire is a bool or an (N,) array of bools
+
+        Parameter dt: The time in seconds of this frame
+        Precondition: dt is a float > 0
+        """
+        active = ~(self._won | self._lost)
+        calm = active & ~self._dying
+        self._move_ship(np.asarray(left,dtype=bool) & calm,
+                        np.asarray(right,dtype=bool) & calm)
+        self._march(active,dt)
+        self._fire_ship(np.asarray(fire,dtype=bool) & calm)
+        self._move_bolts(active)
+        self._fire_aliens(active & (self._next == self._steps))
+        self._collide_aliens(active)
+        hurt = self._collide_ship(calm)
+        self._explode(active,hurt,dt)
+        self._frames += active
+        self._finish(active)
+
+    def run(self, policy, max_frames, dt=1/60):
+        """
+        Plays every game until it is over or max_frames frames have passed.
+
+        The function policy is called once per frame with this object as its
+        argument. It must return a tuple (left, right, fire) of key states, as
+        in the method step. Returns the tuple (won, lost, lives) of (N,) arrays.
+
+        Parameter policy: The function choosing the keys for each frame
+        Precondition: policy is a function taking a BatchWave and returning a
+        3-element tuple of bools or (N,) arrays of bools
+
+        Parameter max_frames: The maximum number of frames to play
+        Precondition: max_frames is an int >= 0
+
+        Parameter dt: The time in seconds of a single frame
+        Precondition: dt is a float > 0
+        """
+        frame = 0
+        while frame < max_frames and not self.isOver():
+            left, right, fire = policy(self)
+            self.step(left,right,fire,dt)
+            frame += 1
+        return (self.getWon(),self.getLost(),self.getLives())
+
+    # HELPER METHODS FOR A SINGLE FRAME
+    def _move_ship(self, left, right):
+        """
+        Moves each ship left and/or right, keeping it on screen.
+
+        Parameter left: Which games move their ship left
+        Precondition: left is an (N,) array of bools
+
+        Parameter right: Which games move their ship right
+        Precondition: right is an (N,) array of bools
+        """
+        move = self._config.getShipMovement()
+        x = self._shipx
+        x = np.where(left & (x-SHIP_WIDTH/2-move >= 0),x-move,x)
+        x = np.where(right & (x+SHIP_WIDTH/2+move <= GAME_WIDTH),x+move,x)
+        self._shipx = x
+
+    def _march(self, active, dt):
+        """
+        Advances the alien clocks, stepping every formation that is due.
+
+        A formation that is due steps ALIEN_H_WALK in its direction, unless its
+        outermost column is too close to the edge of the window. In that case
+        it drops ALIEN_H_WALK and turns around instead.
+
+        Parameter active: Which games are not over
+        Precondition: active is an (N,) array of bools
+
+        Parameter dt: The time in seconds of this frame
+        Precondition: dt is a float > 0
+        """
+        self._time = np.where(active & (self._time < self._speed),self._time+dt,self._time)
+        due = active & (self._time >= self._speed)
+        if not due.any():
+            return
+
+        cols = self._alive.any(axis=1)
+        leftcol = np.argmax(cols,axis=1)
+        rightcol = cols.shape[1]-1-np.argmax(cols[:,::-1],axis=1)
+        redge = self._colx[rightcol]+self._ox+ALIEN_WIDTH/2+ALIEN_H_SEP > GAME_WIDTH
+        ledge = self._colx[leftcol]+self._ox-ALIEN_WIDTH/2-ALIEN_H_SEP < 0
+        drop = due & np.where(self._right,redge,ledge)
+        walk = due & ~drop
+
+        self._oy = np.where(drop,self._oy-ALIEN_H_WALK,self._oy)
+        self._ox = np.where(walk & self._right,self._ox+ALIEN_H_WALK,self._ox)
+        self._ox = np.where(walk & ~self._right,self._ox-ALIEN_H_WALK,self._ox)
+        self._right = self._right ^ drop
+        self._steps += due
+        self._time = np.where(due,0.0,self._time)
+
+    def _spawn(self, games, x, y, velocity):
+        """
+        Fires a bolt in each of the given games, if it has a free slot.
+
+        Parameter games: The indices of the games firing a bolt
+        Precondition: games is a 1d array of ints
+
+        Parameter x: The x value of each new bolt
+        Precondition: x is an array of floats the same length as games
+
+        Parameter y: The y value of each new bolt
+        Precondition: y is an array of floats the same length as games
+
+        Parameter velocity: The velocity of the new bolts
+        Precondition: velocity is a nonzero int or float
+        """
+        free = self._bv[games] == 0
+        ok = free.any(axis=1)
+        games = games[ok]
+        slot = np.argmax(free[ok],axis=1)
+        self._bx[games,slot] = x[ok]
+        self._by[games,slot] = y[ok]
+        self._bv[games,slot] = velocity
+        self._bseq[games,slot] = self._seq+np.arange(len(games))
+        self._seq += len(games)
+
+    def _fire_ship(self, fire):
+        """
+        Fires a player bolt from each ship that wants to and has none on screen.
+
+        Parameter fire: Which games want to fire
+        Precondition: fire is an (N,) array of bools
+        """
+        fire = fire & ~np.any(self._bv > 0,axis=1)
+        games = np.flatnonzero(fire)
+        if len(games):
+            y = np.full(len(games),SHIP_BOTTOM+SHIP_HEIGHT/2+SHIP_HEIGHT/2)
+            self._spawn(games,self._shipx[games],y,self._config.getBoltSpeed())
+
+    def _move_bolts(self, active):
+        """
+        Moves every bolt and removes the bolts that have left the window.
+
+        Parameter active: Which games are not over
+        Precondition: active is an (N,) array of bools
+        """
+        self._by += np.where(active[:,None],self._bv,0)
+        bottom = self._by-BOLT_HEIGHT/2
+        gone = ((self._bv > 0) & (bottom > GAME_HEIGHT)) | \
+               ((self._bv < 0) & (bottom < 0))
+        self._bv[gone] = 0
+
+    def _fire_aliens(self, shoot):
+        """
+        Fires an alien bolt in each game whose alien clock is due.
+
+        The bolt comes from the lowest alien of a random nonempty column. The
+        number of steps until the next alien bolt is then chosen at random.
+
+        Parameter shoot: Which games fire an alien bolt
+        Precondition: shoot is an (N,) array of bools
+        """
+        games = np.flatnonzero(shoot)
+        if not len(games):
+            return
+        alive = self._alive[games]
+        cols = alive.any(axis=1)
+        pick = self._rng.integers(0,cols.sum(axis=1))
+        col = np.argmax(np.cumsum(cols,axis=1) > pick[:,None],axis=1)
+        colalive = alive[np.arange(len(games)),:,col]
+        row = colalive.shape[1]-1-np.argmax(colalive[:,::-1],axis=1)
+        x = self._colx[col]+self._ox[games]
+        y = self._rowy[row]+self._oy[games]-ALIEN_HEIGHT/2
+        self._spawn(games,x,y,-self._config.getBoltSpeed())
+        self._next[games] = self._rng.integers(1,self._rate[games]+1)
+        self._steps[games] = 0
+
+    def _collide_aliens(self, active):
+        """
+        Kills every alien hit by a player bolt, and removes that bolt.
+
+        As in Wave, a game has at most one player bolt on screen, and a bolt
+        hits an alien if any corner of the box (x+-BOLT_WIDTH, y+-BOLT_HEIGHT)
+        is inside the alien.
+
+        Parameter active: Which games are not over
+        Precondition: active is an (N,) array of bools
+        """
+        player = (self._bv > 0) & active[:,None]
+        games = np.flatnonzero(player.any(axis=1))
+        if not len(games):
+            return
+        slot = np.argmax(player[games],axis=1)
+        x = self._bx[games,slot][:,None]
+        y = self._by[games,slot][:,None]
+        ax = self._colx[None,:]+self._ox[games,None]
+        ay = self._rowy[None,:]+self._oy[games,None]
+        inx = (np.abs(x+BOLT_WIDTH-ax) < ALIEN_WIDTH/2) | \
+              (np.abs(x-BOLT_WIDTH-ax) < ALIEN_WIDTH/2)
+        iny = (np.abs(y+BOLT_HEIGHT-ay) < ALIEN_HEIGHT/2) | \
+              (np.abs(y-BOLT_HEIGHT-ay) < ALIEN_HEIGHT/2)
+        hit = self._alive[games] & iny[:,:,None] & inx[:,None,:]
+        self._alive[games] &= ~hit
+        struck = hit.any(axis=(1,2))
+        self._bv[games[struck],slot[struck]] = 0
+
+    def _collide_ship(self, calm):
+        """
+        Returns an (N,) array of bools, True for every ship hit by an alien bolt.
+
+        As in Wave, only the most recently fired of the bolts that hit a ship
+        is removed.
+
+        Parameter calm: Which games have a ship that is not exploding
+        Precondition: calm is an (N,) array of bools
+        """
+        shipy = SHIP_BOTTOM+SHIP_HEIGHT/2
+        hit = (self._bv < 0) & calm[:,None] & \
+              (np.abs(self._bx-self._shipx[:,None]) < SHIP_WIDTH/2+BOLT_WIDTH) & \
+              (np.abs(self._by-shipy) < SHIP_HEIGHT/2+BOLT_HEIGHT)
+        hurt = hit.any(axis=1)
+        games = np.flatnonzero(hurt)
+        if len(games):
+            slot = np.argmax(np.where(hit[games],self._bseq[games],-1),axis=1)
+            self._bv[games,slot] = 0
+        return hurt
+
+    def _explode(self, active, hurt, dt):
+        """
+        Advances every ship explosion and starts the new ones.
+
+        An explosion lasts until more seconds than the death speed of the
+        GameConfig have passed. At that point a life is lost, every bolt of
+        that game is removed and a new ship is placed in the middle of the
+        screen.
+
+        Parameter active: Which games are not over
+        Precondition: active is an (N,) array of bools
+
+        Parameter hurt: Which ships were hit this frame
+        Precondition: hurt is an (N,) array of bools
+
+        Parameter dt: The time in seconds of this frame
+        Precondition: dt is a float > 0
+        """
+        going = active & self._dying
+        self._dtime = np.where(going,self._dtime+dt,self._dtime)
+        done = going & (self._dtime > self._config.getDeathSpeed())
+        self._lives -= done
+        self._bv[done] = 0
+        self._shipx[done] = GAME_WIDTH/2.0
+        self._dying = (self._dying & ~done) | hurt
+        self._dtime = np.where(hurt,0.0,self._dtime)
+
+    def _finish(self, active):
+        """
+        Marks the games that have been won or lost in this frame.
+
+        A game is won when every alien is dead. It is lost when there are no
+        lives left, or when the bottom of any alien is below the defense line
+        of the GameConfig.
+
+        Parameter active: Which games were not over at the start of the frame
+        Precondition: active is an (N,) array of bools
+        """
+        rows = self._alive.any(axis=2)
+        anyalive = rows.any(axis=1)
+        lowest = rows.shape[1]-1-np.argmax(rows[:,::-1],axis=1)
+        bottom = self._rowy[lowest]+self._oy-ALIEN_HEIGHT/2
+        below = anyalive & (bottom < self._config.getDefenseLine())
+        self._won |= active & ~anyalive
+        self._lost |= active & ((self._lives == 0) | below)
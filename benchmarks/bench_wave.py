@@ -0,0 +1,273 @@
+"""
+Benchmarks for Alien Invaders
+
+This module times Wave.update in scripted scenarios, so that a change that
+slows down the game (such as more work in collide_aliens, the march loops or
+the creation of bolts) shows up before anyone plays it. Every scenario runs
+without a window, using the headless backend of game2d.
+
+The scenarios are
+
+    default:      the standard grid, with the ship sweeping and firing
+    full_grid:    the largest grid allowed, 10 rows of 15 aliens
+    heavy_bolts:  several alien bolts fired every frame, about 150 on screen
+    defense_line: the standard grid marched down just above the defense line
+    ship_death:   the frames around the ship being hit and exploding
+
+Each round plays FRAMES frames (DEATH_FRAMES for ship_death) from a freshly
+built wave, and the time to build the wave is not measured. Besides the
+times, each benchmark stores the cost of a single frame and the memory
+allocated per frame (measured with tracemalloc in a separate run) in the
+extra_info of its results.
+
+The benchmarks need pytest and the pytest-benchmark plugin. Run them from
+the root folder of the game with
+
+    python -m pytest benchmarks/bench_wave.py
+
+and add --benchmark-autosave or --benchmark-compare to track regressions.
+
+Cole Breen (ctb93) Luke Kulm (lbk73)
+December 9, 2021
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import simulate     # Must come before game2d, to guarantee the headless backend
+
+import pytest
+pytest.importorskip('pytest_benchmark')
+
+import wave
+from consts import *
+from game2d.headless import GInput
+
+# The length in seconds of a single frame
+DT = 1/60
+# The number of frames played in each round
+FRAMES = 120
+# The number of frames played around the death of the ship
+DEATH_FRAMES = 30
+# The number of rounds of each benchmark
+ROUNDS = 20
+# The seed of every wave
+SEED = 1110
+# The number of extra alien bolts fired each frame in heavy_bolts
+EXTRA_BOLTS = 4
+# The extra bolts are only fired by aliens left of this x value
+EXTRA_LEFT = GAME_WIDTH/2-SHIP_WIDTH
+# The settings of full_grid, the largest grid allowed
+FULL_GRID = GameConfig(alien_rows=10,aliens_in_row=15)
+
+
+# HELPER FUNCTIONS
+def sweep(frame):
+    """
+    Returns the keys held down in the given frame by the scripted player.
+
+    The player always fires, and sweeps right for a second and then left for
+    a second.
+
+    Parameter frame: The number of the frame
+    Precondition: frame is an int >= 0
+    """
+    return ('up','right') if frame % 120 < 60 else ('up','left')
+
+
+def play(game, input, keys):
+    """
+    Plays a single frame of game with the given keys held down.
+
+    This is the step method of Simulation, except that the frame is played
+    even if the wave is over. A destroyed ship is replaced at once.
+
+    Parameter game: The wave to play
+    Precondition: game is a Wave object
+
+    Parameter input: The input handed to the wave
+    Precondition: input is a headless GInput object
+
+    Parameter keys: The keys held down for this frame
+    Precondition: keys is a tuple of strings
+    """
+    input.set_keys(keys)
+    game.update(input,STATE_ACTIVE,DT)
+    if game.getReset() and game.getLives() > 0:
+        game.setNewShip()
+
+
+def scripted(game, extra=None, start=0):
+    """
+    Returns a function playing the next frame of game with the sweep keys.
+
+    Parameter game: The wave to play
+    Precondition: game is a Wave object
+
+    Parameter extra: A function called with the wave before every frame
+    Precondition: extra is None or a function taking a Wave
+
+    Parameter start: The number of the first frame
+    Precondition: start is an int >= 0
+    """
+    input = GInput()
+    frames = [start]
+    def frame():
+        if not extra is None:
+            extra(game)
+        play(game,input,sweep(frames[0]))
+        frames[0] += 1
+    return frame
+
+
+def fire_extra(game):
+    """
+    Fires EXTRA_BOLTS alien bolts from random alive aliens left of EXTRA_LEFT.
+
+    The scripted player never moves left of the middle of the screen, so
+    these bolts cannot hit the ship. Otherwise the ship is destroyed over and
+    over (losing the wave inside a round) and every death clears the bolts.
+    Nothing is fired if no column of aliens is left of EXTRA_LEFT.
+
+    Parameter game: The wave to fire the bolts in
+    Precondition: game is a Wave object
+    """
+    aliens = game.getAliens()
+    columns = tuple(col for col in game.nonempty()
+        if aliens.getX(0,col) < EXTRA_LEFT)
+    if columns:
+        for _ in range(EXTRA_BOLTS):
+            game.alien_bolt(game.pick_alien(columns))
+
+
+def death_frame():
+    """
+    Returns the first frame after the first death of the scripted player.
+
+    The player stands still (and does not fire) until an alien bolt hits the
+    ship and the explosion is over.
+    """
+    game = wave.Wave(SEED)
+    input = GInput()
+    frame = 0
+    while game.getLives() == SHIP_LIVES:
+        play(game,input,())
+        frame += 1
+    return frame
+
+
+def measure(benchmark, setup, frames):
+    """
+    Benchmarks frames frames of the scenario built by setup.
+
+    The function setup is called before every round, and must return a
+    function that plays one frame. Once the rounds are over, the scenario is
+    played once more under tracemalloc to measure its allocations.
+
+    Parameter benchmark: The pytest-benchmark fixture
+    Precondition: benchmark is a BenchmarkFixture
+
+    Parameter setup: The function building the scenario
+    Precondition: setup is a function with no arguments returning a function
+    with no arguments
+
+    Parameter frames: The number of frames in each round
+    Precondition: frames is an int > 0
+    """
+    def rounds(frame):
+        for _ in range(frames):
+            frame()
+
+    benchmark.pedantic(rounds,setup=lambda: ((setup(),),{}),rounds=ROUNDS,
+                       warmup_rounds=1)
+    benchmark.extra_info['frames'] = frames
+    if benchmark.stats:
+        benchmark.extra_info['seconds_per_frame'] = benchmark.stats.stats.mean/frames
+
+    frame = setup()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        rounds(frame)
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    diff = after.compare_to(before,'filename')
+    benchmark.extra_info['blocks_per_frame'] = sum(s.count_diff for s in diff)/frames
+    benchmark.extra_info['bytes_per_frame'] = sum(s.size_diff for s in diff)/frames
+    benchmark.extra_info['peak_bytes'] = peak
+
+
+# BENCHMARKS
+def test_default(benchmark):
+    """
+    Benchmarks the standard grid with the ship sweeping and firing.
+    """
+    measure(benchmark,lambda: scripted(wave.Wave(SEED)),FRAMES)
+
+
+def test_full_grid(benchmark):
+    """
+    Benchmarks a grid of 10 rows of 15 aliens.
+    """
+    measure(benchmark,lambda: scripted(wave.Wave(SEED,config=FULL_GRID)),FRAMES)
+
+
+def test_heavy_bolts(benchmark):
+    """
+    Benchmarks a wave firing EXTRA_BOLTS extra alien bolts every frame.
+
+    The wave is played FRAMES frames before each round, so that the number
+    of bolts on screen is steady (about 150) when the round starts. The
+    extra bolts miss the ship, so it is never destroyed in a round.
+    """
+    def setup():
+        game = wave.Wave(SEED)
+        frame = scripted(game,fire_extra)
+        for _ in range(FRAMES):
+            frame()
+        return frame
+    measure(benchmark,setup,FRAMES)
+
+
+def test_defense_line(benchmark):
+    """
+    Benchmarks the standard grid marched down just above the defense line.
+
+    The number of alien steps before the aliens reach the line is found once.
+    Before each round, a new wave is marched to one step more than a round
+    plays before that, so the wave is never lost inside a round.
+    """
+    game = wave.Wave(SEED)
+    steps = 0
+    while not game.lose():
+        game.alien_move(ALIEN_SPEED)
+        steps += 1
+
+    def setup():
+        game = wave.Wave(SEED)
+        for _ in range(steps-int(FRAMES*DT/ALIEN_SPEED)-1):
+            game.alien_move(ALIEN_SPEED)
+        return scripted(game)
+    measure(benchmark,setup,FRAMES)
+
+
+def test_ship_death(benchmark):
+    """
+    Benchmarks the DEATH_FRAMES frames ending with the first death of a ship.
+
+    These frames include the hit, the explosion animation and the new ship.
+    """
+    end = death_frame()
+    start = max(end-DEATH_FRAMES,0)
+
+    def setup():
+        game = wave.Wave(SEED)
+        input = GInput()
+        for _ in range(start):
+            play(game,input,())
+        return lambda: play(game,input,())
+    measure(benchmark,setup,end-start)
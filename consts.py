@@ -10,7 +10,6 @@ Cole Breen (ctb93) Luke Kulm (lbk73)
 December 9, 2021
 """
 import introcs
-import sys
 
 ### WINDOW CONSTANTS (all coordinates are in pixels) ###
 
@@ -75,6 +74,34 @@ BOLT_HEIGHT = 16
 BOLT_SPEED  = 10
 # the number of ALIEN STEPS (not frames) between bolts
 BOLT_RATE   = 5
+# the number of bolts allocated up front by each wave
+BOLT_POOL   = 32
+
+
+### REPLAY CONSTANTS ###
+
+# the file to record a replay of each wave to, or None to not record replays
+REPLAY_FILE = None
+
+
+### TIMESTEP CONSTANTS ###
+
+# the fixed time in seconds of every update, so the game speed ignores the frame rate
+FRAME_STEP = 1/60
+# the most updates run in one frame to catch up, before the game slows down instead
+MAX_STEPS = 4
+
+
+### ATLAS CONSTANTS ###
+
+# the file (in the game folder) caching the texture atlas of the Images folder
+ATLAS_CACHE = 'Images.atlas.npz'
+
+
+### PROFILER CONSTANTS ###
+
+# whether to time every frame and show the timings on top of the game
+PROFILE_OVERLAY = False
 
 
 ### GAME CONSTANTS ###
@@ -93,36 +120,256 @@ STATE_CONTINUE = 4
 STATE_COMPLETE = 5
 
 
-### USE COMMAND LINE ARGUMENTS TO CHANGE NUMBER OF ALIENS IN A ROW
-"""
-sys.argv is a list of the command line arguments when you run Python. These
-arguments are everything after the word python. So if you start the game typing
+### RUNTIME CONFIGURATION ###
 
-    python invaders 3 4 0.5
+class GameConfig(object):
+    """
+    A class to represent the settings of a single game.
 
-Python puts ['breakout.py', '3', '4', '0.5'] into sys.argv. Below, we take
-advantage of this fact to change the constants ALIEN_ROWS, ALIENS_IN_ROW, and
-ALIEN_SPEED.
-"""
-try:
-    rows = int(sys.argv[1])
-    if rows >= 1 and rows <= 10:
-        ALIEN_ROWS = rows
-except:
-    pass # Use original value
-
-try:
-    perrow = int(sys.argv[2])
-    if perrow >= 1 and perrow <= 15:
-        ALIENS_IN_ROW = perrow
-except:
-    pass # Use original value
-
-try:
-    speed = float(sys.argv[3])
-    if speed > 0 and speed <= 3:
-        ALIEN_SPEED = speed
-except:
-    pass # Use original value
-
-### ADD MORE CONSTANTS (PROPERLY COMMENTED) AS NECESSARY ###
+    The constants above are shared by every game in a process. The settings
+    in this class are the ones that may differ from one wave to the next:
+    the size of the grid of aliens, how fast the aliens march and fire, and
+    the ship and bolt rules. A GameConfig is passed to Wave, which hands it
+    to the models, so one process may play many differently configured
+    waves at once. Every setting defaults to the constant of the same name.
+
+    A GameConfig never changes once it is made. Use the method replace to
+    make a copy with different settings.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _rows: the number of rows of aliens (ALIEN_ROWS)
+    # Invariant: _rows is an int in 1..10
+    #
+    # Attribute _perrow: the number of aliens per row (ALIENS_IN_ROW)
+    # Invariant: _perrow is an int in 1..15
+    #
+    # Attribute _speed: the seconds between alien steps (ALIEN_SPEED)
+    # Invariant: _speed is a float > 0
+    #
+    # Attribute _rate: the most alien steps between bolts (BOLT_RATE)
+    # Invariant: _rate is an int >= 1
+    #
+    # Attribute _bolt_speed: the pixels a bolt moves per update (BOLT_SPEED)
+    # Invariant: _bolt_speed is an int or float > 0
+    #
+    # Attribute _lives: the number of lives of the ship (SHIP_LIVES)
+    # Invariant: _lives is an int >= 1
+    #
+    # Attribute _movement: the pixels the ship moves per update (SHIP_MOVEMENT)
+    # Invariant: _movement is an int or float > 0
+    #
+    # Attribute _death: the seconds of the ship explosion (DEATH_SPEED)
+    # Invariant: _death is a float > 0
+    #
+    # Attribute _dline: the y-coordinate of the defense line (DEFENSE_LINE)
+    # Invariant: _dline is an int or float >= 0
+
+    # GETTERS
+    def getAlienRows(self):
+        """
+        Returns the number of rows of aliens.
+        """
+        return self._rows
+
+    def getAliensInRow(self):
+        """
+        Returns the number of aliens per row.
+        """
+        return self._perrow
+
+    def getAlienSpeed(self):
+        """
+        Returns the number of seconds between alien steps.
+        """
+        return self._speed
+
+    def getBoltRate(self):
+        """
+        Returns the largest number of alien steps between alien bolts.
+        """
+        return self._rate
+
+    def getBoltSpeed(self):
+        """
+        Returns the number of pixels a bolt moves per update.
+        """
+        return self._bolt_speed
+
+    def getShipLives(self):
+        """
+        Returns the number of lives of the ship.
+        """
+        return self._lives
+
+    def getShipMovement(self):
+        """
+        Returns the number of pixels the ship moves per update.
+        """
+        return self._movement
+
+    def getDeathSpeed(self):
+        """
+        Returns the number of seconds of the ship explosion.
+        """
+        return self._death
+
+    def getDefenseLine(self):
+        """
+        Returns the y-coordinate of the defense line.
+        """
+        return self._dline
+
+    # INITIALIZER
+    def __init__(self, alien_rows=ALIEN_ROWS, aliens_in_row=ALIENS_IN_ROW,
+                 alien_speed=ALIEN_SPEED, bolt_rate=BOLT_RATE,
+                 bolt_speed=BOLT_SPEED, ship_lives=SHIP_LIVES,
+                 ship_movement=SHIP_MOVEMENT, death_speed=DEATH_SPEED,
+                 defense_line=DEFENSE_LINE):
+        """
+        Initializes a configuration with the given settings.
+
+        Parameter alien_rows: The number of rows of aliens
+        Precondition: alien_rows is an int in 1..10
+
+        Parameter aliens_in_row: The number of aliens per row
+        Precondition: aliens_in_row is an int in 1..15
+
+        Parameter alien_speed: The number of seconds between alien steps
+        Precondition: alien_speed is an int or float > 0
+
+        Parameter bolt_rate: The largest number of alien steps between bolts
+        Precondition: bolt_rate is an int >= 1
+
+        Parameter bolt_speed: The number of pixels a bolt moves per update
+        Precondition: bolt_speed is an int or float > 0
+
+        Parameter ship_lives: The number of lives of the ship
+        Precondition: ship_lives is an int >= 1
+
+        Parameter ship_movement: The number of pixels the ship moves per update
+        Precondition: ship_movement is an int or float > 0
+
+        Parameter death_speed: The number of seconds of the ship explosion
+        Precondition: death_speed is an int or float > 0
+
+        Parameter defense_line: The y-coordinate of the defense line
+        Precondition: defense_line is an int or float >= 0
+        """
+        assert type(alien_rows) == int and 1 <= alien_rows <= 10, \
+            'alien_rows %s is not an int in 1..10' % repr(alien_rows)
+        assert type(aliens_in_row) == int and 1 <= aliens_in_row <= 15, \
+            'aliens_in_row %s is not an int in 1..15' % repr(aliens_in_row)
+        assert type(alien_speed) in [int,float] and alien_speed > 0, \
+            'alien_speed %s is not a positive number' % repr(alien_speed)
+        assert type(bolt_rate) == int and bolt_rate >= 1, \
+            'bolt_rate %s is not an int >= 1' % repr(bolt_rate)
+        assert type(bolt_speed) in [int,float] and bolt_speed > 0, \
+            'bolt_speed %s is not a positive number' % repr(bolt_speed)
+        assert type(ship_lives) == int and ship_lives >= 1, \
+            'ship_lives %s is not an int >= 1' % repr(ship_lives)
+        assert type(ship_movement) in [int,float] and ship_movement > 0, \
+            'ship_movement %s is not a positive number' % repr(ship_movement)
+        assert type(death_speed) in [int,float] and death_speed > 0, \
+            'death_speed %s is not a positive number' % repr(death_speed)
+        assert type(defense_line) in [int,float] and defense_line >= 0, \
+            'defense_line %s is not a number >= 0' % repr(defense_line)
+        self._rows = alien_rows
+        self._perrow = aliens_in_row
+        self._speed = alien_speed
+        self._rate = bolt_rate
+        self._bolt_speed = bolt_speed
+        self._lives = ship_lives
+        self._movement = ship_movement
+        self._death = death_speed
+        self._dline = defense_line
+
+    def __repr__(self):
+        """
+        Returns the settings of this configuration as a constructor call.
+        """
+        return ('GameConfig(alien_rows=%r, aliens_in_row=%r, alien_speed=%r, '
+            'bolt_rate=%r, bolt_speed=%r, ship_lives=%r, ship_movement=%r, '
+            'death_speed=%r, defense_line=%r)' % self._settings())
+
+    def __eq__(self, other):
+        """
+        Returns True if other is a GameConfig with the same settings.
+
+        Parameter other: The value to compare to
+        Precondition: None
+        """
+        return isinstance(other,GameConfig) and \
+            self._settings() == other._settings()
+
+    def __hash__(self):
+        """
+        Returns the hash of the settings of this configuration.
+        """
+        return hash(self._settings())
+
+    # METHODS TO MAKE NEW CONFIGURATIONS
+    def replace(self, **settings):
+        """
+        Returns a copy of this configuration with some settings changed.
+
+        The settings are keyword arguments with the names of the parameters
+        of the initializer, such as config.replace(alien_rows=10).
+
+        Parameter settings: The settings to change
+        Precondition: settings are valid arguments for the initializer
+        """
+        names = ('alien_rows','aliens_in_row','alien_speed','bolt_rate',
+            'bolt_speed','ship_lives','ship_movement','death_speed',
+            'defense_line')
+        values = dict(zip(names,self._settings()))
+        values.update(settings)
+        return GameConfig(**values)
+
+    @classmethod
+    def fromArgs(cls, args):
+        """
+        Returns the configuration given by the command line arguments args.
+
+        If you start the game typing
+
+            python invaders 3 4 0.5
+
+        then sys.argv[1:] is ['3', '4', '0.5']. The arguments are, in order,
+        the number of rows of aliens (1..10), the number of aliens per row
+        (1..15) and the seconds between alien steps (0 < speed <= 3). A
+        missing or invalid argument keeps the default of that setting.
+
+        Parameter args: The command line arguments after the script name
+        Precondition: args is a list of strings
+        """
+        settings = {}
+        try:
+            rows = int(args[0])
+            if rows >= 1 and rows <= 10:
+                settings['alien_rows'] = rows
+        except:
+            pass # Use original value
+
+        try:
+            perrow = int(args[1])
+            if perrow >= 1 and perrow <= 15:
+                settings['aliens_in_row'] = perrow
+        except:
+            pass # Use original value
+
+        try:
+            speed = float(args[2])
+            if speed > 0 and speed <= 3:
+                settings['alien_speed'] = speed
+        except:
+            pass # Use original value
+        return cls(**settings)
+
+    # HELPER METHODS
+    def _settings(self):
+        """
+        Returns a tuple of every setting, in the order of the initializer.
+        """
+        return (self._rows, self._perrow, self._speed, self._rate,
+            self._bolt_speed, self._lives, self._movement, self._death,
+            self._dline)
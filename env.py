@@ -0,0 +1,294 @@
+"""
+Reinforcement learning environment for Alien Invaders
+
+This module contains the class InvadersEnv, which wraps a single wave of
+Alien Invaders in the reset/step interface of Gym (and its successor,
+Gymnasium). We use it to train bots against the game. It plays the wave
+with a Simulation from simulate.py, so it uses the headless backend of
+game2d and never imports Kivy or draws anything.
+
+Each action is one of the entries of ACTIONS, the keys held down for a
+step. These are the 'left', 'right' and 'up' keys read by the methods
+left_right_ship and bolt_update of Wave. With a frame skip, each step holds
+the keys down for several frames and adds up their rewards.
+
+The observation is a flat NumPy array of float32 values (see the method
+observe), and the reward of a step is REWARD_ALIEN for each alien killed,
+REWARD_LIFE for each life lost, and REWARD_WIN or REWARD_LOSE when the
+wave ends. The environment does not depend on the gym package. It follows
+the interface of gymnasium.Env, so it is easy to wrap as one.
+
+Cole Breen (ctb93) Luke Kulm (lbk73)
+December 9, 2021
+"""
+import simulate     # Must come before game2d, to guarantee the headless backend
+
+import random
+import numpy as np
+from consts import *
+
+# The keys held down for each action
+ACTIONS = ((), ('left',), ('right',), ('up',), ('left','up'), ('right','up'))
+# The number of bolts described in each observation
+OBS_BOLTS = 8
+# The number of values describing the ship, the lives and the formation
+OBS_HEADER = 6
+# The reward for killing an alien
+REWARD_ALIEN = 1.0
+# The reward for losing a life
+REWARD_LIFE = -10.0
+# The reward for winning the wave
+REWARD_WIN = 50.0
+# The reward for losing the wave
+REWARD_LOSE = -50.0
+
+
+class InvadersEnv(object):
+    """
+    A class to play a wave of Alien Invaders one action at a time.
+
+    Call reset to start a new wave, and then step with an action until the
+    wave is over or truncated. Both return an observation of the game, and
+    step also returns the reward for that step:
+
+        env = InvadersEnv(frame_skip=4)
+        obs, info = env.reset(seed=1110)
+        done = False
+        while not done:
+            obs, reward, over, cut, info = env.step(policy(obs))
+            done = over or cut
+
+    The observation is an array of getObservationSize() float32 values:
+
+        [0]  the x value of the ship, as a fraction of GAME_WIDTH
+        [1]  1 if the ship is exploding, 0 otherwise
+        [2]  the lives left, as a fraction of the ship lives
+        [3]  1 if the aliens are marching right, -1 if left
+        [4]  the x value of the top left alien, as a fraction of GAME_WIDTH
+        [5]  the y value of the top left alien, as a fraction of GAME_HEIGHT
+
+    followed by the alive flags of the rows*perrow aliens of the GameConfig
+    in row-major order (row 0 is the top row), and then OBS_BOLTS triples
+    (x, y, owner) for the lowest bolts on screen. The owner is 1 for a
+    player bolt and -1 for an alien bolt, and unused triples are all 0. The
+    aliens always march together, so every alien position follows from the
+    top left one and the grid spacing, even if that alien is dead.
+
+    Every call returns a new array, so an observation can be kept (such as
+    in a replay buffer) without copying it.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _sim: the simulation of the current wave
+    # Invariant: _sim is a Simulation object, or None before the first reset
+    #
+    # Attribute _dt: the time in seconds of a single frame
+    # Invariant: _dt is a float > 0
+    #
+    # Attribute _skip: the number of frames played by each step
+    # Invariant: _skip is an int > 0
+    #
+    # Attribute _max_steps: the number of steps before the wave is truncated
+    # Invariant: _max_steps is an int > 0 or None (for no limit)
+    #
+    # Attribute _steps: the number of steps since the last reset
+    # Invariant: _steps is an int >= 0
+    #
+    # Attribute _seeds: the source of the seed of each new wave
+    # Invariant: _seeds is a random.Random object
+    #
+    # Attribute _aliens: the number of aliens alive after the last step
+    # Invariant: _aliens is an int >= 0
+    #
+    # Attribute _lives: the number of lives left after the last step
+    # Invariant: _lives is an int >= 0
+    #
+    # Attribute _obs: the buffer filled with the observation of every step
+    # Invariant: _obs is a 1d NumPy array of float32
+    #
+    # Attribute _config: the settings of every wave
+    # Invariant: _config is a GameConfig object
+
+    # GETTERS AND SETTERS
+    def getSimulation(self):
+        """
+        Returns the Simulation of the current wave (None before reset).
+        """
+        return self._sim
+
+    def getConfig(self):
+        """
+        Returns the GameConfig with the settings of every wave.
+        """
+        return self._config
+
+    def getActionCount(self):
+        """
+        Returns the number of actions, the length of ACTIONS.
+        """
+        return len(ACTIONS)
+
+    def getObservationSize(self):
+        """
+        Returns the number of values in each observation.
+        """
+        return len(self._obs)
+
+    def getFrameSkip(self):
+        """
+        Returns the number of frames played by each step.
+        """
+        return self._skip
+
+    def getSteps(self):
+        """
+        Returns the number of steps since the last reset.
+        """
+        return self._steps
+
+    # INITIALIZER
+    def __init__(self, frame_skip=1, max_steps=None, dt=1/60, seed=None,
+                 config=None):
+        """
+        Initializes an environment with no wave. Call reset to start one.
+
+        Parameter frame_skip: The number of frames played by each step
+        Precondition: frame_skip is an int > 0
+
+        Parameter max_steps: The number of steps before a wave is truncated
+        Precondition: max_steps is an int > 0 or None (for no limit)
+
+        Parameter dt: The time in seconds of a single frame
+        Precondition: dt is a float > 0
+
+        Parameter seed: The seed of the seeds of the waves made by reset
+        Precondition: seed is an int or None (for an unpredictable seed)
+
+        Parameter config: The settings of every wave
+        Precondition: config is a GameConfig object, or None for the defaults
+        """
+        assert type(frame_skip) == int and frame_skip > 0, \
+            'frame_skip %s is not a valid int' % repr(frame_skip)
+        assert max_steps is None or (type(max_steps) == int and max_steps > 0), \
+            'max_steps %s is not a valid int' % repr(max_steps)
+        if config is None:
+            config = GameConfig()
+        self._config = config
+        self._sim = None
+        self._dt = dt
+        self._skip = frame_skip
+        self._max_steps = max_steps
+        self._steps = 0
+        self._seeds = random.Random(seed)
+        self._aliens = 0
+        self._lives = 0
+        self._obs = np.zeros(OBS_HEADER+self._aliensSize()+3*OBS_BOLTS,
+            dtype=np.float32)
+
+    # METHODS TO PLAY THE GAME
+    def reset(self, seed=None):
+        """
+        Starts a new wave and returns the tuple (observation, info).
+
+        If seed is None, the wave is seeded from the seed of this
+        environment, so a sequence of resets is reproducible. The info is a
+        dictionary, as described in the method step.
+
+        Parameter seed: The seed of the random choices of the new wave
+        Precondition: seed is an int or None
+        """
+        if seed is None:
+            seed = self._seeds.randrange(2**32)
+        self._sim = simulate.Simulation(self._dt,seed,None,self._config)
+        self._steps = 0
+        self._aliens = self._sim.getWave().getAliens().getCount()
+        self._lives = self._sim.getWave().getLives()
+        return (self.observe(),self._info())
+
+    def step(self, action):
+        """
+        Plays one step and returns (observation, reward, terminated,
+        truncated, info).
+
+        The keys of ACTIONS[action] are held down for getFrameSkip() frames,
+        or until the wave is over. The reward is the sum of the rewards of
+        those frames. The value terminated is True if the wave was won or
+        lost, and truncated is True if the wave was cut off after max_steps
+        steps. The info is a dictionary with the keys 'frames', 'aliens',
+        'lives', 'won' and 'lost'.
+
+        Parameter action: The action to take
+        Precondition: action is an int in 0..getActionCount()-1, and reset
+        has been called since the wave was last over
+        """
+        assert not self._sim is None, 'reset must be called before step'
+        keys = ACTIONS[action]
+        wave = self._sim.getWave()
+        ended = over = self._sim.isOver()
+        for _ in range(self._skip):
+            if over:
+                break
+            over = self._sim.step(keys)
+        self._steps += 1
+
+        aliens = wave.getAliens().getCount()
+        lives = wave.getLives()
+        reward = REWARD_ALIEN*(self._aliens-aliens)+REWARD_LIFE*(self._lives-lives)
+        if not ended and wave.win():
+            reward += REWARD_WIN
+        elif not ended and wave.lose():
+            reward += REWARD_LOSE
+        self._aliens = aliens
+        self._lives = lives
+
+        truncated = (not over and self._max_steps is not None
+            and self._steps >= self._max_steps)
+        return (self.observe(),reward,over,truncated,self._info())
+
+    def observe(self):
+        """
+        Returns the observation of the current wave.
+
+        The layout of the array is described in the class specification.
+        The values are computed in a buffer kept by this environment, and a
+        copy of it is returned.
+
+        Precondition: reset has been called
+        """
+        wave = self._sim.getWave()
+        obs = self._obs
+        ship = wave.getShip()
+        obs[0] = 0 if ship is None else ship.getX()/GAME_WIDTH
+        obs[1] = wave.isExploding()
+        obs[2] = wave.getLives()/self._config.getShipLives()
+        obs[3] = 1 if wave.getDirection() == 'right' else -1
+        aliens = wave.getAliens()
+        obs[4] = aliens.getX(0,0)/GAME_WIDTH
+        obs[5] = aliens.getY(0,0)/GAME_HEIGHT
+
+        end = OBS_HEADER+self._aliensSize()
+        obs[OBS_HEADER:end] = aliens.getAlive().ravel()
+
+        bolts = obs[end:].reshape(OBS_BOLTS,3)
+        bolts[:] = 0
+        xs, ys, vs = wave.getBolts().getArrays()
+        lowest = np.argsort(ys,kind='stable')[:OBS_BOLTS]
+        n = len(lowest)
+        bolts[:n,0] = xs[lowest]/GAME_WIDTH
+        bolts[:n,1] = ys[lowest]/GAME_HEIGHT
+        bolts[:n,2] = np.sign(vs[lowest])
+        return obs.copy()
+
+    # HELPER METHODS
+    def _aliensSize(self):
+        """
+        Returns the number of aliens in each wave.
+        """
+        return self._config.getAlienRows()*self._config.getAliensInRow()
+
+    def _info(self):
+        """
+        Returns the info dictionary of the current wave.
+        """
+        wave = self._sim.getWave()
+        return {'frames': self._sim.getFrames(), 'aliens': self._aliens,
+            'lives': self._lives, 'won': wave.win(), 'lost': wave.lose()}
@@ -4,13 +4,77 @@ A module to support simple 2D game development.
 This module is a simple wrapper around Kivy interfaces to make 2D game development
 simpler for students in CS 1110.
 
+If the environment variable ``GAME2D_HEADLESS`` is set (to anything other than ``0``
+or the empty string) before this package is first imported, the package exports the
+classes in :mod:`game2d.headless` instead.  These have the same geometry, but never
+import Kivy, so a game model can be simulated without a window.  There is no
+:class:`GameApp` in headless mode.  The :class:`Profiler` and the software audio
+:class:`Mixer` do not need Kivy, and are exported in both modes.
+
+The submodules are imported lazily.  Importing this package imports none of them,
+and each class is imported (with Kivy and anything else it needs) the first time it
+is accessed.  So a game that only imports the classes it uses, as in::
+
+    from game2d import GameApp, GLabel
+
+never loads the modules for the other classes.  The statement ``from game2d import *``
+still imports every class.
+
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from .gobject import GObject, GScene
-from .grectangle import GRectangle, GEllipse, GImage, GLabel
-from .gsprite import GSprite
-from .gpath import GPath, GTriangle, GPolygon
-from .gview import GInput, GView
-from .sound import Sound, SoundLibrary
-from .app import GameApp
\ No newline at end of file
+import os
+import importlib
+
+HEADLESS = os.environ.get('GAME2D_HEADLESS','0') not in ('','0')
+
+# The submodule defining each exported class
+if HEADLESS:
+    _EXPORTS = {
+        'GObject': 'headless', 'GScene': 'headless',
+        'GRectangle': 'headless', 'GEllipse': 'headless', 'GImage': 'headless',
+        'GLabel': 'headless', 'GSprite': 'headless', 'GImageBatch': 'headless',
+        'GPath': 'headless', 'GTriangle': 'headless', 'GPolygon': 'headless',
+        'GInput': 'headless', 'GView': 'headless',
+        'Sound': 'headless', 'SoundPool': 'headless', 'SoundLibrary': 'headless',
+        'Profiler': 'profiler', 'Timing': 'profiler',
+        'Mixer': 'mixer', 'MixerSound': 'mixer',
+    }
+else:
+    _EXPORTS = {
+        'GObject': 'gobject', 'GScene': 'gobject',
+        'GRectangle': 'grectangle', 'GEllipse': 'grectangle', 'GImage': 'grectangle',
+        'GLabel': 'grectangle', 'GSprite': 'gsprite', 'GImageBatch': 'gbatch',
+        'GPath': 'gpath', 'GTriangle': 'gpath', 'GPolygon': 'gpath',
+        'GInput': 'gview', 'GView': 'gview',
+        'Sound': 'sound', 'SoundPool': 'sound', 'SoundLibrary': 'sound',
+        'Profiler': 'profiler', 'Timing': 'profiler',
+        'Mixer': 'mixer', 'MixerSound': 'mixer',
+        'GameApp': 'app',
+    }
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """
+    Returns: the exported class ``name``, importing its submodule on first access
+
+    The class is then stored in this package, so this is only called once per class.
+
+    :param name: the name of the class
+    :type name:  ``str``
+    """
+    if not name in _EXPORTS:
+        raise AttributeError('module %s has no attribute %s' % (repr(__name__),repr(name)))
+    module = importlib.import_module('.'+_EXPORTS[name],__name__)
+    value = getattr(module,name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """
+    Returns: the names in this package, including the classes not yet imported
+    """
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -7,8 +7,6 @@ The primary class for 2D game support.
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-import datetime
-
 # Basic Kivy Modules
 import kivy
 import kivy.app
@@ -16,9 +14,9 @@ import kivy.app
 # Lower-level kivy modules to support animation
 from kivy.config import Config
 from kivy.clock  import Clock
-import numpy as np
 
 import os.path
+from .profiler import Profiler
 
 class GameApp(kivy.app.App):
     """
@@ -38,9 +36,30 @@ class GameApp(kivy.app.App):
     
     :meth:`draw`: This method draws all of the objects to the screen.  The only 
     thing you should have in this method are calls to ``self.view.draw()``.
+    
+    By default, :meth:`update` is called once per animation frame with the time since
+    the last frame.  If you set the attribute ``step``, the game instead runs with a
+    fixed timestep: every call to :meth:`update` gets exactly ``step`` seconds, and it
+    is called as many times as needed (up to ``max_steps``) to catch up with the real
+    time that has passed.  The game then runs at the same speed no matter the frame 
+    rate.  The attribute ``alpha`` tells :meth:`draw` how far the display is between 
+    the last two updates, and :meth:`draw` should show each moving object that far 
+    between its two positions.  Otherwise objects are shown where the last update 
+    left them, and motion stutters when the frame rate and ``step`` disagree.
+    
+    If the game is created with the keyword ``profile``, every frame is timed by the
+    :class:`Profiler` in the attribute ``profiler``, with separate sections for 
+    clearing the view, :meth:`update`, :meth:`draw` and the whole frame.  A game may 
+    pass this profiler on to its subcontrollers to time their stages as well.
     """
+    # The number of frames between refreshes of the profiler overlay
+    OVERLAY_RATE = 30
     # Class attribute for tracking textures (to reduce memory footprint)
     TEXTURE_CACHE = {}
+    # Class attribute for tracking the frames of sprite filmstrips, keyed by (name, format)
+    FRAME_CACHE = {}
+    # Class attribute for the texture atlas of the Images folder (None if not loaded)
+    ATLAS = None
     
     
     # MUTABLE ATTRIBUTES
@@ -66,7 +85,109 @@ class GameApp(kivy.app.App):
         Clock.schedule_interval(self._refresh,1.0/self._fps)
     
     
+    @property
+    def step(self):
+        """
+        The fixed timestep in seconds, or None to update once per frame.
+        
+        If this value is not None, every call to :meth:`update` is passed exactly this
+        value as ``dt``.  The leftover time from each frame is carried over to the next.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._step
+    
+    @step.setter
+    def step(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._step = value
+        self._accum = 0.0
+        self._alpha = 1.0 if value is None else 0.0
+    
+    @property
+    def max_steps(self):
+        """
+        The maximum number of fixed timesteps to process in a single frame.
+        
+        This bounds the cost of a frame when the game falls behind (for example, on a
+        slow machine).  Any time left over beyond this many steps is dropped, so the
+        game slows down instead of spiraling further behind.  This value is unused if
+        ``step`` is None.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._max_steps
+    
+    @max_steps.setter
+    def max_steps(self,value):
+        assert type(value) == int, 'value %s is not an int' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._max_steps = value
+    
+    
+    @property
+    def overlay(self):
+        """
+        Whether to show the profiler statistics on top of the game.
+        
+        The overlay is a :class:`GLabel` in the top left corner of the window, with the
+        50th, 95th and 99th percentile of every profiler section in milliseconds.  It
+        is refreshed every ``OVERLAY_RATE`` frames, as rendering text is expensive.  This
+        value is always False if ``profiler`` is None.
+        
+        **Invariant**: Must be a bool.
+        """
+        return self._overlay
+    
+    @overlay.setter
+    def overlay(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._overlay = value and not self._profiler is None
+        self._label = None
+    
+    
     # IMMUTABLE PROPERTIES
+    @property
+    def soundlib(self):
+        """
+        The library of every file in the **Sounds** folder, or None if not preloaded.
+        
+        If the game is created with the keyword ``preload``, this library loads every 
+        sound file in a background thread when the game starts.  The sounds are keyed by
+        file name, so a sound effect is played with::
+            
+            self.soundlib['pew1.wav'].play()
+        
+        See :class:`SoundLibrary` for more information.
+        
+        **Invariant**: Must be a :class:`SoundLibrary` or None.
+        """
+        return self._soundlib
+    
+    @property
+    def profiler(self):
+        """
+        The profiler timing every frame, or None if the game is not profiled.
+        
+        **Invariant**: Must be a :class:`Profiler` or None.
+        """
+        return self._profiler
+    
+    @property
+    def alpha(self):
+        """
+        The fraction of a fixed timestep that has passed since the last update.
+        
+        To interpolate, :meth:`draw` should show each object ``alpha`` of the way from
+        its position before the last update to its position after it.  The subclass
+        must keep both positions itself.  This value is always 1 if ``step`` is None,
+        as every frame then shows the state of the last update.
+        
+        **Invariant**: Must be a float in 0..1.
+        """
+        return self._alpha
+    
     @property
     def width(self):
         """
@@ -171,7 +292,8 @@ class GameApp(kivy.app.App):
         
         The ``name`` must refer to the file in the **Images** folder.  If the texture
         has already been loaded, it will return the cached texture.  Otherwise, it will
-        load the texture and cache it before returning it.
+        load the texture and cache it before returning it.  If an atlas is loaded (see
+        :meth:`load_atlas`), the texture is a region of the atlas texture instead.
         
         This method will crash if name is not a valid file.
         
@@ -182,6 +304,11 @@ class GameApp(kivy.app.App):
         if name in cls.TEXTURE_CACHE:
             return cls.TEXTURE_CACHE[name]
         
+        if cls.ATLAS is not None and name in cls.ATLAS:
+            texture = cls.ATLAS.get_texture(name)
+            cls.TEXTURE_CACHE[name] = texture
+            return texture
+        
         try:
             from kivy.core.image import Image
             texture = Image(name).texture
@@ -204,6 +331,8 @@ class GameApp(kivy.app.App):
         :type name:  ``str``
         """
         assert type(name) == str, '%s is not a valid texture name' % repr(name)
+        for key in [key for key in cls.FRAME_CACHE if key[0] == name]:
+            del cls.FRAME_CACHE[key]
         if name in cls.TEXTURE_CACHE:
             texture = cls.TEXTURE_CACHE[name]
             del cls.TEXTURE_CACHE[name]
@@ -211,6 +340,83 @@ class GameApp(kivy.app.App):
         
         return None
     
+    @classmethod
+    def load_frames(cls,name,format):
+        """
+        Returns: The frames of a sprite filmstrip, or None if the file cannot be loaded
+        
+        The image is divided into a grid with ``format`` rows and columns, and the 
+        frames are the texture regions of that grid, ordered left-to-right, top-to-bottom.
+        The frames are cached, so every sprite with the same file and format shares the
+        same tuple of regions, and they are computed only once.  If an atlas is loaded,
+        the frames are regions of the atlas texture.
+        
+        :param name: The file name
+        :type name:  ``str``
+        
+        :param format: The number of rows and columns of the filmstrip
+        :type format:  2-element tuple of ints > 0
+        """
+        key = (name,format)
+        if key in cls.FRAME_CACHE:
+            return cls.FRAME_CACHE[key]
+        
+        if cls.ATLAS is not None and name in cls.ATLAS:
+            frames = cls.ATLAS.get_frames(name,format)
+        else:
+            texture = cls.load_texture(name)
+            if not texture:
+                return None
+            width  = texture.width/format[1]
+            height = texture.height/format[0]
+            frames = []
+            for row in range(format[0]):
+                for col in range(format[1]):
+                    bottom = texture.height-int(row*height)-int(height)
+                    frames.append(texture.get_region(int(col*width),bottom,int(width),int(height)))
+            frames = tuple(frames)
+        
+        cls.FRAME_CACHE[key] = frames
+        return frames
+    
+    @classmethod
+    def load_atlas(cls,cache=None):
+        """
+        Returns: The texture atlas of every file in the **Images** folder
+        
+        Once the atlas is loaded, :meth:`load_texture` returns regions of the atlas
+        texture, so all images (and sprite frames) share a single texture.  Textures
+        and sprite frames loaded before the atlas are dropped from the cache.
+        
+        If ``cache`` is not None, the atlas is read from that file if it is up to date,
+        and otherwise packed and saved to it.  A relative file name is in the application
+        directory (the folder with **Images**).  See :class:`GAtlas` for more information.
+        
+        :param cache: The atlas cache file, or None to always pack the images
+        :type cache:  ``str`` or None
+        """
+        from .gatlas import GAtlas
+        if not cache is None:
+            cache = os.path.join(os.path.dirname(cls.images),cache)
+        cls.ATLAS = GAtlas.build(cls.images,cache)
+        cls.TEXTURE_CACHE.clear()
+        cls.FRAME_CACHE.clear()
+        return cls.ATLAS
+    
+    @classmethod
+    def unload_atlas(cls):
+        """
+        Returns: The texture atlas, or None if it is not loaded
+        
+        After this method, :meth:`load_texture` loads each image file separately again.
+        """
+        atlas = cls.ATLAS
+        if atlas is not None:
+            cls.ATLAS = None
+            cls.TEXTURE_CACHE.clear()
+            cls.FRAME_CACHE.clear()
+        return atlas
+    
     # BUILT-IN METHODS
     def __init__(self,**keywords):
         """
@@ -223,6 +429,31 @@ class GameApp(kivy.app.App):
             
             GameApp(width=400,height=400)
         
+        To run the game with a fixed timestep of 1/60 of a second, catching up at most 
+        4 steps a frame, use the constructor::
+            
+            GameApp(width=400,height=400,step=1/60,max_steps=4)
+        
+        The keyword ``retained`` sets the attribute of the same name in the view.  If
+        it is True, drawn objects stay on the canvas between frames and only the 
+        changes are applied.  See :class:`GView` for more information.
+        
+        The keyword ``atlas`` packs every file in the **Images** folder into a single 
+        texture when the game starts.  It may be True, or the name of a cache file to 
+        save the atlas to (and read it from on later runs).  See :meth:`load_atlas`.
+        
+        The keyword ``preload`` loads every file in the **Sounds** folder in a background
+        thread when the game starts, into the library ``soundlib``.  The keyword ``mixer``
+        also preloads the sounds, but plays them through a software :class:`Mixer` on
+        the sound card.  That needs the package ``sounddevice``, and the library falls
+        back to Kivy players without it.
+        
+        The keyword ``profile`` times every frame with a new :class:`Profiler`, and the 
+        keyword ``overlay`` shows the timings on screen.  Setting ``overlay`` to True 
+        also turns on ``profile``.  For example::
+            
+            GameApp(width=400,height=400,overlay=True)
+        
         The game window will not show until you start the game. To start the game, use 
         the method ``run()``.
         
@@ -235,15 +466,37 @@ class GameApp(kivy.app.App):
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        self.step = keywords.pop('step', None)
+        self.max_steps = keywords.pop('max_steps', 5)
+        r = keywords.pop('retained', False)
+        a = keywords.pop('atlas', False)
+        p = keywords.pop('profile', False)
+        o = keywords.pop('overlay', False)
+        s = keywords.pop('preload', False)
+        m = keywords.pop('mixer', False)
 
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
         assert type(f) in [int,float], 'fps %s is not a number' % repr(value)
         assert f > 0, 'fps %s is not positive' % repr(value)
+        assert type(r) == bool, 'retained %s is not a bool' % repr(r)
+        assert type(a) in [bool,str], 'atlas %s is not a bool or file name' % repr(a)
+        assert type(p) == bool, 'profile %s is not a bool' % repr(p)
+        assert type(o) == bool, 'overlay %s is not a bool' % repr(o)
+        assert type(s) == bool, 'preload %s is not a bool' % repr(s)
+        assert type(m) == bool, 'mixer %s is not a bool' % repr(m)
 
         self._gwidth = w
         self._gheight = h
         self._fps = f
+        self._retained = r
+        self._atlas = a
+        self._profiler = Profiler() if p or o else None
+        self._frames = 0
+        self.overlay = o
+        self._preload = s or m
+        self._mixer = m
+        self._soundlib = None
         
         Config.set('graphics', 'width', str(self.width))
         Config.set('graphics', 'height', str(self.height))
@@ -264,6 +517,7 @@ class GameApp(kivy.app.App):
         from .gview import GInput, GView
         self._view = GView()
         self._view.size_hint = (1,1)
+        self._view.retained = self._retained
         self._input = GInput()
         self._input._register(self._view)
         return self.view
@@ -286,6 +540,8 @@ class GameApp(kivy.app.App):
         It should **never** be overridden.
         """
         import sys
+        if not self._soundlib is None and not self._soundlib.mixer is None:
+            self._soundlib.mixer.close()
         kivy.app.App.stop(self)
         sys.exit(0)
     
@@ -340,21 +596,114 @@ class GameApp(kivy.app.App):
             Clock.schedule_interval(self._refresh,1.0/self.fps)
         else:
             Clock.schedule_interval(self._refresh,0)
+        if self._atlas:
+            GameApp.load_atlas(None if self._atlas is True else self._atlas)
+        if self._preload:
+            from .sound import SoundLibrary
+            self._soundlib = SoundLibrary(mixer=self._make_mixer() if self._mixer else None)
+            self._soundlib.preload()
         self.start()
-    
+
+    def _make_mixer(self):
+        """
+        Returns: a running software mixer on the sound card, or None if unavailable
+
+        The mixer needs the package ``sounddevice``.  Without it, the sounds of the
+        game use Kivy players as before.
+        """
+        from .mixer import Mixer, DeviceSink
+        try:
+            sink = DeviceSink()
+        except ImportError:
+            return None
+        mixer = Mixer(sink)
+        mixer.start()
+        return mixer
+
     def _refresh(self,dt):
         """
         Processes a single animation frame.
         
         This method a callback-proxy for the methods `update` and `draw`.  It handles
-        important issues behind the scenes, particularly with clearing the window.
+        important issues behind the scenes, particularly with clearing the window.  If
+        ``step`` is not None, it also runs the fixed timestep accumulator.
         
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
+        if not self._profiler is None:
+            self._profile(dt)
+            return
+        
         self.view.clear()
-        self.update(dt)
+        if self._step is None:
+            self.update(dt)
+        else:
+            self._advance(dt)
         self.draw()
+        self.view.flush()
+    
+    def _profile(self,dt):
+        """
+        Processes a single animation frame, timing each part with the profiler.
+        
+        This is the same as :meth:`_refresh`, except that the view clear, the update(s),
+        the draw and the whole frame are timed separately.  The overlay is drawn last,
+        so that it is on top of the game.
+        
+        :param dt: time in seconds since last update
+        :type dt:  ``int`` or ``float``
+        """
+        profiler = self._profiler
+        with profiler.section('frame'):
+            with profiler.section('clear'):
+                self.view.clear()
+            with profiler.section('update'):
+                if self._step is None:
+                    self.update(dt)
+                else:
+                    self._advance(dt)
+            with profiler.section('draw'):
+                self.draw()
+                if self._overlay:
+                    self._draw_overlay()
+                self.view.flush()
+        self._frames += 1
+    
+    def _draw_overlay(self):
+        """
+        Draws the profiler statistics, refreshing the text every ``OVERLAY_RATE`` frames.
+        """
+        if self._label is None or self._frames % self.OVERLAY_RATE == 0:
+            from .grectangle import GLabel
+            text = self._profiler.report()
+            if self._label is None:
+                self._label = GLabel(text=text,font_size=12,font_name='RobotoMono-Regular',
+                                     halign='left',valign='top',linecolor=(1,1,1,1),
+                                     fillcolor=(0,0,0,0.6))
+            else:
+                self._label.text = text
+            self._label.left = 4
+            self._label.top = self.height-4
+        self.view.draw(self._label)
+    
+    def _advance(self,dt):
+        """
+        Runs as many fixed timesteps as have accumulated, up to ``max_steps``.
+        
+        :param dt: time in seconds since last frame
+        :type dt:  ``int`` or ``float``
+        """
+        self._accum += dt
+        steps = 0
+        while self._accum >= self._step and steps < self._max_steps:
+            self.update(self._step)
+            self._accum -= self._step
+            steps += 1
+        if self._accum >= self._step:
+            # Too far behind; drop the backlog rather than spiral
+            self._accum %= self._step
+        self._alpha = self._accum/self._step
     
     def _setpaths(self):
         """
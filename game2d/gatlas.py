@@ -0,0 +1,316 @@
+"""
+A module to pack many images into a single texture.
+
+Every image loaded separately is a separate file read at startup and a separate
+texture bind when drawn.  An atlas instead packs all of the images of a game into one
+large texture, and remembers the region of that texture holding each image.  Regions
+can be looked up by file name, either in pixels, as texture coordinates, or as Kivy
+texture regions that share the atlas texture.
+
+An atlas can be packed at startup from the image files, or ahead of time and saved to
+a cache file.  The cache file is a NumPy ``.npz`` archive with the packed pixels and
+the region of each image, so loading it is a single file read.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+import os
+import numpy as np
+
+# Transparent pixels between the packed images, so that filtering never bleeds
+PADDING = 2
+# The widest the packed texture may be (unless a single image is wider)
+MAX_WIDTH = 1024
+
+
+def load_pixels(name):
+    """
+    Returns: the pixels of an image file as an RGBA array, bottom row first
+
+    The file is found with the Kivy resource paths, so names in the **Images** folder
+    of a running :class:`GameApp` do not need a complete path.
+
+    :param name: the image file
+    :type name:  ``str``
+    """
+    from kivy.core.image import ImageLoader
+    from kivy.resources import resource_find
+
+    path = resource_find(name)
+    assert not path is None, '%s is not an image file' % repr(name)
+    data = ImageLoader.load(path,keep_data=True)._data[0]
+
+    fmt = data.fmt
+    assert fmt in ('rgba','bgra','rgb','bgr'), 'image format %s is not supported' % repr(fmt)
+
+    depth = len(fmt)
+    rowlength = data.rowlength if data.rowlength else data.width*depth
+    raw = np.frombuffer(data.data,dtype=np.uint8)[:rowlength*data.height]
+    raw = raw.reshape((data.height,rowlength))[:,:data.width*depth]
+    raw = raw.reshape((data.height,data.width,depth))
+
+    result = np.full((data.height,data.width,4),255,dtype=np.uint8)
+    for pos in range(depth):
+        result[:,:,'rgba'.index(fmt[pos])] = raw[:,:,pos]
+    if data.flip_vertical:
+        result = result[::-1]
+    return result
+
+
+# #mark -
+class GAtlas(object):
+    """
+    A class representing a set of images packed into one texture.
+
+    The images are packed in shelves: they are sorted from tallest to shortest and
+    placed left to right, starting a new shelf above the last one whenever a shelf
+    would get wider than ``MAX_WIDTH``.  Each image is stored under its file name.
+
+    The Kivy texture is only created the first time it is needed, so an atlas can be
+    packed and saved without a window.  Use the ``in`` operator to check whether an
+    atlas has a given image.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def names(self):
+        """
+        The names of the images in this atlas, in packing order.
+
+        **Invariant**: Must be a tuple of strings.
+        """
+        return tuple(self._regions)
+
+    @property
+    def width(self):
+        """
+        The width of the packed texture in pixels.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._pixels.shape[1]
+
+    @property
+    def height(self):
+        """
+        The height of the packed texture in pixels.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._pixels.shape[0]
+
+    @property
+    def texture(self):
+        """
+        The Kivy texture holding every image in this atlas.
+
+        This texture is created (and the pixels uploaded) on first access.
+
+        **Invariant**: Must be a Kivy ``Texture``.
+        """
+        if self._texture is None:
+            from kivy.graphics.texture import Texture
+            self._texture = Texture.create(size=(self.width,self.height),colorfmt='rgba')
+            self._texture.blit_buffer(self._pixels.tobytes(),colorfmt='rgba',bufferfmt='ubyte')
+        return self._texture
+
+
+    # BUILT-IN METHODS
+    def __init__(self,pixels,regions):
+        """
+        Creates an atlas from already packed pixels.
+
+        You should rarely call this constructor yourself.  Use :meth:`pack` to pack
+        image files, or :meth:`load` to read a saved atlas.
+
+        :param pixels: the packed image, bottom row first
+        :type pixels:  NumPy ``uint8`` array of shape (height, width, 4)
+
+        :param regions: the region (x, y, width, height) of each image, in pixels
+        :type regions:  ``dict`` mapping file names to 4-tuples of ints
+        """
+        assert pixels.ndim == 3 and pixels.shape[2] == 4, 'pixels are not RGBA'
+        self._pixels = pixels
+        self._regions = dict(regions)
+        self._texture = None
+        self._cache = {}
+        self._frames = {}
+
+    def __contains__(self,name):
+        """
+        Returns: True if this atlas has an image with the given name
+
+        :param name: the image file name
+        :type name:  ``str``
+        """
+        return name in self._regions
+
+
+    # PUBLIC METHODS
+    def region(self,name):
+        """
+        Returns: the region (x, y, width, height) of an image in pixels
+
+        The coordinates are measured from the bottom left corner of the texture.
+
+        :param name: the image file name
+        :type name:  ``str`` in this atlas
+        """
+        return self._regions[name]
+
+    def uv(self,name):
+        """
+        Returns: the texture coordinates (u0, v0, u1, v1) of an image
+
+        These are the coordinates of the bottom left and the top right corners of the
+        image, for use in a Kivy ``Mesh`` with the atlas texture.
+
+        :param name: the image file name
+        :type name:  ``str`` in this atlas
+        """
+        x, y, w, h = self._regions[name]
+        return (x/self.width,y/self.height,(x+w)/self.width,(y+h)/self.height)
+
+    def get_texture(self,name):
+        """
+        Returns: a Kivy texture region for an image
+
+        The region shares the atlas texture, so drawing it never binds a new texture.
+        The regions are cached, so every call for the same name returns the same region.
+
+        :param name: the image file name
+        :type name:  ``str`` in this atlas
+        """
+        if not name in self._cache:
+            self._cache[name] = self.texture.get_region(*self._regions[name])
+        return self._cache[name]
+
+    def get_frames(self,name,format):
+        """
+        Returns: a tuple of texture regions for the frames of a sprite filmstrip
+
+        The image is divided into a grid with the given number of rows and columns.
+        The frames are ordered left-to-right, top-to-bottom, as in :class:`GSprite`.
+        The frames are cached, so every call for the same name and format returns the
+        same regions.
+
+        :param name: the image file name
+        :type name:  ``str`` in this atlas
+
+        :param format: the number of rows and columns of the filmstrip
+        :type format:  2-element tuple of ints > 0
+        """
+        key = (name,format)
+        if not key in self._frames:
+            x, y, w, h = self._regions[name]
+            width  = w//format[1]
+            height = h//format[0]
+            frames = []
+            for row in range(format[0]):
+                for col in range(format[1]):
+                    bottom = y+h-(row+1)*height
+                    frames.append(self.texture.get_region(x+col*width,bottom,width,height))
+            self._frames[key] = tuple(frames)
+        return self._frames[key]
+
+    def save(self,path):
+        """
+        Saves this atlas to a cache file.
+
+        The file can be read again with :meth:`load`, without loading any images.
+
+        :param path: the file to write
+        :type path:  ``str``
+        """
+        names = np.array(self.names,dtype=str)
+        boxes = np.array([self._regions[name] for name in self.names],dtype=np.int64)
+        with open(path,'wb') as file:
+            np.savez_compressed(file,pixels=self._pixels,names=names,boxes=boxes.reshape(-1,4))
+
+    @classmethod
+    def load(cls,path):
+        """
+        Returns: the atlas saved in a cache file
+
+        :param path: the file written by :meth:`save`
+        :type path:  ``str``
+        """
+        with np.load(path,allow_pickle=False) as data:
+            boxes = data['boxes'].tolist()
+            names = data['names'].tolist()
+            return cls(data['pixels'],dict(zip(names,map(tuple,boxes))))
+
+    @classmethod
+    def pack(cls,sources,folder=None):
+        """
+        Returns: a new atlas with the given image files packed together
+
+        If ``folder`` is None, the files are found with the Kivy resource paths.
+        Otherwise they are read from that folder.  Either way, each image is stored
+        under the name given in ``sources``.
+
+        :param sources: the image files to pack
+        :type sources:  ``list`` or ``tuple`` of file names
+
+        :param folder: the folder with the image files
+        :type folder:  ``str`` or None
+        """
+        images = {}
+        for name in sources:
+            if not name in images:
+                images[name] = load_pixels(name if folder is None else os.path.join(folder,name))
+
+        limit = max([MAX_WIDTH]+[image.shape[1] for image in images.values()])
+        order = sorted(images,key=lambda name: -images[name].shape[0])
+
+        # Shelf packing: place the boxes first, then copy the pixels
+        boxes = {}
+        left = 0
+        bottom = 0
+        shelf = 0
+        width = 0
+        for name in order:
+            h, w = images[name].shape[:2]
+            if left > 0 and left+w > limit:
+                bottom += shelf+PADDING
+                left = 0
+                shelf = 0
+            boxes[name] = (left,bottom,w,h)
+            width = max(width,left+w)
+            shelf = max(shelf,h)
+            left += w+PADDING
+
+        pixels = np.zeros((bottom+shelf,width,4),dtype=np.uint8)
+        for name in order:
+            x, y, w, h = boxes[name]
+            pixels[y:y+h,x:x+w] = images[name]
+        return cls(pixels,boxes)
+
+    @classmethod
+    def build(cls,folder,cache=None):
+        """
+        Returns: an atlas of every image file in a folder
+
+        If ``cache`` is not None, the atlas is read from that file if it is newer than
+        every file in the folder.  Otherwise, the images are packed and the atlas is
+        saved to that file for next time.
+
+        :param folder: the folder with the image files
+        :type folder:  ``str``
+
+        :param cache: the cache file for the atlas, or None for no cache
+        :type cache:  ``str`` or None
+        """
+        names = sorted(name for name in os.listdir(folder)
+                       if os.path.isfile(os.path.join(folder,name)))
+        if not cache is None and os.path.exists(cache):
+            stamp = os.path.getmtime(cache)
+            if all(os.path.getmtime(os.path.join(folder,name)) <= stamp for name in names):
+                atlas = cls.load(cache)
+                if sorted(atlas.names) == names:
+                    return atlas
+
+        atlas = cls.pack(names,folder)
+        if not cache is None:
+            atlas.save(cache)
+        return atlas
@@ -0,0 +1,177 @@
+"""
+A module to draw many images with a single graphics command.
+
+A :class:`GImage` has its own Kivy instruction group, with a matrix push, three
+transforms, a color, a rectangle and a matrix pop.  That is fine for a few objects, but
+drawing a hundred identical aliens this way means hundreds of state changes every
+frame.  The class in this module instead draws all of its images as the quads of one
+Kivy ``Mesh``, using a texture atlas with every source image.  Moving the images only
+rewrites the vertex buffer of that mesh.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+from kivy.graphics import *
+from kivy.graphics.instructions import *
+import numpy as np
+from .app import GameApp
+from .gatlas import GAtlas
+
+
+# #mark -
+class GImageBatch(object):
+    """
+    A class representing many images of the same size drawn as a single mesh.
+
+    The batch has a fixed number of slots.  Each slot shows one of the images in
+    ``sources``, centered on a position.  If the atlas of :class:`GameApp` is loaded
+    and has every source, the batch shares its texture.  Otherwise, the batch packs its
+    own atlas of the sources.  Unlike a :class:`GImage`, the images in a
+    batch cannot be rotated or scaled individually, and have no borders or tint.
+
+    The positions are set all at once with :meth:`place`, from sequences (or NumPy
+    arrays) of coordinates.  A slot that is not visible is collapsed to a point, so it
+    draws nothing but keeps its place in the vertex buffer.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def sources(self):
+        """
+        The image files shown by this batch.
+
+        **Invariant**: Must be a nonempty tuple of image file names.
+        """
+        return self._sources
+
+    @property
+    def size(self):
+        """
+        The number of slots in this batch.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._size
+
+    @property
+    def width(self):
+        """
+        The width of every image in this batch.
+
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._width
+
+    @property
+    def height(self):
+        """
+        The height of every image in this batch.
+
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._height
+
+
+    # BUILT-IN METHODS
+    def __init__(self,sources,size,width,height):
+        """
+        Creates a new batch of ``size`` hidden images.
+
+        Every slot initially shows the first image in ``sources``.  Use :meth:`choose`
+        to pick the image of each slot and :meth:`place` to show them.
+
+        :param sources: the image files to draw
+        :type sources:  nonempty ``list`` or ``tuple`` of file names
+
+        :param size: the number of slots
+        :type size:  ``int`` >= 0
+
+        :param width: the width of every image
+        :type width:  ``int`` or ``float`` > 0
+
+        :param height: the height of every image
+        :type height:  ``int`` or ``float`` > 0
+        """
+        assert len(sources) > 0, 'there are no sources'
+        assert type(size) == int and size >= 0, 'size %s is not a valid int' % repr(size)
+        assert type(width) in [int,float] and width > 0, 'width %s is not valid' % repr(width)
+        assert type(height) in [int,float] and height > 0, 'height %s is not valid' % repr(height)
+        self._sources = tuple(sources)
+        self._size = size
+        self._width = width
+        self._height = height
+
+        atlas = GameApp.ATLAS
+        if atlas is None or not all(name in atlas for name in self._sources):
+            atlas = GAtlas.pack(self._sources)
+        self._texture = atlas.texture
+        self._regions = np.array([atlas.uv(name) for name in self._sources],dtype=np.float32)
+
+        # Four vertices per slot, each (x, y, u, v)
+        self._vertices = np.zeros((size,4,4),dtype=np.float32)
+        quads = np.arange(size,dtype=np.int64)[:,None]*4
+        indices = (quads+np.array([0,1,2,2,3,0])).ravel().tolist()
+        self.choose([0]*size)
+
+        self._mesh = Mesh(vertices=self._vertices.ravel().tolist(),indices=indices,
+                          mode='triangles',texture=self._texture)
+        self._cache = InstructionGroup()
+        self._cache.add(Color(1,1,1))
+        self._cache.add(self._mesh)
+
+
+    # PUBLIC METHODS
+    def choose(self,images):
+        """
+        Sets the image shown in every slot.
+
+        The change is not visible until the next call to :meth:`place`.
+
+        :param images: the position in ``sources`` of the image for each slot
+        :type images:  sequence of ``size`` ints
+        """
+        regions = self._regions[np.asarray(images,dtype=np.int64)]
+        # Corners in the order bottom left, bottom right, top right, top left
+        self._vertices[:,0,2:] = regions[:,[0,1]]
+        self._vertices[:,1,2:] = regions[:,[2,1]]
+        self._vertices[:,2,2:] = regions[:,[2,3]]
+        self._vertices[:,3,2:] = regions[:,[0,3]]
+
+    def place(self,xs,ys,visible):
+        """
+        Moves every slot to a new center, showing only the visible ones.
+
+        This rewrites the vertex buffer of the mesh in a single pass.
+
+        :param xs: the horizontal coordinate of the center of each slot
+        :type xs:  sequence of ``size`` numbers
+
+        :param ys: the vertical coordinate of the center of each slot
+        :type ys:  sequence of ``size`` numbers
+
+        :param visible: whether each slot is drawn
+        :type visible:  sequence of ``size`` bools
+        """
+        xs = np.asarray(xs,dtype=np.float32).ravel()
+        ys = np.asarray(ys,dtype=np.float32).ravel()
+        rx = np.where(np.asarray(visible,dtype=bool).ravel(),self._width/2.0,0.0)
+        ry = np.where(np.asarray(visible,dtype=bool).ravel(),self._height/2.0,0.0)
+
+        self._vertices[:,0,0] = xs-rx
+        self._vertices[:,0,1] = ys-ry
+        self._vertices[:,1,0] = xs+rx
+        self._vertices[:,1,1] = ys-ry
+        self._vertices[:,2,0] = xs+rx
+        self._vertices[:,2,1] = ys+ry
+        self._vertices[:,3,0] = xs-rx
+        self._vertices[:,3,1] = ys+ry
+        self._mesh.vertices = self._vertices.ravel().tolist()
+
+    def draw(self,view):
+        """
+        Draws this batch in the provided view.
+
+        :param view: view to draw to
+        :type view:  :class:`GView`
+        """
+        view.draw(self._cache)
@@ -0,0 +1,50 @@
+"""
+Geometry shared by the drawables of the Kivy and the headless backends.
+
+The shapes of both backends must answer the same geometric questions the same way,
+so that a game simulated without a window plays exactly as it does on screen.  The
+tests that need exact agreement live here, in a module that does not import Kivy,
+so that both backends use the same code instead of two copies.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+import numpy as np
+
+
+def in_fan(xs, ys, center, rim):
+    """
+    Checks which of many points are inside of a triangle fan
+    
+    The fan is made of the triangles with one corner at ``center`` and the other two at
+    consecutive points of ``rim``.  Each triangle is tested against every point at once.
+    
+    :param xs: The horizontal coordinates of the points
+    :type xs:  NumPy array of floats, or a single number
+    
+    :param ys: The vertical coordinates of the points
+    :type ys:  NumPy array of floats (same shape as ``xs``), or a single number
+    
+    :param center: The hub of the fan
+    :type center:  2-element list of ``int`` or ``float``
+    
+    :param rim: The rim of the fan, as alternating x and y values
+    :type rim:  even sequence of ``int`` or ``float``
+    
+    :return: A mask that is True for each point inside the fan
+    :rtype:  NumPy ``bool`` array
+    """
+    xs = np.asarray(xs,dtype=float)
+    ys = np.asarray(ys,dtype=float)
+    found = np.zeros(xs.shape,dtype=bool)
+    ax, ay = center[0], center[1]
+    for i in range(2,len(rim)-1,2):
+        bx, by = rim[i-2], rim[i-1]
+        cx, cy = rim[i], rim[i+1]
+        d1 = (xs-bx)*(ay-by)-(ax-bx)*(ys-by)
+        d2 = (xs-cx)*(by-cy)-(bx-cx)*(ys-cy)
+        d3 = (xs-ax)*(cy-ay)-(cx-ax)*(ys-ay)
+        neg = (d1 < 0) | (d2 < 0) | (d3 < 0)
+        pos = (d1 > 0) | (d2 > 0) | (d3 > 0)
+        found |= ~(neg & pos)
+    return found
@@ -12,6 +12,7 @@ from kivy.graphics import *
 from kivy.graphics.instructions import *
 from introcs.geom import Point2, Matrix
 import introcs
+import math
 
 def is_color(c):
     """
@@ -106,6 +107,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         self._trans.x = float(value)
         self._mtrue = False
+        self._aabb = None
 
     @property
     def y(self):
@@ -121,6 +123,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         self._trans.y = float(value)
         self._mtrue = False
+        self._aabb = None
 
     @property
     def width(self):
@@ -138,6 +141,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         assert value > 0, '%s is not positive' % repr(value)
         self._width = float(value)
+        self._aabb = None
         if self._defined:
             self._reset()
 
@@ -157,6 +161,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         assert value > 0, '%s is not positive' % repr(value)
         self._height = float(value)
+        self._aabb = None
         if self._defined:
             self._reset()
 
@@ -189,6 +194,7 @@ class GObject(object):
             self._scale.x = float(value[0])
             self._scale.y = float(value[1])
         self._mtrue = False
+        self._aabb = None
 
     @property
     def angle(self):
@@ -207,6 +213,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         diff = np.allclose([self._rotate.angle],[value])
         self._rotate.angle = float(value)
+        self._aabb = None
         if not diff:
             self._mtrue = False
 
@@ -315,18 +322,12 @@ class GObject(object):
         Changing this value will shift the center of the object so that the left
         edge matches the new value.
 
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The bounding box is cached until the position, size, angle or scale changes,
+        so reading several edges in a row only computes it once.
 
         **invariant**: Value must be an ``int`` or ``float``.
         """
-        if self._rotate.angle == 0.0:
-            return self.x-self.width/2.0
-
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return min(p0,p1,p2,p3)
+        return self._get_aabb()[0]
 
     @left.setter
     def left(self,value):
@@ -345,18 +346,12 @@ class GObject(object):
         Changing this value will shift the center of the object so that the right
         edge matches the new value.
 
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The bounding box is cached until the position, size, angle or scale changes,
+        so reading several edges in a row only computes it once.
 
         **invariant**: Value must be an ``int`` or ``float``.
         """
-        if self._rotate.angle == 0.0:
-            return self.x+self.width/2.0
-
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return max(p0,p1,p2,p3)
+        return self._get_aabb()[2]
 
     @right.setter
     def right(self,value):
@@ -375,18 +370,12 @@ class GObject(object):
         Changing this value will shift the center of the object so that the top
         edge matches the new value.
 
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The bounding box is cached until the position, size, angle or scale changes,
+        so reading several edges in a row only computes it once.
 
         **invariant**: Value must be an ``int`` or ``float``.
         """
-        if self._rotate.angle == 0.0:
-            return self.y+self.height/2.0
-
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return max(p0,p1,p2,p3)
+        return self._get_aabb()[3]
 
     @top.setter
     def top(self,value):
@@ -406,18 +395,12 @@ class GObject(object):
         Changing this value will shift the center of the object so that the bottom
         edge matches the new value.
 
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The bounding box is cached until the position, size, angle or scale changes,
+        so reading several edges in a row only computes it once.
 
         **invariant**: Value must be an ``int`` or ``float``.
         """
-        if self._rotate.angle == 0.0:
-            return self.y-self.height/2.0
-
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return min(p0,p1,p2,p3)
+        return self._get_aabb()[1]
 
 
     @bottom.setter
@@ -480,6 +463,7 @@ class GObject(object):
         """
         # Set the properties.
         self._defined = False
+        self._aabb = None
 
         # Create the Kivy transforms for position and size
         self._trans  = Translate(0,0,0)
@@ -554,15 +538,91 @@ class GObject(object):
         :return: True if the shape contains this point
         :rtype:  ``bool``
         """
-        import numpy as np
         if isinstance(point,Point2):
             point = (point.x,point.y)
         assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
 
-        if self._rotate.angle != 0.0:
-            point = self.matrix.inverse()._transform(point[0],point[1])
+        if self._rotate.angle == 0.0:
+            return abs(point[0]-self.x) < self.width/2.0 and abs(point[1]-self.y) < self.height/2.0
+
+        px, py = self._local(point[0],point[1])
+        return abs(px) < self.width/2.0 and abs(py) < self.height/2.0
+
+    def contains_many(self,points):
+        """
+        Checks which of many points this shape contains
+
+        This is the same test as :meth:`contains`, but for a whole batch of points at
+        once.  The points are moved into the coordinate system of this shape with a
+        single vectorized transform, so testing every laser bolt against a shape is one 
+        call.  There are no checks on the points.
+
+        :param points: the points to check
+        :type points:  NumPy array of shape (N,2), or a sequence of number pairs
+
+        :return: a mask that is True for each point in this shape
+        :rtype:  NumPy ``bool`` array of shape (N,)
+        """
+        px, py = self._local_many(points)
+        return (abs(px) < self.width/2.0) & (abs(py) < self.height/2.0)
+
+    def overlaps(self,left,bottom,right,top):
+        """
+        Checks whether this shape overlaps an axis-aligned rectangle
+
+        The rectangle is open, so shapes that only share an edge do not overlap.  If
+        this shape is not rotated, this is four comparisons against the cached bounding
+        box, with no checks on the arguments.  This makes it the fastest way to test
+        a collision with a moving rectangle, such as a laser bolt.
+
+        :param left: the left edge of the rectangle
+        :type left:  ``int`` or ``float``
+
+        :param bottom: the bottom edge of the rectangle
+        :type bottom:  ``int`` or ``float``
+
+        :param right: the right edge of the rectangle
+        :type right:  ``int`` or ``float``
+
+        :param top: the top edge of the rectangle
+        :type top:  ``int`` or ``float``
+
+        :return: True if the shape overlaps the rectangle
+        :rtype:  ``bool``
+        """
+        box = self._get_aabb()
+        if not (left < box[2] and box[0] < right and bottom < box[3] and box[1] < top):
+            return False
+        if self._rotate.angle == 0.0:
+            return True
+
+        # Separating axis test along the two axes of the rotated shape
+        rad = math.radians(self._rotate.angle)
+        c = math.cos(rad)
+        s = math.sin(rad)
+        cx = (left+right)/2.0-self._trans.x
+        cy = (bottom+top)/2.0-self._trans.y
+        rx = (right-left)/2.0
+        ry = (top-bottom)/2.0
+        if abs(c*cx+s*cy) >= self.width*self._scale.x/2.0+abs(c)*rx+abs(s)*ry:
+            return False
+        return abs(c*cy-s*cx) < self.height*self._scale.y/2.0+abs(s)*rx+abs(c)*ry
+
+    def intersects(self,other):
+        """
+        Checks whether this shape overlaps the bounding box of another
 
-        return abs(point[0]-self.x) < self.width/2.0 and abs(point[1]-self.y) < self.height/2.0
+        This is :meth:`overlaps` applied to the edges of ``other``.  If the other shape 
+        is rotated, its whole (axis-aligned) bounding box is used.
+
+        :param other: the shape to check
+        :type other:  :class:`GObject`
+
+        :return: True if this shape overlaps the bounding box of other
+        :rtype:  ``bool``
+        """
+        box = other._get_aabb()
+        return self.overlaps(box[0],box[1],box[2],box[3])
 
     def transform(self,point):
         """
@@ -611,6 +671,73 @@ class GObject(object):
         self._cache.add(self._rotate)
         self._cache.add(self._scale)
 
+    def _local(self,x,y):
+        """
+        Returns the point (x,y) relative to the center, undoing rotation and scale.
+
+        :param x: the horizontal coordinate
+        :type x:  ``int`` or ``float``
+
+        :param y: the vertical coordinate
+        :type y:  ``int`` or ``float``
+        """
+        dx = x-self._trans.x
+        dy = y-self._trans.y
+        rad = math.radians(self._rotate.angle)
+        c = math.cos(rad)
+        s = math.sin(rad)
+        return ((c*dx+s*dy)/self._scale.x,(c*dy-s*dx)/self._scale.y)
+
+    def _local_many(self,points):
+        """
+        Returns the arrays (xs, ys) of the points relative to the center.
+
+        Rotation and scale are only undone if this shape is rotated, as in :meth:`contains`.
+
+        :param points: the points to transform
+        :type points:  NumPy array of shape (N,2), or a sequence of number pairs
+        """
+        import numpy as np
+        points = np.asarray(points,dtype=float).reshape(-1,2)
+        dx = points[:,0]-self._trans.x
+        dy = points[:,1]-self._trans.y
+        if self._rotate.angle == 0.0:
+            return (dx,dy)
+
+        rad = math.radians(self._rotate.angle)
+        c = math.cos(rad)
+        s = math.sin(rad)
+        return ((c*dx+s*dy)/self._scale.x,(c*dy-s*dx)/self._scale.y)
+
+    def _get_aabb(self):
+        """
+        Returns the bounding box (left, bottom, right, top) of this shape.
+
+        The box is only recomputed if it was invalidated since the last call.
+        """
+        if self._aabb is None:
+            self._build_aabb()
+        return self._aabb
+
+    def _build_aabb(self):
+        """
+        Builds the axis-aligned bounding box after a settings change.
+        """
+        x = self._trans.x
+        y = self._trans.y
+        if self._rotate.angle == 0.0:
+            w = self.width/2.0
+            h = self.height/2.0
+        else:
+            rad = math.radians(self._rotate.angle)
+            c = abs(math.cos(rad))
+            s = abs(math.sin(rad))
+            sw = self.width*self._scale.x/2.0
+            sh = self.height*self._scale.y/2.0
+            w = c*sw+s*sh
+            h = s*sw+c*sh
+        self._aabb = (x-w,y-h,x+w,y+h)
+
     def _build_matrix(self):
         """
         Builds the transform matrices after a settings change.
@@ -757,6 +884,16 @@ class GScene(GObject):
 
 
     # HIDDEN METHODS
+    def _get_aabb(self):
+        """
+        Returns the bounding box (left, bottom, right, top) of this scene.
+
+        The size of a scene depends on its children, which may move at any time, so
+        this box is never cached.
+        """
+        self._build_aabb()
+        return self._aabb
+
     def _reset(self):
         """
         Resets the drawing cache
@@ -10,7 +10,9 @@ Date:   August 1, 2017 (Python 3 version)
 # Lower-level kivy modules to support animation
 from kivy.graphics import *
 from kivy.graphics.instructions import *
+from introcs.geom import Point2
 from .gobject import GObject
+from .geometry import in_fan
 
 
 def same_side(p1, p2, a, b):
@@ -119,6 +121,7 @@ class GPath(GObject):
     def points(self,value):
         assert is_point_tuple(value,2),'value %s is not a valid list of points' %  repr(value)
         self._points = tuple(value)
+        self._aabb = None
         if self._defined:
             self._reset()
     
@@ -297,6 +300,7 @@ class GTriangle(GPath):
         assert is_point_tuple(value,3),'value %s is not a valid list of points' %  repr(value)
         assert len(value) == 6, 'value %s does not have the right length'  %  repr(value)
         self._points = tuple(value)
+        self._aabb = None
         if self._defined:
             self._reset()
     
@@ -345,7 +349,23 @@ class GTriangle(GPath):
             point = (point.x,point.y)
         assert is_point_tuple(point,1), "%s is not a valid point" % repr(point)
         
-        return in_triangle(points,self._points)
+        return bool(self.contains_many([point])[0])
+    
+    def contains_many(self,points):
+        """
+        Checks which of many points this shape contains
+        
+        The points are moved into the coordinate system of this triangle with a single
+        vectorized transform, and then tested all at once.
+        
+        :param points: the points to check
+        :type points:  NumPy array of shape (N,2), or a sequence of number pairs
+        
+        :return: a mask that is True for each point in this shape
+        :rtype:  NumPy ``bool`` array of shape (N,)
+        """
+        px, py = self._local_many(points)
+        return in_fan(px,py,self._points[0:2],self._points[2:6])
     
     
     # HIDDEN METHODS
@@ -413,6 +433,7 @@ class GPolygon(GPath):
     def points(self,value):
         assert is_point_tuple(value,3),'value %s is not a valid list of points' %  repr(value)
         self._points = tuple(value)
+        self._aabb = None
         if self._defined:
             self._reset()
     
@@ -531,12 +552,24 @@ class GPolygon(GPath):
             point = (point.x,point.y)
         assert is_point_tuple(point,1), "%s is not a valid point" % repr(point)
         
-        found = False
-        for i in xrange(4,len(self._points),2):
-            t = (0,0)+self.points[i-4:i]
-            found = found or in_triangle(point,t)
+        return bool(self.contains_many([point])[0])
+    
+    def contains_many(self,points):
+        """
+        Checks which of many points this shape contains
+        
+        The points are moved into the coordinate system of this polygon with a single
+        vectorized transform.  The polygon is drawn as a fan of triangles about the 
+        origin, and each triangle is tested against every point at once.
         
-        return found
+        :param points: the points to check
+        :type points:  NumPy array of shape (N,2), or a sequence of number pairs
+        
+        :return: a mask that is True for each point in this shape
+        :rtype:  NumPy ``bool`` array of shape (N,)
+        """
+        px, py = self._local_many(points)
+        return in_fan(px,py,(0,0),self._points+self._points[0:2])
     
     
     # HIDDEN METHODS
@@ -544,25 +577,31 @@ class GPolygon(GPath):
         """
         Creates the mesh for this polygon
         """
-        size = len(self.points)/2
+        from .app import GameApp
+        size = len(self.points)//2
         try:
-            texture = Image(source=self.source).texture
-            texture.wrap = 'repeat'
+            texture = GameApp.load_texture(self.source)
             tw = float(texture.width)  if self.source_width is None else self.source_width
             th = float(texture.height) if self.source_height is None else self.source_height
             
+            # Map the texture coordinates into the region of the texture with the image
+            ux, uy = texture.uvpos
+            uw, uh = texture.uvsize
+            if GameApp.ATLAS is None or not self.source in GameApp.ATLAS:
+                texture.wrap = 'repeat'
+            
             # Centroid at 0, with texture centered
-            verts = (0,0,0.5,0.5) 
+            verts = (0,0,ux+0.5*uw,uy+0.5*uh) 
             
             # Create the fan.
             for x in range(size):
                 pt = self.points[2*x:2*x+2]
-                self._verts += pt+(pt[0]/tw+0.5,pt[1]/th+0.5)
+                verts += pt+(ux+(pt[0]/tw+0.5)*uw,uy+(pt[1]/th+0.5)*uh)
             
             # Come back to the beginning
             pt = self.points[0:2]
-            verts += pt+(pt[0]/tw+0.5,pt[1]/th+0.5)
-            self._mesh = Mesh(vertices=verts, indices=range(size+2), mode='triangle_fan', texture=texture)
+            verts += pt+(ux+(pt[0]/tw+0.5)*uw,uy+(pt[1]/th+0.5)*uh)
+            self._mesh = Mesh(vertices=verts, indices=list(range(size+2)), mode='triangle_fan', texture=texture)
         except BaseException as e:
             # Make all texture coordinates degnerate
             verts = (0,0,0,0) 
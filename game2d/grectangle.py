@@ -10,9 +10,9 @@ Date:   August 1, 2017 (Python 3 version)
 """
 from kivy.graphics import *
 from kivy.graphics.instructions import *
-from kivy.uix.label import Label
-from kivy.uix.image import Image
-from .gobject import GObject
+from introcs.geom import Point2
+from collections import OrderedDict
+from .gobject import GObject, is_num_tuple
 from .app import GameApp
 
 class GRectangle(GObject):
@@ -142,9 +142,9 @@ class GEllipse(GRectangle):
         **Warning**: Using this method on a rotated object may slow down your framerate.
         
         :param point: the point to check
-        :type point: :class:`GPoint`` or a pair of numbers
+        :type point: :class:`Point2`` or a pair of numbers
         """
-        if isinstance(point,GPoint):
+        if isinstance(point,Point2):
             point = (point.x,point.y)
         assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
         
@@ -154,12 +154,30 @@ class GEllipse(GRectangle):
             dx = (point[0]-self.x)*(point[0]-self.x)/(rx*rx)
             dy = (point[1]-self.y)*(point[1]-self.y)/(ry*ry)
         else:
-            p = self.matrix.inverse()._transform(point[0],point[1])
+            p = self._local(point[0],point[1])
             dx = p[0]*p[0]/(rx*rx)
             dy = p[1]*p[1]/(ry*ry)
         
         return (dx+dy) <= 1.0
     
+    def contains_many(self,points):
+        """
+        Checks which of many points this shape contains
+        
+        This is the same test as :meth:`contains`, but for a whole batch of points at
+        once, with a single vectorized transform.
+        
+        :param points: the points to check
+        :type points:  NumPy array of shape (N,2), or a sequence of number pairs
+        
+        :return: a mask that is True for each point in this shape
+        :rtype:  NumPy ``bool`` array of shape (N,)
+        """
+        px, py = self._local_many(points)
+        rx = self.width/2.0
+        ry = self.height/2.0
+        return (px*px/(rx*rx)+py*py/(ry*ry)) <= 1.0
+    
     
     # HIDDEN METHODS
     def _reset(self):
@@ -296,7 +314,17 @@ class GLabel(GRectangle):
     to the font by filename, including the .ttf. If you give no name, it will use the 
     default Kivy font.  The `bold` attribute only works for the default Kivy font; for 
     other fonts you will need the .ttf file for the bold version of that font.  See the
-    provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example."""
+    provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example.
+    
+    Rendering text is expensive, so the rendered textures are shared.  They are kept in
+    the class attribute ``TEXT_CACHE``, keyed by the text, font name, font size, bold, 
+    color and horizontal alignment.  A label with the same text and style as an earlier 
+    one (such as a message rebuilt every frame) reuses its texture, and does not render 
+    anything.  The cache keeps the ``TEXT_LIMIT`` most recently used textures."""
+    # Class attribute for the rendered text textures, least recently used first
+    TEXT_CACHE = OrderedDict()
+    # Class attribute for the number of textures kept in TEXT_CACHE
+    TEXT_LIMIT = 64
     
     # MUTABLE PROPERTIES
     @property
@@ -311,8 +339,8 @@ class GLabel(GRectangle):
     def font_size(self,value):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._fsize = value
-        self._label.font_size = value
-        self._label.texture_update()
+        if self._defined:
+            self._reset()
     
     @property
     def font_name(self):
@@ -320,14 +348,15 @@ class GLabel(GRectangle):
         The file name for the .ttf file to use as a font
         
         **Invariant**: Must be a string referring to a .ttf file in folder Fonts"""
-        return self._label.font_name
+        return self._fname
     
     @font_name.setter
     def font_name(self,value):
         from .app import GameApp
         assert GameApp.is_font(value), 'value %s is not a font name' % repr(value)
-        self._label.font_name = value
-        self._label.texture_update()
+        self._fname = value
+        if self._defined:
+            self._reset()
     
     @property
     def bold(self):
@@ -339,13 +368,14 @@ class GLabel(GRectangle):
         `ComicSans.ttf` and `ComicSansBold.ttf` for an example.
         
         **Invariant**: Must be a boolean"""
-        return self._label.bold
+        return self._bold
 
     @bold.setter
     def bold(self,value):
         assert type(value) == bool, repr(value)+' is not a bool'
-        self._label.bold = value
-        self._label.texture_update()
+        self._bold = value
+        if self._defined:
+            self._reset()
 
     @property
     def text(self):
@@ -357,13 +387,14 @@ class GLabel(GRectangle):
         this label will grow to ensure that the text will fit in the rectangle.
         
         **Invariant**: Must be a string"""
-        return self._label.text
+        return self._text
     
     @text.setter
     def text(self,value):
         assert type(value) == str, 'value %s is not a string' % repr(value)
-        self._label.text = value
-        self._label.texture_update()
+        self._text = value
+        if self._defined:
+            self._reset()
     
     @property
     def halign(self):
@@ -385,7 +416,6 @@ class GLabel(GRectangle):
     def halign(self,value):
         assert value in ('left','right','center'), 'value %s is not a valid horizontal alignment' % repr(value)
         self._halign = value
-        self._label.halign = value
         if self._defined:
             self._reset()
     
@@ -409,7 +439,6 @@ class GLabel(GRectangle):
     def valign(self,value):
         assert value in ('top','middle','bottom'), 'value %s is not a valid vertical alignment' % repr(value)
         self._valign = value
-        self._label.valign = value
         if self._defined:
             self._reset()
     
@@ -428,6 +457,7 @@ class GLabel(GRectangle):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._trans.x = float(value)
         self._mtrue = False
+        self._aabb = None
         self._hanchor = 'center'
         self._ha = value
     
@@ -444,6 +474,7 @@ class GLabel(GRectangle):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._trans.y = float(value)
         self._mtrue = False
+        self._aabb = None
         self._vanchor = 'center'
         self._hv = value
     
@@ -458,18 +489,11 @@ class GLabel(GRectangle):
         Changing this value will shift the center of the object so that the left
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The bounding box is cached until the position, size, angle or scale changes.
         
         **Invariant**: Must be an int or float.
         """
-        if self._rotate.angle == 0.0:
-            return self.x-self.width/2.0
-        
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return min(p0,p1,p2,p3)
+        return self._get_aabb()[0]
     
     @left.setter
     def left(self,value):
@@ -490,18 +514,11 @@ class GLabel(GRectangle):
         Changing this value will shift the center of the object so that the right
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The bounding box is cached until the position, size, angle or scale changes.
         
         **Invariant**: Must be an int or float.
         """
-        if self._rotate.angle == 0.0:
-            return self.x+self.width/2.0
-        
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return max(p0,p1,p2,p3)
+        return self._get_aabb()[2]
     
     @right.setter
     def right(self,value):
@@ -522,18 +539,11 @@ class GLabel(GRectangle):
         Changing this value will shift the center of the object so that the top
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The bounding box is cached until the position, size, angle or scale changes.
         
         **Invariant**: Must be an int or float.
         """
-        if self._rotate.angle == 0.0:
-            return self.y+self.height/2.0
-        
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return max(p0,p1,p2,p3)
+        return self._get_aabb()[3]
     
     @top.setter
     def top(self,value):
@@ -554,17 +564,11 @@ class GLabel(GRectangle):
         Changing this value will shift the center of the object so that the bottom
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        The bounding box is cached until the position, size, angle or scale changes.
+        
         **Invariant**: Must be an int or float.
         """
-        if self._rotate.angle == 0.0:
-            return self.y-self.height/2.0
-        
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return min(p0,p1,p2,p3)
+        return self._get_aabb()[1]
     
     
     @bottom.setter
@@ -590,18 +594,17 @@ class GLabel(GRectangle):
         This class supports the all same keywords as :class:`GRectangle`, as well as 
         additional attributes for the text properties (e.g. font size and name).
         """
+        from kivy.core.text import DEFAULT_FONT
+        from kivy.metrics import sp
         self._defined = False
         self._hanchor = 'center'
         self._vanchor = 'center'
+        self._texture = None
         
-        sanitized = {}
-        excludes  = ['linewidth','linecolor','fillcolor','halign','valign','left','bottom']
-        for key in keywords:
-            if not key in excludes:
-                sanitized[key] = keywords[key]
-        
-        self._label = Label(**sanitized)
-        self._label.size_hint = (None,None)
+        self._text  = keywords['text'] if 'text' in keywords else ''
+        self._fname = keywords['font_name'] if 'font_name' in keywords else DEFAULT_FONT
+        self._fsize = keywords['font_size'] if 'font_size' in keywords else sp(15)
+        self._bold  = keywords['bold'] if 'bold' in keywords else False
         
         self.linewidth = keywords['linewidth'] if 'linewidth' in keywords else 0.0
         self.halign = keywords['halign'] if 'halign' in keywords else 'center'
@@ -612,7 +615,6 @@ class GLabel(GRectangle):
             self.linecolor = (0,0,0,1)
         self._reset()
         self._defined = True
-        self._label.bind(texture_size=self._callback)
     
     def __str__(self):
         """
@@ -627,27 +629,61 @@ class GLabel(GRectangle):
                 % (s,repr(self.text),repr(self.x),repr(self.y),repr(self.angle))
     
     # HIDDEN METHODS
-    def _callback(self,instance=None,value=None):
+    @classmethod
+    def _render(cls,text,font_name,font_size,bold,color,halign):
         """
-        A workaround to deal with parameter requirements for callbacks
+        Returns: the texture of the given text, rendering it if it is not in the cache
+        
+        The texture is None if the text is empty.
+        
+        :param text: the text to render
+        :type text:  ``str``
+        
+        :param font_name: the font file
+        :type font_name:  ``str``
+        
+        :param font_size: the font size in points
+        :type font_size:  ``int`` or ``float``
+        
+        :param bold: whether the text is bold
+        :type bold:  ``bool``
+        
+        :param color: the text color
+        :type color:  4-element tuple of floats
+        
+        :param halign: the alignment of multiline text
+        :type halign:  one of 'left', 'right', or 'center'
         """
-        if self._defined:
-            self._reset()
+        if text == '':
+            return None
+        key = (text,font_name,font_size,bold,tuple(color),halign)
+        cache = cls.TEXT_CACHE
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        
+        from kivy.core.text import Label
+        label = Label(text=text,font_name=font_name,font_size=font_size,bold=bold,
+                      color=color,halign=halign)
+        label.refresh()
+        cache[key] = label.texture
+        while len(cache) > cls.TEXT_LIMIT:
+            cache.popitem(last=False)
+        return label.texture
     
     def _reset(self):
         """
         Resets the drawing cache.
         """
-        # Set up the label at the center.
-        self._label.size = self._label.texture_size
-        self._label.center = (0,0)
-        if self.linecolor:
-            self._label.color = self.linecolor
+        color = self.linecolor if self.linecolor else (1,1,1,1)
+        self._texture = self._render(self._text,self._fname,self._fsize,self._bold,
+                                     color,self._halign)
+        tsize = (0,0) if self._texture is None else tuple(self._texture.size)
         
         # Resize the outside if necessary
         self._defined = False
-        self.width  = max(self.width, self._label.width)
-        self.height = max(self.height,self._label.height)
+        self.width  = max(self.width, tsize[0])
+        self.height = max(self.height,tsize[1])
         self._defined = True
         
         # Reset the absolute anchor
@@ -661,18 +697,20 @@ class GLabel(GRectangle):
             self._trans.y = self._hv-self.height/2.0
         elif self._vanchor == 'bottom':
             self._trans.y = self._hv+self.height/2.0
+        self._aabb = None
         
-        # Reset the label anchor.
+        # Reset the text anchor (snapped to whole pixels)
+        tx = -tsize[0]/2.0
         if self.halign == 'left':
-            self._label.x = -self.width/2.0
+            tx = -self.width/2.0
         elif self.halign == 'right':
-            self._label.right = self.width/2.0
+            tx = self.width/2.0-tsize[0]
         
-        # Reset the label anchor.
+        ty = -tsize[1]/2.0
         if self.valign == 'top':
-            self._label.top = self.height/2.0
+            ty = self.height/2.0-tsize[1]
         elif self.valign == 'bottom':
-            self._label.bottom = -self.height/2.0
+            ty = -self.height/2.0
         
         GObject._reset(self)
         x = -self.width/2.0
@@ -683,7 +721,9 @@ class GLabel(GRectangle):
             self._cache.add(self._fillcolor)
             self._cache.add(fill)
         
-        self._cache.add(self._label.canvas)
+        if not self._texture is None:
+            self._cache.add(Color(1,1,1,1))
+            self._cache.add(Rectangle(texture=self._texture,pos=(int(tx),int(ty)),size=tsize))
         
         if self._linewidth > 0:
             line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
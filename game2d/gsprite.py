@@ -33,6 +33,9 @@ class GSprite(GRectangle):
     
     If the image supports transparency, then this object can be used to represent irregular 
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
+    
+    The frames are loaded with :meth:`GameApp.load_frames`, so all sprites with the same 
+    source and format share them.  Changing the frame only swaps the texture drawn.
     """
     
     # MUTABLE PROPERTIES
@@ -74,6 +77,8 @@ class GSprite(GRectangle):
     def frame(self,value):
         assert type(value) == int, '%s is not an int' % repr(value)
         assert value >= 0 and value < self.count, '%s is out of range' % repr(value)
+        if value == self._frame:
+            return
         self._frame = value
         if self._bounds:
             self._texture = self._images[self._frame]
@@ -130,18 +135,9 @@ class GSprite(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
-        texture = GameApp.load_texture(self.source)
-        if texture:
-            width  = texture.width/self._format[1]
-            height = texture.height/self._format[0]
-            
-            ty = 0
-            for row in range(self._format[0]):
-                tx = 0
-                for col in range(self._format[1]):
-                    self._images[row*self._format[1]+col] = texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height))
-                    tx += width
-                ty += width
+        frames = GameApp.load_frames(self.source,self._format)
+        if frames:
+            self._images = frames
         else:
             print('Failed to load',repr(self.source))
         
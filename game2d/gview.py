@@ -319,12 +319,42 @@ class GView(FloatLayout):
     :class:`GObject` instances to the :meth:`draw` method.  You must do this every
     animation frame, as the game is constantly clearing the window.
 
+    If the attribute ``retained`` is True, the view keeps its graphics commands 
+    attached to the canvas between frames.  You still draw everything every animation
+    frame, but the view only compares what was drawn with the previous frame.  It
+    touches the canvas only for the commands that were added or removed (or when the
+    drawing order changed).  This is much faster for scenes that change little from 
+    one frame to the next.
+
     **You should never construct an object of this class**.  Creating a new instance
     of this class will not properly display it on the screen.  Instead, you should
     only use the one provided in the `view` attribute of :class:`GameApp`.
     See the documentation of that class for more information.
     """
 
+    # PROPERTIES
+    @property
+    def retained(self):
+        """
+        Whether the view keeps its graphics commands between frames.
+        
+        If this value is False, :meth:`clear` empties the canvas and :meth:`draw` adds
+        each command to it immediately.  If it is True, the commands are collected and
+        only applied to the canvas (as changes) when :meth:`flush` is called.
+        
+        **Invariant**: Must be a ``bool``.
+        """
+        return self._retained
+    
+    @retained.setter
+    def retained(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._retained = value
+        self._frame.clear()
+        self._contents.clear()
+        self._order = []
+        self._drawn = []
+
     # BUILT-IN METHODS
     def __init__(self):
         """
@@ -341,6 +371,7 @@ class GView(FloatLayout):
         self.bind(size=self._reset)
         self._reset()
         self._contents = set()
+        self.retained = False
 
 
     # PUBLIC METHODS
@@ -355,18 +386,53 @@ class GView(FloatLayout):
         :type cmd:  A Kivy graphics command
         """
         if not cmd in self._contents:
-            self._frame.add(cmd)
             self._contents.add(cmd)
+            if self._retained:
+                self._order.append(cmd)
+            else:
+                self._frame.add(cmd)
 
     def clear(self):
         """
         Clears the contents of the view.
 
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
+        frame.  That way, you are not drawing images on top of one another.  If the
+        view is ``retained``, the canvas is left alone until :meth:`flush`.
         """
-        self._frame.clear()
         self._contents.clear()
+        if self._retained:
+            self._order = []
+        else:
+            self._frame.clear()
+
+    def flush(self):
+        """
+        Applies the commands drawn since the last :meth:`clear` to the canvas.
+
+        This method is called for you automatically at the end of the animation frame.
+        It does nothing unless the view is ``retained``.  Commands drawn in both frames
+        stay attached to the canvas, and only the difference is added or removed.
+        """
+        if not self._retained or self._order == self._drawn:
+            return
+        
+        drawn = set(self._drawn)
+        kept = [cmd for cmd in self._drawn if cmd in self._contents]
+        if kept != [cmd for cmd in self._order if cmd in drawn]:
+            # The drawing order changed; start over
+            self._frame.clear()
+            for cmd in self._order:
+                self._frame.add(cmd)
+        else:
+            for cmd in self._drawn:
+                if not cmd in self._contents:
+                    self._frame.remove(cmd)
+            for pos in range(len(self._order)):
+                cmd = self._order[pos]
+                if not cmd in drawn:
+                    self._frame.insert(pos,cmd)
+        self._drawn = self._order
 
     # HIDDEN METHODS
     def _reset(self,obj=None,value=None):
@@ -0,0 +1,1253 @@
+"""
+Headless drawables for 2D game support.
+
+This module provides stand-ins for the drawables, the view, the input handler and
+the sounds in this package that never touch Kivy.  They keep all of the geometry
+(position, size, rotation, scale and the bounding box edges) so that a game model
+built from them behaves exactly like one built from the real classes, but they
+allocate no graphics instructions, load no textures and need no window.
+
+You should not import this module directly.  Instead, set the environment variable
+``GAME2D_HEADLESS`` to ``1`` before the first import of :mod:`game2d`, and the package
+will export these classes in place of the Kivy ones.  As there is no window, there
+is no :class:`GameApp` in headless mode.  Input is scripted instead, using the
+methods :meth:`GInput.press` and :meth:`GInput.release`.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+import math
+from .geometry import in_fan
+
+
+def is_num_tuple(t,size):
+    """
+    Checks whether a value is a sequence of numbers.
+
+    If the sequence is not of the given size, it also returns False.
+
+    :return: True if t is a sequence of numbers; False otherwise
+    :rtype:  ``bool``
+
+    :param t: The value to test
+    :type t:  any
+
+    :param size: The size of the sequence
+    :type size:  ``int`` >= 0
+    """
+    try:
+        return len(t) == size and all(type(z) in [int, float] for z in t)
+    except:
+        return False
+
+
+# #mark -
+class GObject(object):
+    """
+    A class representing a basic graphics object with no graphics.
+
+    This class has the same attributes as the Kivy version of :class:`GObject`.  The
+    colors are stored exactly as they are assigned, and :meth:`draw` does nothing.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def x(self):
+        """
+        The horizontal coordinate of the object center.
+
+        **invariant**: Value must be an ``int`` or ``float``
+        """
+        return self._x
+
+    @x.setter
+    def x(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        self._x = float(value)
+        self._aabb = None
+
+    @property
+    def y(self):
+        """
+        The vertical coordinate of the object center.
+
+        **invariant**: Value must be an ``int`` or ``float``
+        """
+        return self._y
+
+    @y.setter
+    def y(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        self._y = float(value)
+        self._aabb = None
+
+    @property
+    def width(self):
+        """
+        The horizontal width of this shape.
+
+        **invariant**: Value must be an ``int`` or ``float`` > 0
+        """
+        return self._width
+
+    @width.setter
+    def width(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        assert value > 0, '%s is not positive' % repr(value)
+        self._width = float(value)
+        self._aabb = None
+
+    @property
+    def height(self):
+        """
+        The vertical height of this shape.
+
+        **invariant**: Value must be an ``int`` or ``float`` > 0
+        """
+        return self._height
+
+    @height.setter
+    def height(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        assert value > 0, '%s is not positive' % repr(value)
+        self._height = float(value)
+        self._aabb = None
+
+    @property
+    def scale(self):
+        """
+        The scaling factor of this shape.
+
+        **invariant**: Value must be either a number (``int`` or ``float``) or a pair of numbers.
+        """
+        return self._scale
+
+    @scale.setter
+    def scale(self,value):
+        assert type(value) in [int,float] or is_num_tuple(value,2), \
+                '%s is not a valid scaling factor' % repr(value)
+        if type(value) in [int,float]:
+            self._scale = (float(value),float(value))
+        else:
+            self._scale = (float(value[0]),float(value[1]))
+        self._aabb = None
+
+    @property
+    def angle(self):
+        """
+        The angle of rotation about the center, in degrees counter-clockwise.
+
+        **invariant**: Value must be an ``int`` or ``float``
+        """
+        return self._angle
+
+    @angle.setter
+    def angle(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        self._angle = float(value)
+        self._aabb = None
+
+    @property
+    def linecolor(self):
+        """
+        The object line color, exactly as it was assigned.
+
+        **invariant**: Value is ``None`` or a color value.
+        """
+        return self._linecolor
+
+    @linecolor.setter
+    def linecolor(self,value):
+        self._linecolor = value
+
+    @property
+    def fillcolor(self):
+        """
+        The object fill color, exactly as it was assigned.
+
+        **invariant**: Value is ``None`` or a color value.
+        """
+        return self._fillcolor
+
+    @fillcolor.setter
+    def fillcolor(self,value):
+        self._fillcolor = value
+
+    @property
+    def name(self):
+        """
+        The name of this object, for debugging purposes only.
+
+        **invariant**: Value must be a ``str`` or ``None``
+        """
+        return self._name
+
+    @name.setter
+    def name(self,value):
+        assert value is None or type(value) == str, '%s is not a valid name' % repr(value)
+        self._name = value
+
+    # DERIVED PROPERTIES
+    @property
+    def left(self):
+        """
+        The left edge of this shape.
+
+        If rotation is 0, it is ``x-width/2``.  Otherwise, it is the left-most value of
+        the bounding box.
+
+        **invariant**: Value must be an ``int`` or ``float``.
+        """
+        return self._get_aabb()[0]
+
+    @left.setter
+    def left(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        diff = value-self.left
+        self.x += diff
+
+    @property
+    def right(self):
+        """
+        The right edge of this shape.
+
+        If rotation is 0, it is ``x+width/2``.  Otherwise, it is the right-most value
+        of the bounding box.
+
+        **invariant**: Value must be an ``int`` or ``float``.
+        """
+        return self._get_aabb()[2]
+
+    @right.setter
+    def right(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        diff = value-self.right
+        self.x += diff
+
+    @property
+    def top(self):
+        """
+        The vertical coordinate of the top edge.
+
+        If rotation is 0, it is ``y+height/2``.  Otherwise, it is the top-most value
+        of the bounding box.
+
+        **invariant**: Value must be an ``int`` or ``float``.
+        """
+        return self._get_aabb()[3]
+
+    @top.setter
+    def top(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        diff = value-self.top
+        self.y += diff
+
+    @property
+    def bottom(self):
+        """
+        The vertical coordinate of the bottom edge.
+
+        If rotation is 0, it is ``y-height/2``.  Otherwise, it is the bottom-most value
+        of the bounding box.
+
+        **invariant**: Value must be an ``int`` or ``float``.
+        """
+        return self._get_aabb()[1]
+
+    @bottom.setter
+    def bottom(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        diff = value-self.bottom
+        self.y += diff
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new headless GObject.
+
+        This constructor supports the same keywords as the Kivy version of
+        :class:`GObject`, and applies them in the same order.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self._x = 0.0
+        self._y = 0.0
+        self._angle = 0.0
+        self._scale = (1.0,1.0)
+        self._aabb = None
+
+        try:
+            self.width  = keywords['width']  if 'width'  in keywords else 1
+            self.height = keywords['height'] if 'height' in keywords else 1
+        except:
+            pass
+
+        if 'angle' in keywords:
+            self.angle = keywords['angle']
+
+        if 'x' in keywords:
+            self.x = keywords['x']
+        elif 'left' in keywords:
+            self.left = keywords['left']
+        elif 'right' in keywords:
+            self.right = keywords['right']
+
+        if 'y' in keywords:
+            self.y = keywords['y']
+        elif 'bottom' in keywords:
+            self.bottom = keywords['bottom']
+        elif 'top' in keywords:
+            self.top = keywords['top']
+
+        self.fillcolor = keywords['fillcolor'] if 'fillcolor' in keywords else None
+        self.linecolor = keywords['linecolor'] if 'linecolor' in keywords else None
+        self.name = keywords['name'] if 'name' in keywords else None
+
+    def __str__(self):
+        """
+        :return: A readable string representation of this object.
+        :rtype:  ``str``
+        """
+        if self.name is None:
+            s = '['
+        else:
+            s = '[name=%s,' % self.name
+        return '%s,center=(%s,%s),width=%s,height=%s,angle=%s]' \
+                % (s,repr(self.x),repr(self.y),repr(self.height),repr(self.width),repr(self.angle))
+
+    def __repr__(self):
+        """
+        :return: An unambiguous string representation of this object.
+        :rtype:  ``str``
+        """
+        return str(self.__class__)+str(self)
+
+
+    # PUBLIC METHODS
+    def contains(self,point):
+        """
+        Checks whether this shape contains the point
+
+        By default, this method just checks the bounding box of the shape.
+
+        :param point: the point to check
+        :type point: a pair of numbers
+
+        :return: True if the shape contains this point
+        :rtype:  ``bool``
+        """
+        px, py = self._local(point)
+        return abs(px) < self.width/2.0 and abs(py) < self.height/2.0
+
+    def contains_many(self,points):
+        """
+        Checks which of many points this shape contains
+
+        :param points: the points to check
+        :type points:  NumPy array of shape (N,2), or a sequence of number pairs
+
+        :return: a mask that is True for each point in this shape
+        :rtype:  NumPy ``bool`` array of shape (N,)
+        """
+        px, py = self._local_many(points)
+        return (abs(px) < self.width/2.0) & (abs(py) < self.height/2.0)
+
+    def overlaps(self,left,bottom,right,top):
+        """
+        Checks whether this shape overlaps an axis-aligned rectangle
+
+        The rectangle is open, so shapes that only share an edge do not overlap.
+
+        :param left: the left edge of the rectangle
+        :type left:  ``int`` or ``float``
+
+        :param bottom: the bottom edge of the rectangle
+        :type bottom:  ``int`` or ``float``
+
+        :param right: the right edge of the rectangle
+        :type right:  ``int`` or ``float``
+
+        :param top: the top edge of the rectangle
+        :type top:  ``int`` or ``float``
+
+        :return: True if the shape overlaps the rectangle
+        :rtype:  ``bool``
+        """
+        box = self._get_aabb()
+        if not (left < box[2] and box[0] < right and bottom < box[3] and box[1] < top):
+            return False
+        if self._angle == 0.0:
+            return True
+
+        # Separating axis test along the two axes of the rotated shape
+        rad = math.radians(self._angle)
+        c = math.cos(rad)
+        s = math.sin(rad)
+        cx = (left+right)/2.0-self._x
+        cy = (bottom+top)/2.0-self._y
+        rx = (right-left)/2.0
+        ry = (top-bottom)/2.0
+        if abs(c*cx+s*cy) >= self.width*self._scale[0]/2.0+abs(c)*rx+abs(s)*ry:
+            return False
+        return abs(c*cy-s*cx) < self.height*self._scale[1]/2.0+abs(s)*rx+abs(c)*ry
+
+    def intersects(self,other):
+        """
+        Checks whether this shape overlaps the bounding box of another
+
+        :param other: the shape to check
+        :type other:  :class:`GObject`
+
+        :return: True if this shape overlaps the bounding box of other
+        :rtype:  ``bool``
+        """
+        box = other._get_aabb()
+        return self.overlaps(box[0],box[1],box[2],box[3])
+
+    def draw(self, view):
+        """
+        Does nothing, as there is nothing to draw.
+
+        :param view: view to draw to
+        :type view:  :class:`GView`
+        """
+        pass
+
+    # HIDDEN METHODS
+    def _local(self,point):
+        """
+        Returns the point relative to the center, undoing rotation and scale.
+
+        As in the Kivy backend, rotation and scale are only undone if this shape is
+        rotated.  An unrotated shape is tested against its unscaled size.
+
+        :param point: the point to transform
+        :type point: a pair of numbers
+        """
+        dx = point[0]-self.x
+        dy = point[1]-self.y
+        if self._angle == 0.0:
+            return (dx,dy)
+        rad = math.radians(self._angle)
+        c = math.cos(rad)
+        s = math.sin(rad)
+        return ((c*dx+s*dy)/self._scale[0],(c*dy-s*dx)/self._scale[1])
+
+    def _get_aabb(self):
+        """
+        Returns the bounding box (left, bottom, right, top) of this shape.
+
+        The box is cached until the position, size, angle or scale changes.
+        """
+        if self._aabb is None:
+            if self._angle == 0.0:
+                w = self.width/2.0
+                h = self.height/2.0
+            else:
+                w, h = self._extents()
+            self._aabb = (self.x-w,self.y-h,self.x+w,self.y+h)
+        return self._aabb
+
+    def _local_many(self,points):
+        """
+        Returns the arrays (xs, ys) of the points relative to the center.
+
+        Rotation and scale are only undone if this shape is rotated, as in :meth:`_local`.
+
+        :param points: the points to transform
+        :type points:  NumPy array of shape (N,2), or a sequence of number pairs
+        """
+        import numpy as np
+        points = np.asarray(points,dtype=float).reshape(-1,2)
+        dx = points[:,0]-self.x
+        dy = points[:,1]-self.y
+        if self._angle == 0.0:
+            return (dx,dy)
+        rad = math.radians(self._angle)
+        c = math.cos(rad)
+        s = math.sin(rad)
+        return ((c*dx+s*dy)/self._scale[0],(c*dy-s*dx)/self._scale[1])
+
+    def _extents(self):
+        """
+        Returns the half width and half height of the rotated bounding box.
+        """
+        rad = math.radians(self._angle)
+        c = abs(math.cos(rad))
+        s = abs(math.sin(rad))
+        w = self.width*self._scale[0]/2.0
+        h = self.height*self._scale[1]/2.0
+        return (c*w+s*h,s*w+c*h)
+
+
+# #mark -
+class GScene(GObject):
+    """
+    A headless node in a scene graph.
+
+    The children are stored, but the scene is never drawn.
+    """
+
+    @property
+    def children(self):
+        """
+        The list of objects stored in this scene.
+
+        **invariant**: Value must be a list or tuple of :class:`GObject` (possibly empty)
+        """
+        return tuple(self._children)
+
+    @children.setter
+    def children(self,value):
+        self._children = list(value)
+
+    def __init__(self,**keywords):
+        """
+        Creates a new headless scene graph node.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self.children = keywords['children'] if 'children' in keywords else []
+        GObject.__init__(self,**keywords)
+        self._defined = True
+
+
+# #mark -
+class GRectangle(GObject):
+    """
+    A headless rectangle.
+
+    The only new property for this class is ``linewidth``.
+    """
+
+    @property
+    def linewidth(self):
+        """
+        The width of the exterior line of this shape.
+
+        **invariant**: Value must be an ``int`` or ``float`` >= 0.
+        """
+        return self._linewidth
+
+    @linewidth.setter
+    def linewidth(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        assert value >= 0, '%s is negative' % repr(value)
+        self._linewidth = value
+
+    def __init__(self,**keywords):
+        """
+        Creates a new headless rectangle.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self.linewidth = keywords['linewidth'] if 'linewidth' in keywords else 0.0
+        GObject.__init__(self,**keywords)
+        self._defined = True
+
+
+# #mark -
+class GEllipse(GRectangle):
+    """
+    A headless ellipse.
+    """
+
+    def contains(self,point):
+        """
+        Checks whether this shape contains the point
+
+        :param point: the point to check
+        :type point: a pair of numbers
+
+        :return: True if the shape contains this point
+        :rtype:  ``bool``
+        """
+        px, py = self._local(point)
+        rx = self.width/2.0
+        ry = self.height/2.0
+        return (px*px)/(rx*rx)+(py*py)/(ry*ry) <= 1.0
+
+    def contains_many(self,points):
+        """
+        Checks which of many points this shape contains
+
+        :param points: the points to check
+        :type points:  NumPy array of shape (N,2), or a sequence of number pairs
+
+        :return: a mask that is True for each point in this shape
+        :rtype:  NumPy ``bool`` array of shape (N,)
+        """
+        px, py = self._local_many(points)
+        rx = self.width/2.0
+        ry = self.height/2.0
+        return (px*px)/(rx*rx)+(py*py)/(ry*ry) <= 1.0
+
+
+# #mark -
+class GImage(GRectangle):
+    """
+    A headless image.
+
+    The ``source`` is remembered, but the image is never loaded.
+    """
+
+    @property
+    def source(self):
+        """
+        The source file for this image.
+
+        **invariant**. Value be a string refering to a file.
+        """
+        return self._source
+
+    @source.setter
+    def source(self,value):
+        self._source = value
+
+    def __init__(self,**keywords):
+        """
+        Creates a new headless image.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self.source = keywords['source'] if 'source' in keywords else None
+        GRectangle.__init__(self,**keywords)
+
+
+# #mark -
+class GSprite(GImage):
+    """
+    A headless filmstrip.
+
+    The frame is tracked (and checked) as in the Kivy version, but no texture regions
+    are ever created.
+    """
+
+    @property
+    def count(self):
+        """
+        The number of frames in this filmstrip
+
+        **invariant**. Value is an int > 0.
+        """
+        return self._format[0]*self._format[1]
+
+    @property
+    def frame(self):
+        """
+        The current animation frame of this filmstrip
+
+        **invariant**. Value is an int 0..count-1.
+        """
+        return self._frame
+
+    @frame.setter
+    def frame(self,value):
+        assert type(value) == int, '%s is not an int' % repr(value)
+        assert value >= 0 and value < self.count, '%s is out of range' % repr(value)
+        self._frame = value
+
+    def __init__(self,**keywords):
+        """
+        Creates a new headless sprite.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        value = keywords['format'] if 'format' in keywords else (1,1)
+        assert type(value) == tuple and len(value) == 2, '%s does is not a tuple pair' % repr(value)
+        self._format = value
+        self._frame = 0
+        GImage.__init__(self,**keywords)
+
+
+# #mark -
+class GLabel(GRectangle):
+    """
+    A headless text label.
+
+    As no text is rendered, the label does not grow to fit its text.
+    """
+
+    def __init__(self,**keywords):
+        """
+        Creates a new headless label.
+
+        The text attributes ``text``, ``font_name``, ``font_size``, ``bold``,
+        ``halign`` and ``valign`` are stored as plain attributes.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self.text = keywords['text'] if 'text' in keywords else ''
+        self.font_name = keywords['font_name'] if 'font_name' in keywords else None
+        self.font_size = keywords['font_size'] if 'font_size' in keywords else 15
+        self.bold = keywords['bold'] if 'bold' in keywords else False
+        self.halign = keywords['halign'] if 'halign' in keywords else 'center'
+        self.valign = keywords['valign'] if 'valign' in keywords else 'middle'
+        GRectangle.__init__(self,**keywords)
+
+
+# #mark -
+class GPath(GObject):
+    """
+    A headless sequence of line segments.
+
+    As with the Kivy version, ``width`` and ``height`` are computed from the points.
+    """
+
+    @property
+    def points(self):
+        """
+        The sequence of points that make up this line.
+
+        **Invariant**: Must be a sequence (list or tuple) of int or float.
+        """
+        return self._points
+
+    @points.setter
+    def points(self,value):
+        self._points = tuple(value)
+        self._aabb = None
+
+    @property
+    def width(self):
+        """
+        The horizontal width of this path.
+
+        **Invariant**: Must be an int or float > 0.
+        """
+        px = self.points[::2]+(0,0)
+        return 2*max(max(px),-min(px))
+
+    @width.setter
+    def width(self,value):
+        pass
+
+    @property
+    def height(self):
+        """
+        The vertical height of this path.
+
+        **Invariant**: Must be an int or float > 0.
+        """
+        py = self.points[1::2]+(0,0)
+        return 2*max(max(py),-min(py))
+
+    @height.setter
+    def height(self,value):
+        pass
+
+    def __init__(self,**keywords):
+        """
+        Creates a new headless path.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self.linewidth = keywords['linewidth'] if 'linewidth' in keywords else 1.0
+        self.points = keywords['points'] if 'points' in keywords else (0,0,10,10)
+        GObject.__init__(self,**keywords)
+        self._defined = True
+
+    def contains(self,point):
+        """
+        Checks whether this shape contains the point
+
+        This method always returns `False` as a ``GPath`` has no interior.
+
+        :param point: the point to check
+        :type point: a pair of numbers
+        """
+        return False
+
+
+# #mark -
+class GTriangle(GPath):
+    """
+    A headless solid triangle.
+    """
+
+    def contains(self,point):
+        """
+        Checks whether this shape contains the point
+
+        :param point: the point to check
+        :type point: a pair of numbers
+
+        :return: True if the shape contains this point
+        :rtype:  ``bool``
+        """
+        px, py = self._local(point)
+        return bool(in_fan(px,py,self.points[0:2],self.points[2:6]))
+
+    def contains_many(self,points):
+        """
+        Checks which of many points this shape contains
+
+        :param points: the points to check
+        :type points:  NumPy array of shape (N,2), or a sequence of number pairs
+
+        :return: a mask that is True for each point in this shape
+        :rtype:  NumPy ``bool`` array of shape (N,)
+        """
+        px, py = self._local_many(points)
+        return in_fan(px,py,self.points[0:2],self.points[2:6])
+
+
+# #mark -
+class GPolygon(GPath):
+    """
+    A headless solid polygon, stored as a triangle fan about the origin.
+    """
+
+    def __init__(self,**keywords):
+        """
+        Creates a new headless polygon.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self.source = keywords['source'] if 'source' in keywords else None
+        GPath.__init__(self,**keywords)
+
+    def contains(self,point):
+        """
+        Checks whether this shape contains the point
+
+        :param point: the point to check
+        :type point: a pair of numbers
+
+        :return: True if the shape contains this point
+        :rtype:  ``bool``
+        """
+        px, py = self._local(point)
+        return bool(in_fan(px,py,(0,0),self.points+self.points[0:2]))
+
+    def contains_many(self,points):
+        """
+        Checks which of many points this shape contains
+
+        :param points: the points to check
+        :type points:  NumPy array of shape (N,2), or a sequence of number pairs
+
+        :return: a mask that is True for each point in this shape
+        :rtype:  NumPy ``bool`` array of shape (N,)
+        """
+        px, py = self._local_many(points)
+        return in_fan(px,py,(0,0),self.points+self.points[0:2])
+
+
+# #mark -
+class GImageBatch(object):
+    """
+    A batch of images that is never drawn.
+
+    It accepts the same calls as the Kivy batch, but loads no textures and builds
+    no mesh.
+    """
+
+    @property
+    def sources(self):
+        """
+        The image files shown by this batch.
+
+        **Invariant**: Must be a nonempty tuple of image file names.
+        """
+        return self._sources
+
+    @property
+    def size(self):
+        """
+        The number of slots in this batch.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._size
+
+    @property
+    def width(self):
+        """
+        The width of every image in this batch.
+
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._width
+
+    @property
+    def height(self):
+        """
+        The height of every image in this batch.
+
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._height
+
+    def __init__(self,sources,size,width,height):
+        """
+        Creates a new batch of ``size`` hidden images.
+
+        :param sources: the image files to draw
+        :type sources:  nonempty ``list`` or ``tuple`` of file names
+
+        :param size: the number of slots
+        :type size:  ``int`` >= 0
+
+        :param width: the width of every image
+        :type width:  ``int`` or ``float`` > 0
+
+        :param height: the height of every image
+        :type height:  ``int`` or ``float`` > 0
+        """
+        assert len(sources) > 0, 'there are no sources'
+        assert type(size) == int and size >= 0, 'size %s is not a valid int' % repr(size)
+        self._sources = tuple(sources)
+        self._size = size
+        self._width = width
+        self._height = height
+
+    def choose(self,images):
+        """
+        Does nothing.
+
+        :param images: the position in ``sources`` of the image for each slot
+        :type images:  sequence of ``size`` ints
+        """
+        pass
+
+    def place(self,xs,ys,visible):
+        """
+        Does nothing.
+
+        :param xs: the horizontal coordinate of the center of each slot
+        :type xs:  sequence of ``size`` numbers
+
+        :param ys: the vertical coordinate of the center of each slot
+        :type ys:  sequence of ``size`` numbers
+
+        :param visible: whether each slot is drawn
+        :type visible:  sequence of ``size`` bools
+        """
+        pass
+
+    def draw(self,view):
+        """
+        Does nothing.
+
+        :param view: view to draw to
+        :type view:  :class:`GView`
+        """
+        pass
+
+
+# #mark -
+class GInput(object):
+    """
+    A scripted input handler.
+
+    This class has the same query interface as the Kivy :class:`GInput`, but the
+    keys are pressed and released by the program instead of a keyboard.  There is
+    no mouse, so :attr:`touch` is always None.
+    """
+
+    @property
+    def touch(self):
+        """
+        Always None, as there is no mouse.
+        """
+        return None
+
+    @property
+    def key_count(self):
+        """
+        The number of keys currently held down.
+
+        **Invariant**: Must be an int >= 0."""
+        return len(self._keys)
+
+    @property
+    def keys(self):
+        """
+        The keys that are currently held down.
+
+        **Invariant**: Must be a tuple of strings (possibly empty)
+        """
+        return tuple(self._keys)
+
+    def __init__(self,keys=()):
+        """
+        Creates a new scripted input handler.
+
+        :param keys: the keys that start held down
+        :type keys:  iterable of ``str``
+        """
+        self._keys = set(keys)
+
+    def is_key_down(self,key):
+        """
+        Checks wether the key is currently held down.
+
+        :param key: the key to test
+        :type key:  ``str``
+
+        :return: True if ``key`` is currently held down
+        :rtype:  ``bool``
+        """
+        return key in self._keys
+
+    def is_touch_down(self):
+        """
+        Always False, as there is no mouse.
+        """
+        return False
+
+    def press(self,*keys):
+        """
+        Holds down the given keys.
+
+        :param keys: the keys to press
+        :type keys:  ``str``
+        """
+        self._keys.update(keys)
+
+    def release(self,*keys):
+        """
+        Releases the given keys.  Keys that are not held down are ignored.
+
+        :param keys: the keys to release
+        :type keys:  ``str``
+        """
+        self._keys.difference_update(keys)
+
+    def set_keys(self,keys):
+        """
+        Replaces the keys held down with exactly the given keys.
+
+        :param keys: the keys to hold down
+        :type keys:  iterable of ``str``
+        """
+        self._keys = set(keys)
+
+
+# #mark -
+class GView(object):
+    """
+    A view that discards everything drawn to it.
+    """
+    # Nothing is drawn, so retained mode changes nothing
+    retained = False
+
+    def draw(self,cmd):
+        """
+        Does nothing.
+
+        :param cmd: the command to draw
+        :type cmd:  any
+        """
+        pass
+
+    def clear(self):
+        """
+        Does nothing.
+        """
+        pass
+
+    def flush(self):
+        """
+        Does nothing.
+        """
+        pass
+
+
+# #mark -
+class Sound(object):
+    """
+    A silent sound.
+
+    The sound is never loaded, and playing it does nothing.
+    """
+
+    @property
+    def source(self):
+        """
+        The source file for this sound.
+
+        **Invariant**: Must be a nonempty string.
+        """
+        return self._source
+
+    @property
+    def playing(self):
+        """
+        Always False, as the sound is silent.
+        """
+        return False
+
+    def __init__(self,source):
+        """
+        Creates a new silent sound.
+
+        :param source: The string providing the name of a sound file
+        :type source:  ``str``
+        """
+        self._source = source
+        self.volume = 1.0
+
+    def play(self,loop=False):
+        """
+        Does nothing.
+
+        :param loop: Whether or not to loop the sound
+        :type loop:  ``bool``
+        """
+        pass
+
+    def stop(self):
+        """
+        Does nothing.
+        """
+        pass
+
+
+# #mark -
+class SoundPool(Sound):
+    """
+    A silent pool of voices.
+
+    The voices are never loaded, and playing the pool does nothing.
+    """
+
+    @property
+    def voices(self):
+        """
+        The maximum number of voices playing at once.
+
+        **Invariant**: Must be an int > 0.
+        """
+        return self._voices
+
+    @property
+    def loaded(self):
+        """
+        Always True, as there is nothing to load.
+        """
+        return True
+
+    def __init__(self,source,voices=4,load=True):
+        """
+        Creates a new silent pool.
+
+        :param source: The string providing the name of a sound file
+        :type source:  ``str``
+
+        :param voices: The maximum number of voices playing at once
+        :type voices:  ``int`` > 0
+
+        :param load: Ignored, as there is nothing to load
+        :type load:  ``bool``
+        """
+        Sound.__init__(self,source)
+        self._voices = voices
+
+    def load(self):
+        """
+        Does nothing.
+        """
+        pass
+
+    def play(self,loop=False):
+        """
+        Does nothing, and returns None as no voice is played.
+
+        :param loop: Whether or not to loop the sound
+        :type loop:  ``bool``
+        """
+        return None
+
+
+# #mark -
+class SoundLibrary(dict):
+    """
+    A dictionary that maps keys to silent sound pools.
+
+    If the library is made with a :class:`Mixer`, each sound is a :class:`MixerSound`
+    of that mixer instead, so the sounds of a headless game can be mixed to a file.
+    """
+
+    @property
+    def voices(self):
+        """
+        The number of voices of each sound in this library.
+
+        **Invariant**: Must be an int > 0.
+        """
+        return self._voices
+
+    @property
+    def loading(self):
+        """
+        Always False, as there is nothing to load.
+        """
+        return False
+
+    @property
+    def mixer(self):
+        """
+        The software mixer playing the sounds, or None if they are silent.
+
+        **Invariant**: Must be a :class:`Mixer` or None.
+        """
+        return self._mixer
+
+    def __init__(self,voices=4,mixer=None):
+        """
+        Creates a new, empty sound library.
+
+        :param voices: The number of voices of each sound
+        :type voices:  ``int`` > 0
+
+        :param mixer: The software mixer to play the sounds, or None for silence
+        :type mixer:  :class:`Mixer` or None
+        """
+        dict.__init__(self)
+        self._voices = voices
+        self._mixer = mixer
+
+    def __setitem__(self, key, filename):
+        """
+        Creates a sound for filename and assigns it the given name.
+
+        :param key: The key identifying a sound object
+        :type key:  ``str``
+
+        :param filename: The name of the file containing the sound source
+        :type filename:  ``str``
+        """
+        if self._mixer is None:
+            dict.__setitem__(self,key,SoundPool(filename,self._voices))
+        else:
+            from .mixer import MixerSound
+            dict.__setitem__(self,key,MixerSound(filename,self._mixer))
+
+    def preload(self):
+        """
+        Does nothing, and returns None as no thread is started.
+        """
+        return None
+
+    def wait(self,timeout=None):
+        """
+        Returns True at once, as there is nothing to load.
+
+        :param timeout: Ignored
+        :type timeout:  ``int``, ``float`` or None
+        """
+        return True
@@ -0,0 +1,760 @@
+"""
+A software audio mixer for 2D game support.
+
+Each :class:`Sound` wraps its own Kivy audio player, which is not reliable on every
+platform, and every sound effect is a separate stream.  The :class:`Mixer` in this
+module instead decodes each WAV file once into a NumPy buffer, and a background thread
+adds the playing voices (each with its own volume) into a single output stream.  The
+cost of a block of audio depends only on the number of voices, which is bounded by
+``max_voices``, and not on how many sounds have been played.
+
+The output of the mixer goes to a sink.  A :class:`DeviceSink` plays it on the sound
+card with the optional ``sounddevice`` package.  A :class:`NullSink` discards it and a
+:class:`FileSink` saves it to a WAV file, so the mixer can be used (and tested) with
+no sound card at all.  This module never imports Kivy.
+
+The WAV files are parsed by hand.  The standard library module :mod:`wave` cannot be
+used, as a game module named ``wave.py`` (such as the one in Alien Invaders) hides it.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+import os
+import struct
+import sys
+import threading
+import time
+import numpy as np
+
+# The sample rate of the mixer, by default
+RATE = 44100
+# The number of output channels of the mixer, by default
+CHANNELS = 2
+# The number of frames mixed at a time, by default
+BLOCK = 512
+# The maximum number of voices playing at once, by default
+MAX_VOICES = 32
+
+# The format codes of the WAV files that can be decoded
+_PCM = 1
+_FLOAT = 3
+_EXTENSIBLE = 0xFFFE
+
+
+def decode_wav(path):
+    """
+    Returns: the tuple (rate, samples) of a WAV file
+
+    The samples are a float32 array of shape (frames, channels) in the range -1..1.
+    The file may be 8, 16, 24 or 32 bit PCM, or 32 or 64 bit floating point.
+
+    :param path: the WAV file
+    :type path:  ``str``
+    """
+    with open(path,'rb') as file:
+        data = file.read()
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise IOError('%s is not a WAV file' % repr(path))
+
+    fmt = None
+    body = None
+    pos = 12
+    while pos+8 <= len(data):
+        chunk, size = struct.unpack_from('<4sI',data,pos)
+        if chunk == b'fmt ':
+            fmt = struct.unpack_from('<HHIIHH',data,pos+8)
+            if fmt[0] == _EXTENSIBLE and size >= 40:
+                # The real format code starts the subformat GUID
+                fmt = (struct.unpack_from('<H',data,pos+32)[0],)+fmt[1:]
+        elif chunk == b'data':
+            body = data[pos+8:pos+8+size]
+        pos += 8+size+(size & 1)
+    if fmt is None or body is None:
+        raise IOError('%s has no audio' % repr(path))
+
+    code, channels, rate, _, align, bits = fmt
+    width = bits//8
+    body = body[:len(body)-len(body) % align]
+    if code == _FLOAT and bits in (32,64):
+        samples = np.frombuffer(body,dtype='<f%d' % width).astype(np.float32)
+    elif code == _PCM and bits == 8:
+        samples = (np.frombuffer(body,dtype=np.uint8).astype(np.float32)-128)/128.0
+    elif code == _PCM and bits in (16,32):
+        samples = np.frombuffer(body,dtype='<i%d' % width).astype(np.float32)/float(1 << (bits-1))
+    elif code == _PCM and bits == 24:
+        raw = np.frombuffer(body,dtype=np.uint8).reshape(-1,3).astype(np.int32)
+        value = raw[:,0] | (raw[:,1] << 8) | (raw[:,2] << 16)
+        value = np.where(value >= 1 << 23,value-(1 << 24),value)
+        samples = value.astype(np.float32)/float(1 << 23)
+    else:
+        raise IOError('%s has an unsupported format (code %d, %d bits)' % (repr(path),code,bits))
+    return (rate,samples.reshape(-1,channels))
+
+
+def convert(samples, rate, target, channels):
+    """
+    Returns: the samples converted to a new sample rate and number of channels
+
+    The rate is converted with linear interpolation.  Mono is copied to every channel,
+    and several channels are averaged down to mono.
+
+    :param samples: the samples to convert
+    :type samples:  float32 array of shape (frames, channels)
+
+    :param rate: the sample rate of ``samples``
+    :type rate:  ``int`` > 0
+
+    :param target: the new sample rate
+    :type target:  ``int`` > 0
+
+    :param channels: the new number of channels
+    :type channels:  ``int`` > 0
+    """
+    if samples.shape[1] != channels:
+        if samples.shape[1] == 1:
+            samples = np.repeat(samples,channels,axis=1)
+        elif channels == 1:
+            samples = samples.mean(axis=1,keepdims=True)
+        else:
+            samples = np.repeat(samples.mean(axis=1,keepdims=True),channels,axis=1)
+    if rate != target and len(samples) > 0:
+        frames = int(round(len(samples)*target/rate))
+        times = np.arange(frames)*(rate/target)
+        source = np.arange(len(samples))
+        samples = np.stack([np.interp(times,source,samples[:,c]) for c in range(channels)],axis=1)
+    return np.ascontiguousarray(samples,dtype=np.float32)
+
+
+# #mark -
+class NullSink(object):
+    """
+    A sink that discards the audio of a :class:`Mixer`.
+
+    The sink counts the frames written, so that tests can check the mixer is running.
+    It does not block, so the mixer thread paces itself to real time.
+    """
+    # Whether write blocks until the audio is played
+    blocking = False
+
+    @property
+    def frames(self):
+        """
+        The number of frames written so far.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._frames
+
+    def __init__(self):
+        """
+        Creates a new sink with no frames written.
+        """
+        self._frames = 0
+
+    def open(self,rate,channels):
+        """
+        Prepares the sink for audio with the given format.
+
+        :param rate: the sample rate
+        :type rate:  ``int`` > 0
+
+        :param channels: the number of channels
+        :type channels:  ``int`` > 0
+        """
+        pass
+
+    def write(self,block):
+        """
+        Discards a block of audio.
+
+        :param block: the audio samples
+        :type block:  float32 array of shape (frames, channels)
+        """
+        self._frames += len(block)
+
+    def close(self):
+        """
+        Closes the sink.
+        """
+        pass
+
+
+# #mark -
+class FileSink(NullSink):
+    """
+    A sink that saves the audio of a :class:`Mixer` to a 16 bit WAV file.
+
+    The file is complete once the sink is closed (with :meth:`Mixer.close`).
+    """
+
+    def __init__(self,path):
+        """
+        Creates a new sink writing to the given file.
+
+        :param path: the WAV file to write
+        :type path:  ``str``
+        """
+        NullSink.__init__(self)
+        self._path = path
+        self._file = None
+        self._channels = 0
+
+    def open(self,rate,channels):
+        """
+        Opens the file and writes the WAV header.
+
+        :param rate: the sample rate
+        :type rate:  ``int`` > 0
+
+        :param channels: the number of channels
+        :type channels:  ``int`` > 0
+        """
+        self._file = open(self._path,'wb')
+        self._channels = channels
+        self._file.write(struct.pack('<4sI4s4sIHHIIHH4sI',b'RIFF',36,b'WAVE',b'fmt ',16,
+                                     _PCM,channels,rate,rate*channels*2,channels*2,16,
+                                     b'data',0))
+
+    def write(self,block):
+        """
+        Appends a block of audio to the file.
+
+        :param block: the audio samples
+        :type block:  float32 array of shape (frames, channels)
+        """
+        NullSink.write(self,block)
+        if not self._file is None:
+            self._file.write((block*32767).astype('<i2').tobytes())
+
+    def close(self):
+        """
+        Fixes the sizes in the WAV header and closes the file.
+        """
+        if self._file is None:
+            return
+        size = self._frames*self._channels*2
+        self._file.seek(4)
+        self._file.write(struct.pack('<I',36+size))
+        self._file.seek(40)
+        self._file.write(struct.pack('<I',size))
+        self._file.close()
+        self._file = None
+
+
+# #mark -
+class DeviceSink(NullSink):
+    """
+    A sink that plays the audio of a :class:`Mixer` on the sound card.
+
+    This sink needs the optional package ``sounddevice``.  Creating it raises an
+    ``ImportError`` if that package is not installed.  Writes block until the sound card
+    is ready for more audio, which paces the mixer thread.
+    """
+    blocking = True
+
+    def __init__(self):
+        """
+        Creates a new sink for the default output device.
+        """
+        import sounddevice
+        NullSink.__init__(self)
+        self._module = sounddevice
+        self._stream = None
+
+    def open(self,rate,channels):
+        """
+        Opens an output stream on the default device.
+
+        :param rate: the sample rate
+        :type rate:  ``int`` > 0
+
+        :param channels: the number of channels
+        :type channels:  ``int`` > 0
+        """
+        self._stream = self._module.OutputStream(samplerate=rate,channels=channels,
+                                                 dtype='float32')
+        self._stream.start()
+
+    def write(self,block):
+        """
+        Plays a block of audio, waiting until the device is ready for it.
+
+        :param block: the audio samples
+        :type block:  float32 array of shape (frames, channels)
+        """
+        NullSink.write(self,block)
+        self._stream.write(block)
+
+    def close(self):
+        """
+        Stops the output stream.
+        """
+        if not self._stream is None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+
+# #mark -
+class Mixer(object):
+    """
+    A class to mix sound effects into a single audio stream.
+
+    Sounds are decoded once with :meth:`load` and played with :meth:`play`, which
+    returns a voice id.  Any number of voices of the same sound may play at once, up to
+    ``max_voices`` in total.  If that many voices are playing, :meth:`play` steals the
+    oldest one.
+
+    Audio is produced a block at a time by :meth:`mix`.  Once :meth:`start` is called,
+    a background thread mixes block after block and writes them to the sink, until
+    :meth:`close`.  Without :meth:`start`, :meth:`mix` may be called directly, which is
+    how the mixer is tested.  Every method is safe to call from the game thread while
+    the mixer thread is running.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def volume(self):
+        """
+        The master volume, applied to the mix of every voice.
+
+        **Invariant**: Must be a float in the range 0..1.
+        """
+        return self._volume
+
+    @volume.setter
+    def volume(self,value):
+        assert type(value) in [int,float] and 0 <= value <= 1, 'value %s is not a valid volume' % repr(value)
+        self._volume = float(value)
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def rate(self):
+        """
+        The sample rate of the output stream.
+
+        **Invariant**: Must be an int > 0.
+        """
+        return self._rate
+
+    @property
+    def channels(self):
+        """
+        The number of channels of the output stream.
+
+        **Invariant**: Must be an int > 0.
+        """
+        return self._channels
+
+    @property
+    def block(self):
+        """
+        The number of frames mixed at a time by the mixer thread.
+
+        **Invariant**: Must be an int > 0.
+        """
+        return self._block
+
+    @property
+    def max_voices(self):
+        """
+        The maximum number of voices playing at once.
+
+        **Invariant**: Must be an int > 0.
+        """
+        return self._max_voices
+
+    @property
+    def sink(self):
+        """
+        The sink the mixer thread writes to.
+
+        **Invariant**: Must be a sink (such as a :class:`NullSink`).
+        """
+        return self._sink
+
+    @property
+    def names(self):
+        """
+        The names of the sounds loaded so far.
+
+        **Invariant**: Must be a tuple of strings.
+        """
+        return tuple(self._buffers)
+
+    @property
+    def voices(self):
+        """
+        The number of voices playing.
+
+        **Invariant**: Must be an int in 0..max_voices.
+        """
+        return len(self._voices)
+
+    @property
+    def running(self):
+        """
+        Whether the mixer thread is running.
+
+        **Invariant**: Must be a bool.
+        """
+        return not self._thread is None and self._thread.is_alive()
+
+
+    # BUILT-IN METHODS
+    def __init__(self,sink=None,rate=RATE,channels=CHANNELS,block=BLOCK,max_voices=MAX_VOICES):
+        """
+        Creates a new mixer with no sounds.
+
+        :param sink: the sink for the mixed audio, or None for a :class:`NullSink`
+        :type sink:  a sink or None
+
+        :param rate: the sample rate of the output
+        :type rate:  ``int`` > 0
+
+        :param channels: the number of output channels
+        :type channels:  ``int`` > 0
+
+        :param block: the number of frames mixed at a time
+        :type block:  ``int`` > 0
+
+        :param max_voices: the maximum number of voices playing at once
+        :type max_voices:  ``int`` > 0
+        """
+        assert type(rate) == int and rate > 0, 'rate %s is not a valid int' % repr(rate)
+        assert type(channels) == int and channels > 0, 'channels %s is not a valid int' % repr(channels)
+        assert type(block) == int and block > 0, 'block %s is not a valid int' % repr(block)
+        assert type(max_voices) == int and max_voices > 0, 'max_voices %s is not a valid int' % repr(max_voices)
+        self._sink = NullSink() if sink is None else sink
+        self._rate = rate
+        self._channels = channels
+        self._block = block
+        self._max_voices = max_voices
+        self._volume = 1.0
+        self._buffers = {}
+        # Each voice is a list [id, samples, position, volume, loop]
+        self._voices = []
+        self._next = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._done = threading.Event()
+
+    def __contains__(self,name):
+        """
+        Returns: True if a sound with the given name is loaded
+
+        :param name: the sound name
+        :type name:  ``str``
+        """
+        return name in self._buffers
+
+
+    # PUBLIC METHODS
+    def load(self,name,path=None):
+        """
+        Decodes a WAV file and stores it under the given name.
+
+        The samples are converted to the rate and channels of the mixer.  If ``path`` is
+        None, the file is ``name`` in the **Sounds** folder of the running game (or
+        ``name`` itself, if there is no game).
+
+        :param name: the sound name
+        :type name:  ``str``
+
+        :param path: the WAV file, or None to use ``name``
+        :type path:  ``str`` or None
+        """
+        if path is None:
+            path = name
+            # Use the Sounds folder only if a game has been made (without importing Kivy)
+            app = sys.modules.get(__package__+'.app')
+            if not app is None and hasattr(app.GameApp,'sounds'):
+                path = os.path.join(app.GameApp.sounds,name)
+        rate, samples = decode_wav(path)
+        self._buffers[name] = convert(samples,rate,self._rate,self._channels)
+
+    def load_folder(self,folder):
+        """
+        Decodes every WAV file in a folder, each stored under its file name.
+
+        :param folder: the folder with the WAV files
+        :type folder:  ``str``
+        """
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith('.wav'):
+                self.load(name,os.path.join(folder,name))
+
+    def play(self,name,volume=1.0,loop=False):
+        """
+        Returns: the id of a new voice playing the sound ``name``
+
+        If ``max_voices`` voices are already playing, the oldest one is stopped.
+
+        :param name: the sound name
+        :type name:  ``str`` of a loaded sound
+
+        :param volume: the volume of this voice
+        :type volume:  ``int`` or ``float`` in 0..1
+
+        :param loop: whether the voice repeats until stopped
+        :type loop:  ``bool``
+        """
+        assert name in self._buffers, '%s is not a loaded sound' % repr(name)
+        assert type(volume) in [int,float] and 0 <= volume <= 1, 'volume %s is not valid' % repr(volume)
+        with self._lock:
+            self._next += 1
+            if len(self._voices) >= self._max_voices:
+                del self._voices[0]
+            self._voices.append([self._next,self._buffers[name],0,float(volume),loop])
+            return self._next
+
+    def playing(self,voice):
+        """
+        Returns: True if the given voice is still playing
+
+        :param voice: the voice id
+        :type voice:  ``int``
+        """
+        with self._lock:
+            return any(entry[0] == voice for entry in self._voices)
+
+    def set_volume(self,voice,volume):
+        """
+        Changes the volume of a playing voice.
+
+        This does nothing if the voice has finished.
+
+        :param voice: the voice id
+        :type voice:  ``int``
+
+        :param volume: the volume of the voice
+        :type volume:  ``int`` or ``float`` in 0..1
+        """
+        assert type(volume) in [int,float] and 0 <= volume <= 1, 'volume %s is not valid' % repr(volume)
+        with self._lock:
+            for entry in self._voices:
+                if entry[0] == voice:
+                    entry[3] = float(volume)
+
+    def stop(self,voice=None):
+        """
+        Stops a voice, or every voice if ``voice`` is None.
+
+        :param voice: the voice id, or None for every voice
+        :type voice:  ``int`` or None
+        """
+        with self._lock:
+            if voice is None:
+                self._voices = []
+            else:
+                self._voices = [entry for entry in self._voices if entry[0] != voice]
+
+    def mix(self,frames=None):
+        """
+        Returns: the next ``frames`` frames of the mix of every playing voice
+
+        Each voice advances by ``frames`` frames, and finished voices are removed.  The
+        result is clipped to the range -1..1.
+
+        :param frames: the number of frames, or None for ``block``
+        :type frames:  ``int`` > 0 or None
+        """
+        frames = self._block if frames is None else frames
+        out = np.zeros((frames,self._channels),dtype=np.float32)
+        with self._lock:
+            finished = []
+            for entry in self._voices:
+                samples, pos, volume, loop = entry[1], entry[2], entry[3], entry[4]
+                filled = 0
+                while filled < frames:
+                    take = min(frames-filled,len(samples)-pos)
+                    if take > 0:
+                        out[filled:filled+take] += samples[pos:pos+take]*volume
+                    filled += take
+                    pos += take
+                    if pos >= len(samples):
+                        if not loop or len(samples) == 0:
+                            finished.append(entry)
+                            break
+                        pos = 0
+                entry[2] = pos
+            for entry in finished:
+                self._voices.remove(entry)
+        if self._volume != 1:
+            out *= self._volume
+        np.clip(out,-1,1,out=out)
+        return out
+
+    def start(self):
+        """
+        Opens the sink and starts the mixer thread.
+
+        If the sink does not block, the thread sleeps between blocks so that audio is
+        produced in real time.
+        """
+        if self.running:
+            return
+        self._done.clear()
+        self._sink.open(self._rate,self._channels)
+        self._thread = threading.Thread(target=self._run,name='Mixer',daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """
+        Stops the mixer thread and closes the sink.
+        """
+        if not self._thread is None:
+            self._done.set()
+            self._thread.join()
+            self._thread = None
+            self._sink.close()
+
+
+    # HIDDEN METHODS
+    def _run(self):
+        """
+        Mixes blocks and writes them to the sink until the mixer is closed.
+        """
+        period = self._block/self._rate
+        due = time.perf_counter()
+        while not self._done.is_set():
+            self._sink.write(self.mix())
+            if not self._sink.blocking:
+                due += period
+                delay = due-time.perf_counter()
+                if delay > 0:
+                    self._done.wait(delay)
+                else:
+                    due = time.perf_counter()
+
+
+# #mark -
+class MixerSound(object):
+    """
+    A class representing a sound played through a :class:`Mixer`.
+
+    This class has the same interface as :class:`Sound` and :class:`SoundPool`, so a
+    :class:`SoundLibrary` built with a mixer stores these instead.  The sound may be
+    played again before it finishes, as every call to :meth:`play` is a new voice of
+    the mixer.  Changing the volume changes every voice of this sound still playing.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def volume(self):
+        """
+        The current sound volume.
+
+        **Invariant**: Must be float in the range 0..1.
+        """
+        return self._volume
+
+    @volume.setter
+    def volume(self,value):
+        assert type(value) in [int,float] and value >= 0 and value <= 1, 'value %s is not a valid volume' % repr(value)
+        self._volume = float(value)
+        for voice in self._live():
+            self._mixer.set_volume(voice,self._volume)
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def source(self):
+        """
+        The source file for this sound.
+
+        **Invariant**: Must be a nonempty string naming a WAV file.
+        """
+        return self._source
+
+    @property
+    def mixer(self):
+        """
+        The mixer playing this sound.
+
+        **Invariant**: Must be a :class:`Mixer`.
+        """
+        return self._mixer
+
+    @property
+    def loaded(self):
+        """
+        Whether or not the sound is decoded into the mixer.
+
+        **Invariant**: Must be a boolean.
+        """
+        return self._source in self._mixer
+
+    @property
+    def playing(self):
+        """
+        Whether or not a voice of this sound is currently playing.
+
+        **Invariant**: Must be a boolean.
+        """
+        return len(self._live()) > 0
+
+
+    # BUILT-IN METHODS
+    def __init__(self,source,mixer,load=True):
+        """
+        Creates a sound object for the given file, played through ``mixer``.
+
+        If ``load`` is False, the file is not decoded until :meth:`load` is called, and
+        playing the sound does nothing until then.
+
+        :param source: The string providing the name of a WAV file
+        :type source:  ``str``
+
+        :param mixer: The mixer to play the sound
+        :type mixer:  :class:`Mixer`
+
+        :param load: Whether to decode the file now
+        :type load:  ``bool``
+        """
+        self._source = source
+        self._mixer = mixer
+        self._volume = 1.0
+        self._voices = []
+        if load:
+            self.load()
+
+
+    # PUBLIC METHODS
+    def load(self):
+        """
+        Decodes the sound file into the mixer, if it is not already.
+        """
+        if not self._source in self._mixer:
+            self._mixer.load(self._source)
+
+    def play(self,loop=False):
+        """
+        Plays this sound as a new voice of the mixer.
+
+        :param loop: Whether to loop the sound
+        :type loop:  ``bool``
+
+        :return: The id of the new voice, or None if the sound is not loaded
+        :rtype:  ``int`` or None
+        """
+        if not self.loaded:
+            return None
+        voice = self._mixer.play(self._source,self._volume,loop)
+        self._voices = self._live()+[voice]
+        return voice
+
+    def stop(self):
+        """
+        Stops every voice of this sound.
+        """
+        for voice in self._voices:
+            self._mixer.stop(voice)
+        self._voices = []
+
+
+    # HIDDEN METHODS
+    def _live(self):
+        """
+        Returns: the ids of the voices of this sound that are still playing
+        """
+        return [voice for voice in self._voices if self._mixer.playing(voice)]
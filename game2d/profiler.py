@@ -0,0 +1,283 @@
+"""
+A module to measure where the time of each animation frame goes.
+
+A :class:`Profiler` times named sections of code, such as the ``update`` and ``draw``
+of a :class:`GameApp`.  Each section keeps the durations of its most recent runs in a
+rolling window, so the statistics (in particular the 50th, 95th and 99th percentile)
+always describe the last few seconds of play, and not the whole session.
+
+This module only uses the Python standard library, so it may also be used in headless
+mode.  Profiling is opt-in: nothing is timed unless a profiler is created and passed
+to the code being measured.
+
+Author: Walker M. White (wmw2)
+Date:   August 1, 2017 (Python 3 version)
+"""
+import time
+
+# The number of samples kept by each section (4 seconds at 60 FPS)
+WINDOW = 240
+# The percentiles reported by each section
+PERCENTILES = (50,95,99)
+
+
+# #mark -
+class Timing(object):
+    """
+    A class representing the recent durations of a single section of code.
+
+    The durations are stored in seconds in a ring buffer of ``window`` samples.  Once
+    the buffer is full, each new sample replaces the oldest one.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def window(self):
+        """
+        The maximum number of samples kept.
+
+        **Invariant**: Must be an int > 0.
+        """
+        return self._window
+
+    @property
+    def count(self):
+        """
+        The number of samples currently kept.
+
+        **Invariant**: Must be an int in 0..window.
+        """
+        return len(self._samples)
+
+    @property
+    def last(self):
+        """
+        The most recent sample in seconds (0 if there are no samples).
+
+        **Invariant**: Must be a float >= 0.
+        """
+        if not self._samples:
+            return 0.0
+        return self._samples[self._next-1]
+
+
+    # BUILT-IN METHODS
+    def __init__(self,window=WINDOW):
+        """
+        Creates a new timing with no samples.
+
+        :param window: the maximum number of samples kept
+        :type window:  ``int`` > 0
+        """
+        assert type(window) == int and window > 0, 'window %s is not a valid int' % repr(window)
+        self._window = window
+        self._samples = []
+        self._next = 0
+
+
+    # PUBLIC METHODS
+    def add(self,seconds):
+        """
+        Adds a sample, replacing the oldest one if the window is full.
+
+        :param seconds: the duration of the section
+        :type seconds:  ``int`` or ``float`` >= 0
+        """
+        if len(self._samples) < self._window:
+            self._samples.append(seconds)
+        else:
+            self._samples[self._next] = seconds
+        self._next = (self._next+1) % self._window
+
+    def mean(self):
+        """
+        Returns: the average of the samples in seconds (0 if there are no samples)
+        """
+        if not self._samples:
+            return 0.0
+        return sum(self._samples)/len(self._samples)
+
+    def percentile(self,q):
+        """
+        Returns: the q-th percentile of the samples in seconds (0 if there are none)
+
+        This is the nearest-rank percentile: the smallest sample that is at least as
+        large as q percent of the samples.
+
+        :param q: the percentile
+        :type q:  ``int`` or ``float`` in 0..100
+        """
+        assert type(q) in [int,float] and 0 <= q <= 100, 'q %s is not a valid percentile' % repr(q)
+        return self.percentiles((q,))[0]
+
+    def percentiles(self,qs=PERCENTILES):
+        """
+        Returns: a tuple with the given percentiles of the samples in seconds
+
+        This sorts the samples once for all of the percentiles.
+
+        :param qs: the percentiles
+        :type qs:  ``tuple`` of ``int`` or ``float`` in 0..100
+        """
+        if not self._samples:
+            return tuple(0.0 for q in qs)
+        ordered = sorted(self._samples)
+        n = len(ordered)
+        result = []
+        for q in qs:
+            rank = max(int(-(-q*n//100)),1)
+            result.append(ordered[min(rank,n)-1])
+        return tuple(result)
+
+    def clear(self):
+        """
+        Removes every sample.
+        """
+        self._samples = []
+        self._next = 0
+
+
+# #mark -
+class Section(object):
+    """
+    A context manager timing one run of a section of a :class:`Profiler`.
+
+    You should never make one of these yourself.  Use :meth:`Profiler.section`, which
+    reuses the same object for every run of a section.
+    """
+
+    def __init__(self,timing):
+        """
+        Creates a context manager adding its durations to ``timing``.
+
+        :param timing: the timing of the section
+        :type timing:  :class:`Timing`
+        """
+        self._timing = timing
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        self._timing.add(time.perf_counter()-self._start)
+        return False
+
+
+# #mark -
+class Profiler(object):
+    """
+    A class to time the named sections of an animation frame.
+
+    To time a section, wrap it in a ``with`` statement::
+
+        with profiler.section('update'):
+            self.update(dt)
+
+    A section is created the first time its name is used, and the sections are
+    reported in that order.  Sections may be nested (such as the stages of ``update``
+    inside of ``update``), but a section may not be nested in itself.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def names(self):
+        """
+        The names of the sections timed so far, in the order they were first used.
+
+        **Invariant**: Must be a tuple of strings.
+        """
+        return tuple(self._timings)
+
+    @property
+    def window(self):
+        """
+        The maximum number of samples kept by each section.
+
+        **Invariant**: Must be an int > 0.
+        """
+        return self._window
+
+
+    # BUILT-IN METHODS
+    def __init__(self,window=WINDOW):
+        """
+        Creates a new profiler with no sections.
+
+        :param window: the maximum number of samples kept by each section
+        :type window:  ``int`` > 0
+        """
+        assert type(window) == int and window > 0, 'window %s is not a valid int' % repr(window)
+        self._window = window
+        self._timings = {}
+        self._sections = {}
+
+    def __contains__(self,name):
+        """
+        Returns: True if a section with this name has been timed
+
+        :param name: the section name
+        :type name:  ``str``
+        """
+        return name in self._timings
+
+
+    # PUBLIC METHODS
+    def section(self,name):
+        """
+        Returns: a context manager that times one run of the section ``name``
+
+        :param name: the section name
+        :type name:  ``str``
+        """
+        if not name in self._sections:
+            self._sections[name] = Section(self.timing(name))
+        return self._sections[name]
+
+    def timing(self,name):
+        """
+        Returns: the :class:`Timing` of the section ``name``, creating it if necessary
+
+        :param name: the section name
+        :type name:  ``str``
+        """
+        if not name in self._timings:
+            self._timings[name] = Timing(self._window)
+        return self._timings[name]
+
+    def record(self,name,seconds):
+        """
+        Adds a duration measured elsewhere to the section ``name``.
+
+        :param name: the section name
+        :type name:  ``str``
+
+        :param seconds: the duration of the section
+        :type seconds:  ``int`` or ``float`` >= 0
+        """
+        self.timing(name).add(seconds)
+
+    def clear(self):
+        """
+        Removes every sample from every section.
+        """
+        for timing in self._timings.values():
+            timing.clear()
+
+    def report(self,qs=PERCENTILES):
+        """
+        Returns: a table of the percentiles of every section, in milliseconds
+
+        The table has one line per section, and is meant for the console or an
+        on-screen overlay.
+
+        :param qs: the percentiles to report
+        :type qs:  ``tuple`` of ``int`` or ``float`` in 0..100
+        """
+        width = max([len(name) for name in self._timings]+[7])
+        lines = ['%-*s %s' % (width,'section',' '.join('%7s' % ('p%g' % q) for q in qs))]
+        for name in self._timings:
+            values = self._timings[name].percentiles(qs)
+            lines.append('%-*s %s' % (width,name,' '.join('%7.2f' % (1000*v) for v in values)))
+        return '\n'.join(lines)
@@ -3,12 +3,23 @@ Sound classes for 2D game support.
 
 This classes wrap the Kivy audio interface, making it simpler for students to use.
 
+A :class:`SoundLibrary` stores each of its sounds as a :class:`SoundPool`, several 
+voices of the same file, so that a sound effect can overlap with itself.  The library
+can also load every file in the **Sounds** folder in a background thread, so that no
+sound is ever loaded from disk while the game is running.  A library made with a
+:class:`Mixer` stores each sound as a :class:`MixerSound` instead, played through the
+software mixer rather than a Kivy player.
+
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.core.audio import SoundLoader
+import os
+import threading
 from .app import GameApp
 
+# The number of voices of each sound in a SoundLibrary, by default
+VOICES = 4
+
 
 class Sound(object):
     """
@@ -76,6 +87,7 @@ class Sound(object):
         :type source:  ``str``
         """
         from .app import GameApp
+        from kivy.core.audio import SoundLoader
         assert GameApp.is_sound(source), 'source %s is not a sound file' % repr(source)
         self._source = source
         self._sound  = SoundLoader.load(source)
@@ -103,6 +115,167 @@ class Sound(object):
         self._sound.stop()
 
 
+# #mark -
+class SoundPool(object):
+    """
+    A class representing several voices of the same sound file.
+    
+    A pool has the same attributes and methods as a :class:`Sound`, but each call to 
+    :meth:`play` starts a voice that is not playing.  So the sound can overlap with 
+    itself up to ``voices`` times.  If every voice is playing, the voice that started 
+    first is stopped and restarted (voice stealing).
+    
+    The voices are loaded by :meth:`load`, which may be called from another thread.
+    Until the pool is loaded, :meth:`play` does nothing, so playing a sound never loads 
+    a file on the calling thread.
+    """
+    
+    # MUTABLE PROPERTIES
+    @property
+    def volume(self):
+        """
+        The volume of every voice.
+        
+        1 means full volume, 0 means mute.  The default value is 1.
+        
+        **Invariant**: Must float in the range 0..1.
+        """
+        return self._volume
+    
+    @volume.setter
+    def volume(self,value):
+        assert type(value) in [int, float] and value >= 0 and value <= 1, \
+            'value %s is not a valid volume' % repr(value)
+        self._volume = value
+        for voice in self._sounds:
+            voice.volume = value
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def source(self):
+        """
+        The source file for this sound. 
+        
+        **Immutable**: This value cannot be changed after the pool is created.
+        
+        **Invariant**: Must be a nonempty string.
+        """ 
+        return self._source
+    
+    @property
+    def voices(self):
+        """
+        The maximum number of voices playing at once.
+        
+        **Immutable**: This value cannot be changed after the pool is created.
+        
+        **Invariant**: Must be an int > 0.
+        """ 
+        return self._voices
+    
+    @property
+    def loaded(self):
+        """
+        Whether or not every voice has been loaded.
+        
+        **Immutable**: This value cannot be changed.  Use the method :meth:`load` to 
+        load the voices.
+        
+        **Invariant**: Must be a boolean.
+        """ 
+        return self._loaded
+    
+    @property
+    def playing(self):
+        """
+        Whether or not any voice is currently playing.
+        
+        **Immutable**: This value cannot be changed.  You should use the :meth:`play` 
+        and :meth:`stop` methods to alter its value.
+        
+        **Invariant**: Must be a boolean.
+        """ 
+        return any(voice.playing for voice in self._sounds)
+    
+    def __init__(self,source,voices=VOICES,load=True):
+        """
+        Creates a new pool of voices for a sound file.
+        
+        If ``load`` is False, the voices are not loaded until a call to :meth:`load`.
+        
+        :param source: The string providing the name of a sound file
+        :type source:  ``str``
+        
+        :param voices: The maximum number of voices playing at once
+        :type voices:  ``int`` > 0
+        
+        :param load: Whether to load the voices now
+        :type load:  ``bool``
+        """
+        assert GameApp.is_sound(source), 'source %s is not a sound file' % repr(source)
+        assert type(voices) == int and voices > 0, 'voices %s is not a valid int' % repr(voices)
+        self._source = source
+        self._voices = voices
+        self._volume = 1
+        self._sounds = ()
+        self._started = [0]*voices
+        self._plays = 0
+        self._loaded = False
+        if load:
+            self.load()
+    
+    def load(self):
+        """
+        Loads every voice of this pool.
+        
+        This method reads the sound file, so it is safe to call from a background 
+        thread.  The voices are only visible to :meth:`play` once all are loaded.
+        """
+        if self._loaded:
+            return
+        sounds = tuple(Sound(self._source) for _ in range(self._voices))
+        for voice in sounds:
+            voice.volume = self._volume
+        self._sounds = sounds
+        self._loaded = True
+    
+    def play(self,loop=False):
+        """
+        Plays this sound with a free voice, stealing the oldest voice if none are free.
+        
+        If the pool is not loaded yet, this does nothing and returns None.
+        
+        :param loop: Whether or not to loop the sound
+        :type loop:  ``bool``
+        
+        :return: The voice playing the sound, or None if the pool is not loaded
+        :rtype:  :class:`Sound` or None
+        """
+        sounds = self._sounds
+        if not sounds:
+            return None
+        
+        choice = None
+        for pos in range(len(sounds)):
+            if not sounds[pos].playing and (choice is None or self._started[pos] < self._started[choice]):
+                choice = pos
+        if choice is None:
+            choice = self._started.index(min(self._started))
+            sounds[choice].stop()
+        
+        self._plays += 1
+        self._started[choice] = self._plays
+        sounds[choice].play(loop)
+        return sounds[choice]
+    
+    def stop(self):
+        """
+        Stops every voice of this sound.
+        """
+        for voice in self._sounds:
+            voice.stop()
+
+
 # #mark -
 class SoundLibrary(object):
     """
@@ -118,13 +291,59 @@ class SoundLibrary(object):
     To play the sound, we access it as follows::
         
         soundlib['soundname'].play()
+    
+    Each sound is a :class:`SoundPool` with ``voices`` voices, so a sound may be 
+    played again before it finishes.  To load every file in the **Sounds** folder 
+    without blocking the game, call :meth:`preload` at startup.  The files are then 
+    loaded in a background thread, and mapped to their file names as keys.
+    
+    If the library is made with a :class:`Mixer`, each sound is a :class:`MixerSound`
+    of that mixer instead, and ``voices`` is ignored.
     """
     
-    def __init__(self):
+    # IMMUTABLE PROPERTIES
+    @property
+    def voices(self):
+        """
+        The number of voices of each sound in this library.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._voices
+    
+    @property
+    def loading(self):
+        """
+        Whether or not a background thread is still loading sounds.
+        
+        **Invariant**: Must be a boolean.
+        """
+        return not self._thread is None and self._thread.is_alive()
+    
+    @property
+    def mixer(self):
+        """
+        The software mixer playing the sounds, or None if they use Kivy players.
+        
+        **Invariant**: Must be a :class:`Mixer` or None.
+        """
+        return self._mixer
+    
+    def __init__(self,voices=VOICES,mixer=None):
         """
         Creates a new, empty sound library.
+        
+        :param voices: The number of voices of each sound
+        :type voices:  ``int`` > 0
+        
+        :param mixer: The software mixer to play the sounds, or None for Kivy players
+        :type mixer:  :class:`Mixer` or None
         """
+        assert type(voices) == int and voices > 0, 'voices %s is not a valid int' % repr(voices)
         self._data = {}
+        self._voices = voices
+        self._mixer = mixer
+        self._thread = None
     
     def __len__(self):
         """
@@ -155,7 +374,7 @@ class SoundLibrary(object):
         :param filename: The name of the file containing the sound source
         :type filename:  ``str``
         """
-        self._data[key] = Sound(filename)
+        self._data[key] = self._make(filename,True)
     
     def __delitem__(self, key):
         """
@@ -179,3 +398,60 @@ class SoundLibrary(object):
         :rtype:  ``iterable``
         """
         return self._data.keys()
+    
+    def preload(self):
+        """
+        Loads every file in the **Sounds** folder in a background thread.
+        
+        Each file is mapped to its file name (e.g. 'pew1.wav') as the key.  The keys
+        are added at once, but each sound does nothing when played until its pool is
+        loaded.  Use :meth:`wait` to block until every sound is loaded.
+        
+        :return: The thread loading the sounds
+        :rtype:  ``threading.Thread``
+        """
+        pools = []
+        for name in sorted(os.listdir(GameApp.sounds)):
+            if GameApp.is_sound(name) and not name in self._data:
+                self._data[name] = self._make(name,False)
+                pools.append(self._data[name])
+        
+        def load():
+            for pool in pools:
+                try:
+                    pool.load()
+                except IOError:
+                    pass
+        
+        self._thread = threading.Thread(target=load,name='SoundLibrary.preload',daemon=True)
+        self._thread.start()
+        return self._thread
+    
+    def wait(self,timeout=None):
+        """
+        Blocks until the background thread has loaded every sound.
+        
+        :param timeout: The maximum number of seconds to wait, or None for no limit
+        :type timeout:  ``int``, ``float`` or None
+        
+        :return: True if every sound is loaded, False if the wait timed out
+        :rtype:  ``bool``
+        """
+        if not self._thread is None:
+            self._thread.join(timeout)
+        return not self.loading
+    
+    def _make(self,filename,load):
+        """
+        Returns: a new sound for filename, using the mixer if there is one
+        
+        :param filename: The name of the file containing the sound source
+        :type filename:  ``str``
+        
+        :param load: Whether to load the sound now
+        :type load:  ``bool``
+        """
+        if self._mixer is None:
+            return SoundPool(filename,self._voices,load)
+        from .mixer import MixerSound
+        return MixerSound(filename,self._mixer,load)
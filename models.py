@@ -26,7 +26,9 @@ Cole Breen (ctb93) Luke Kulm (lbk73)
 December 9, 2021
 """
 from consts import *
-from game2d import *
+from game2d import GRectangle, GImage, GSprite, GImageBatch
+import numpy as np
+import math
 
 # PRIMARY RULE: Models are not allowed to access anything in any module other
 # than consts.py.  If you need extra information from Gameplay, then it should
@@ -59,6 +61,8 @@ class Ship(GSprite):
     """
     #  IF YOU ADD ATTRIBUTES, LIST THEM BELOW
     #DEFENSE LINE ATTRIBUTE HERE                                                         ------------------------------
+    # Attribute _death: the number of seconds of the explosion animation
+    # Invariant: _death is an int or float > 0
 
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
     def setX(self,movement):
@@ -83,7 +87,7 @@ class Ship(GSprite):
         return self.y
 
     # INITIALIZER TO CREATE A NEW SHIP
-    def __init__(self,left_edge):
+    def __init__(self,left_edge,config=None):
         """
         Initializes a Ship (a subclass of GSprite) with the given paremeter.
 
@@ -93,11 +97,19 @@ class Ship(GSprite):
         to be SHIP_WIDTH. The height of the ship is defined to be SHIP_HEIGHT.
         The image source is set to be ship-strip.png' with a format of (2,4).
 
+        The length of the explosion is the death speed of config.
+
         Paremeter left_edge: The left edge of the ship.
         Precondition: left_edge is of type int or float.
+
+        Parameter config: The settings of the game
+        Precondition: config is a GameConfig object, or None for the defaults
         """
         super().__init__(bottom=SHIP_BOTTOM, left=left_edge, width=SHIP_WIDTH,\
         height=SHIP_HEIGHT, source='ship-strip.png', format=(2,4))
+        if config is None:
+            config = GameConfig()
+        self._death = config.getDeathSpeed()
     # METHODS TO MOVE THE SHIP AND CHECK FOR COLLISIONS
 
     #PLEASE NOTE, we used setX to move the ship...
@@ -112,14 +124,9 @@ class Ship(GSprite):
         Precondition: bolt is of class Bolt
         """
         if not bolt.isPlayerBolt():
-            if self.contains((bolt.x+bolt.width,bolt.y+bolt.height)): #top right
-                return True
-            elif self.contains((bolt.x-bolt.width,bolt.y+bolt.height)): #top left
-                return True
-            elif self.contains((bolt.x+bolt.width,bolt.y-bolt.height)): #bottom right
-                return True
-            elif self.contains((bolt.x-bolt.width,bolt.y-bolt.height)): #bottom left
-                return True
+            # Same as testing the four corners (x +/- width, y +/- height)
+            return self.overlaps(bolt.x-bolt.width,bolt.y-bolt.height,
+                bolt.x+bolt.width,bolt.y+bolt.height)
         return False
 
     # COROUTINE METHOD TO ANIMATE THE SHIP
@@ -132,7 +139,7 @@ class Ship(GSprite):
         anything back to the parent). Using dt, it calculates the total time
         elapsed (time_elapsed) since initial method call. Using time_elapsed,
         it determines the sprite sheet image that should be displayed using
-        DEATH_SPEED and the total number of explosion images. It does this by
+        the death speed _death and the total number of explosion images. It does this by
         modifying the inherited attribute frame. The variable animating controls
         the operation of this method.
         """
@@ -142,11 +149,11 @@ class Ship(GSprite):
         while animating:
             dt = (yield)
             time_elapsed += dt
-            x = (time_elapsed/DEATH_SPEED)*7
+            x = (time_elapsed/self._death)*7
             y = int(x)
             self.frame = y
 
-            if time_elapsed > DEATH_SPEED:
+            if time_elapsed > self._death:
                 animating = False
 
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
@@ -239,14 +246,9 @@ class Alien(GImage):
         Precondition: bolt is of class Bolt
         """
         if bolt.isPlayerBolt():
-            if self.contains((bolt.x+bolt.width,bolt.y+bolt.height)): #top right
-                return True
-            elif self.contains((bolt.x-bolt.width,bolt.y+bolt.height)): #top left
-                return True
-            elif self.contains((bolt.x+bolt.width,bolt.y-bolt.height)): #bottom right
-                return True
-            elif self.contains((bolt.x-bolt.width,bolt.y-bolt.height)): #bottom left
-                return True
+            # Same as testing the four corners (x +/- width, y +/- height)
+            return self.overlaps(bolt.x-bolt.width,bolt.y-bolt.height,
+                bolt.x+bolt.width,bolt.y+bolt.height)
         return False
 
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
@@ -306,6 +308,26 @@ class Bolt(GRectangle):
         self._velocity = velocity
 
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
+    def reset(self, xcord, ycord, velocity):
+        """
+        Moves this bolt to (xcord, ycord) and gives it a new velocity.
+
+        This lets a BoltManager draw many bolts over time with the same Bolt
+        object, without building a new GRectangle.
+
+        Paremeter xcord: The x coordinate of the bolt.
+        Precondition: xcord is of type int or float.
+
+        Paremeter ycord: The y coordinate of the bolt.
+        Precondition: ycord is of type int or float.
+
+        Paremeter velocity: The velocity of the bolt.
+        Precondition: velocity is of type int or float
+        """
+        self.x = xcord
+        self.y = ycord
+        self._velocity = velocity
+
     def bolt_move(self):
         """
         Modifies the attribute y by _velocity.
@@ -335,3 +357,669 @@ class Bolt(GRectangle):
         return False
 
 # IF YOU NEED ADDITIONAL MODEL CLASSES, THEY GO HERE
+
+
+class BoltManager(object):
+    """
+    A class to store every laser bolt of a wave in NumPy arrays.
+
+    The bolts are not Bolt objects. Instead, their positions, velocities and
+    firing order are columns of parallel arrays (a struct of arrays), and
+    only the first getCount() entries are in use. Moving every bolt, culling
+    the ones that left the window and finding the bolts of one owner are
+    each a single vectorized operation. A bolt fired by the player has a
+    positive velocity, and an alien bolt has a negative one.
+
+    Removing a bolt moves the last bolt into its slot (swap-remove), so the
+    slots are not in firing order. Each bolt has a sequence number instead,
+    and ties between bolts (such as two bolts hitting the ship in the same
+    frame) go to the one fired last, as if the bolts were in a list.
+
+    Bolt objects are only used to draw. The manager keeps one for each slot
+    that has been used, and moves them to the array positions in draw().
+    The arrays start with room for BOLT_POOL bolts and double when full.
+
+    The manager also remembers where each bolt was at the last call to
+    snapshot(), so that draw() can show the bolts part of the way between
+    two updates.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _xs: the horizontal coordinate of each bolt center
+    # Invariant: _xs is a 1d NumPy array of floats, at least _count long
+    #
+    # Attribute _ys: the vertical coordinate of each bolt center
+    # Invariant: _ys is a 1d NumPy array of floats, as long as _xs
+    #
+    # Attribute _vs: the velocity of each bolt in the y direction
+    # Invariant: _vs is a 1d NumPy array of floats, as long as _xs
+    #
+    # Attribute _py: the y value of each bolt at the last snapshot (or when
+    # it was fired, if later)
+    # Invariant: _py is a 1d NumPy array of floats, as long as _xs
+    #
+    # Attribute _seq: the sequence number of each bolt, in firing order
+    # Invariant: _seq is a 1d NumPy array of ints, as long as _xs
+    #
+    # Attribute _count: the number of bolts on screen
+    # Invariant: _count is an int in 0..len(_xs)
+    #
+    # Attribute _next: the sequence number of the next bolt fired
+    # Invariant: _next is an int greater than every number in _seq
+    #
+    # Attribute _sprites: the Bolt objects used to draw the bolts
+    # Invariant: _sprites is a list of Bolt objects, possibly empty
+
+    # GETTERS AND SETTERS
+    def getCount(self):
+        """
+        Returns the number of bolts on screen.
+        """
+        return self._count
+
+    def getX(self, index):
+        """
+        Returns the horizontal coordinate of the bolt in slot index.
+
+        Parameter index: The slot of the bolt
+        Precondition: index is an int in 0..getCount()-1
+        """
+        return float(self._xs[index])
+
+    def getY(self, index):
+        """
+        Returns the vertical coordinate of the bolt in slot index.
+
+        Parameter index: The slot of the bolt
+        Precondition: index is an int in 0..getCount()-1
+        """
+        return float(self._ys[index])
+
+    def getVelocity(self, index):
+        """
+        Returns the velocity of the bolt in slot index.
+
+        Parameter index: The slot of the bolt
+        Precondition: index is an int in 0..getCount()-1
+        """
+        return float(self._vs[index])
+
+    def getArrays(self):
+        """
+        Returns the tuple (xs, ys, vs) of the bolts on screen.
+
+        Each entry is a NumPy array with one value per slot in use: the
+        horizontal coordinate, the vertical coordinate and the velocity of
+        the bolt. These are views of the arrays of the manager, so they must
+        not be modified, and are only valid until the bolts next change.
+        """
+        n = self._count
+        return (self._xs[:n], self._ys[:n], self._vs[:n])
+
+    def hasPlayerBolt(self):
+        """
+        Returns True if a player bolt is on screen, False otherwise.
+        """
+        return bool((self._vs[:self._count] > 0).any())
+
+    def playerBolts(self):
+        """
+        Returns the slots of the player bolts, in the order they were fired.
+        """
+        slots = np.nonzero(self._vs[:self._count] > 0)[0]
+        return slots[np.argsort(self._seq[slots])].tolist()
+
+    # INITIALIZER
+    def __init__(self, size=BOLT_POOL):
+        """
+        Initializes a manager with room for size bolts, none of them on screen.
+
+        Parameter size: The number of bolts to make room for up front
+        Precondition: size is an int > 0
+        """
+        self._xs = np.zeros(size)
+        self._ys = np.zeros(size)
+        self._vs = np.zeros(size)
+        self._py = np.zeros(size)
+        self._seq = np.zeros(size, dtype=np.int64)
+        self._count = 0
+        self._next = 0
+        self._sprites = []
+
+    # METHODS TO FIRE AND REMOVE BOLTS
+    def fire(self, xcord, ycord, velocity):
+        """
+        Puts a new bolt on screen at (xcord, ycord).
+
+        Paremeter xcord: The x coordinate of the bolt.
+        Precondition: xcord is of type int or float.
+
+        Paremeter ycord: The y coordinate of the bolt.
+        Precondition: ycord is of type int or float.
+
+        Paremeter velocity: The velocity of the bolt.
+        Precondition: velocity is of type int or float
+        """
+        if self._count == len(self._xs):
+            self._xs = np.concatenate((self._xs, np.zeros_like(self._xs)))
+            self._ys = np.concatenate((self._ys, np.zeros_like(self._ys)))
+            self._vs = np.concatenate((self._vs, np.zeros_like(self._vs)))
+            self._py = np.concatenate((self._py, np.zeros_like(self._py)))
+            self._seq = np.concatenate((self._seq, np.zeros_like(self._seq)))
+        n = self._count
+        self._xs[n] = xcord
+        self._ys[n] = ycord
+        self._vs[n] = velocity
+        self._py[n] = ycord
+        self._seq[n] = self._next
+        self._next += 1
+        self._count += 1
+
+    def release(self, index):
+        """
+        Takes the bolt in slot index off screen.
+
+        The last bolt is moved into its slot, so this takes constant time.
+
+        Parameter index: The slot of the bolt
+        Precondition: index is an int in 0..getCount()-1
+        """
+        last = self._count-1
+        self._xs[index] = self._xs[last]
+        self._ys[index] = self._ys[last]
+        self._vs[index] = self._vs[last]
+        self._py[index] = self._py[last]
+        self._seq[index] = self._seq[last]
+        self._count = last
+
+    def clear(self):
+        """
+        Takes every bolt off screen.
+        """
+        self._count = 0
+
+    def move(self):
+        """
+        Moves every bolt on screen, and removes the ones that left the window.
+
+        A player bolt leaves once its bottom is above GAME_HEIGHT, and an alien
+        bolt once its bottom is below 0, as in Bolt's bolt_remove() method.
+        """
+        n = self._count
+        ys = self._ys[:n]
+        ys += self._vs[:n]
+        bottom = ys-BOLT_HEIGHT/2.0
+        vs = self._vs[:n]
+        gone = ((vs > 0) & (bottom > GAME_HEIGHT)) | ((vs < 0) & (bottom < 0))
+        if gone.any():
+            keep = ~gone
+            left = int(keep.sum())
+            for array in (self._xs, self._ys, self._vs, self._py, self._seq):
+                array[:left] = array[:n][keep]
+            self._count = left
+
+    def lastHit(self, left, bottom, right, top, player):
+        """
+        Returns the slot of the last bolt fired that overlaps a rectangle.
+
+        Only bolts of one owner are tested. As in Ship's collides() method, a
+        bolt is treated as the rectangle reaching BOLT_WIDTH and BOLT_HEIGHT
+        from its center, and the rectangles must overlap with area. The
+        method returns -1 if no bolt overlaps the rectangle.
+
+        Parameter left: The left edge of the rectangle
+        Precondition: left is an int or float
+
+        Parameter bottom: The bottom edge of the rectangle
+        Precondition: bottom is an int or float
+
+        Parameter right: The right edge of the rectangle
+        Precondition: right is an int or float
+
+        Parameter top: The top edge of the rectangle
+        Precondition: top is an int or float
+
+        Parameter player: Whether to test the player bolts (or alien bolts)
+        Precondition: player is a bool
+        """
+        n = self._count
+        xs = self._xs[:n]
+        ys = self._ys[:n]
+        owned = self._vs[:n] > 0 if player else self._vs[:n] < 0
+        hit = owned & (xs-BOLT_WIDTH < right) & (left < xs+BOLT_WIDTH) \
+            & (ys-BOLT_HEIGHT < top) & (bottom < ys+BOLT_HEIGHT)
+        slots = np.nonzero(hit)[0]
+        if len(slots) == 0:
+            return -1
+        return int(slots[np.argmax(self._seq[slots])])
+
+    # METHOD TO DRAW THE BOLTS
+    def snapshot(self):
+        """
+        Remembers where every bolt on screen is, for draw() to start from.
+        """
+        n = self._count
+        self._py[:n] = self._ys[:n]
+
+    def draw(self, view, alpha=1.0):
+        """
+        Draws every bolt on screen to the view.
+
+        Each bolt is drawn alpha of the way from where it was at the last
+        snapshot to where it is now. Bolt objects are created the first time
+        a slot is used, and reused (with Bolt's reset() method) from then on.
+
+        Parameter view: The view to draw the bolts to.
+        Precondition: view is an instance of GView
+
+        Parameter alpha: How far to draw the bolts past the last snapshot
+        Precondition: alpha is a float in 0..1
+        """
+        n = self._count
+        while len(self._sprites) < n:
+            self._sprites.append(Bolt(0,0,0))
+        xs = self._xs[:n].tolist()
+        ys = self._ys[:n]
+        if alpha < 1:
+            py = self._py[:n]
+            ys = py+(ys-py)*alpha
+        ys = ys.tolist()
+        vs = self._vs[:n].tolist()
+        for index in range(n):
+            sprite = self._sprites[index]
+            sprite.reset(xs[index],ys[index],vs[index])
+            sprite.draw(view)
+
+
+class Formation(object):
+    """
+    A class to represent the whole wave of aliens as a single object.
+
+    The aliens in a wave always march together, so it is wasteful to move
+    them one GImage at a time. Instead, this class stores the position of
+    every alien in a pair of NumPy arrays (one for x, one for y) together
+    with an array of alive flags. A march step is then a single vectorized
+    offset of the whole grid.
+
+    The aliens are drawn as a single GImageBatch (one mesh for the whole
+    wave), which is only brought up to date with the arrays when the
+    formation is drawn. Row 0 is the top row of the wave and column 0 is the
+    leftmost column.
+
+    The formation remembers where it was at the last call to snapshot(), so
+    that draw() can show it part of the way through a march step.
+
+    The formation also maintains an index of which columns are occupied. It
+    is updated whenever an alien is killed, so finding the edge columns, or
+    the lowest alien in a column, never requires a scan of the grid.
+
+    The size of the grid comes from the GameConfig of the formation. In the
+    specifications below, ALIEN_ROWS and ALIENS_IN_ROW stand for the
+    settings of that GameConfig.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _xs: the horizontal coordinate of every alien center
+    # Invariant: _xs is a (ALIEN_ROWS, ALIENS_IN_ROW) NumPy array of floats
+    #
+    # Attribute _ys: the vertical coordinate of every alien center
+    # Invariant: _ys is a (ALIEN_ROWS, ALIENS_IN_ROW) NumPy array of floats
+    #
+    # Attribute _alive: whether the alien in each cell is still alive
+    # Invariant: _alive is a (ALIEN_ROWS, ALIENS_IN_ROW) NumPy array of bools
+    #
+    # Attribute _batch: the batch used to draw every cell, in row-major order
+    # Invariant: _batch is a GImageBatch with ALIEN_ROWS*ALIENS_IN_ROW slots
+    #
+    # Attribute _dirty: whether the arrays have changed since the last draw
+    # Invariant: _dirty is a bool
+    #
+    # Attribute _x0, _y0: the position of the top left alien at the last
+    # snapshot
+    # Invariant: _x0 and _y0 are floats
+    #
+    # Attribute _count: the number of aliens still alive
+    # Invariant: _count is an int >= 0
+    #
+    # Attribute _counts: the number of aliens still alive in each column
+    # Invariant: _counts is a list of ALIENS_IN_ROW ints >= 0
+    #
+    # Attribute _lowest: the row of the lowest alive alien in each column
+    # Invariant: _lowest is a list of ALIENS_IN_ROW ints, -1 for empty columns
+    #
+    # Attribute _columns: the indices of the nonempty columns, in order
+    # Invariant: _columns is a tuple of ints in 0..ALIENS_IN_ROW-1
+
+    # GETTERS AND SETTERS
+    def getX(self, row, col):
+        """
+        Returns the x value of the alien at (row, col).
+
+        Parameter row: The row of the alien
+        Precondition: row is an int in 0..ALIEN_ROWS-1
+
+        Parameter col: The column of the alien
+        Precondition: col is an int in 0..ALIENS_IN_ROW-1
+        """
+        return float(self._xs[row, col])
+
+    def getY(self, row, col):
+        """
+        Returns the y value of the alien at (row, col).
+
+        Parameter row: The row of the alien
+        Precondition: row is an int in 0..ALIEN_ROWS-1
+
+        Parameter col: The column of the alien
+        Precondition: col is an int in 0..ALIENS_IN_ROW-1
+        """
+        return float(self._ys[row, col])
+
+    def isAlive(self, row, col):
+        """
+        Returns True if the alien at (row, col) is alive, False otherwise.
+
+        Parameter row: The row of the alien
+        Precondition: row is an int in 0..ALIEN_ROWS-1
+
+        Parameter col: The column of the alien
+        Precondition: col is an int in 0..ALIENS_IN_ROW-1
+        """
+        return bool(self._alive[row, col])
+
+    def getCount(self):
+        """
+        Returns the number of aliens still alive.
+        """
+        return self._count
+
+    def getAlive(self):
+        """
+        Returns the (ALIEN_ROWS, ALIENS_IN_ROW) array of alive flags.
+
+        This is the array of the formation itself, so it must not be
+        modified.
+        """
+        return self._alive
+
+    # INITIALIZER TO CREATE THE WAVE OF ALIENS
+    def __init__(self, config=None):
+        """
+        Initializes a formation of ALIEN_ROWS by ALIENS_IN_ROW aliens.
+
+        The number of rows and the number of aliens per row are the settings
+        of config.
+
+        The aliens are ALIEN_H_SEP and ALIEN_V_SEP apart from each other. The
+        left edge of the wave is ALIEN_H_SEP from the left edge of the window,
+        and the top edge of the wave is ALIEN_CEILING from the top of the
+        window. The image of each row is taken from ALIEN_IMAGES, cycling
+        every two rows from the bottom of the wave up.
+
+        Parameter config: The settings of the game
+        Precondition: config is a GameConfig object, or None for the defaults
+        """
+        if config is None:
+            config = GameConfig()
+        rows = config.getAlienRows()
+        cols = config.getAliensInRow()
+        self._xs = np.empty((rows, cols))
+        self._ys = np.empty((rows, cols))
+        self._alive = np.ones((rows, cols), dtype=bool)
+        images = []
+        for x in range(rows):
+            left_edge = ALIEN_H_SEP
+            top_edge = GAME_HEIGHT-ALIEN_CEILING-x*(ALIEN_V_SEP+ALIEN_HEIGHT)
+            for y in range(cols):
+                self._xs[x, y] = left_edge + ALIEN_WIDTH/2
+                self._ys[x, y] = top_edge - ALIEN_HEIGHT/2
+                images.append(((rows-x-1)%6)//2)
+                left_edge = left_edge + ALIEN_WIDTH + ALIEN_H_SEP
+        self._batch = GImageBatch(ALIEN_IMAGES, rows*cols,
+            ALIEN_WIDTH, ALIEN_HEIGHT)
+        self._batch.choose(images)
+        self._dirty = True
+        self.snapshot()
+        self._count = rows*cols
+        self._counts = [rows]*cols
+        self._lowest = [rows-1]*cols
+        self._columns = tuple(range(cols))
+
+    # METHODS TO MOVE AND KILL ALIENS
+    def shift(self, dx, dy):
+        """
+        Moves every alien in the formation by (dx, dy).
+
+        Dead aliens are moved too, which keeps the grid rectangular and means
+        the step is a single array operation.
+
+        Parameter dx: The horizontal offset
+        Precondition: dx is of type int or float
+
+        Parameter dy: The vertical offset
+        Precondition: dy is of type int or float
+        """
+        if dx != 0:
+            self._xs += dx
+        if dy != 0:
+            self._ys += dy
+        self._dirty = True
+
+    def kill(self, row, col):
+        """
+        Marks the alien at (row, col) as dead.
+
+        This also updates the column index. If the alien was the lowest in
+        its column, the lowest row moves up to the next alive alien; if the
+        column is now empty, it is dropped from the nonempty columns. Killing
+        an alien that is already dead does nothing.
+
+        Parameter row: The row of the alien
+        Precondition: row is an int in 0..ALIEN_ROWS-1
+
+        Parameter col: The column of the alien
+        Precondition: col is an int in 0..ALIENS_IN_ROW-1
+        """
+        if not self._alive[row, col]:
+            return None
+        self._alive[row, col] = False
+        self._dirty = True
+        self._count -= 1
+        self._counts[col] -= 1
+        if self._counts[col] == 0:
+            self._lowest[col] = -1
+            self._columns = tuple(x for x in self._columns if x != col)
+        elif self._lowest[col] == row:
+            lowest = row-1
+            while not self._alive[lowest, col]:
+                lowest -= 1
+            self._lowest[col] = lowest
+
+    def columns(self):
+        """
+        Returns a tuple of indices representing columns that are nonempty.
+
+        The tuple is maintained by kill(), so this method does no work.
+        """
+        return self._columns
+
+    def leftColumn(self):
+        """
+        Returns the index of the leftmost nonempty column.
+
+        Precondition: at least one alien is alive
+        """
+        return self._columns[0]
+
+    def rightColumn(self):
+        """
+        Returns the index of the rightmost nonempty column.
+
+        Precondition: at least one alien is alive
+        """
+        return self._columns[-1]
+
+    def lowest(self, col):
+        """
+        Returns the row of the lowest alive alien in column col.
+
+        This value is maintained by kill(), so this method does no work.
+
+        Parameter col: The column to search
+        Precondition: col is an int in 0..ALIENS_IN_ROW-1 with an alien alive
+        """
+        return self._lowest[col]
+
+    def below(self, line):
+        """
+        Returns True if the bottom of any alive alien is below line.
+
+        Parameter line: The vertical coordinate to test against
+        Precondition: line is of type int or float
+        """
+        return bool(np.any(self._alive & (self._ys-ALIEN_HEIGHT/2 < line)))
+
+    # METHOD TO CHECK FOR COLLISION
+    def collides(self, row, col, bolt):
+        """
+        Returns True if the player bolt collides with the alien at (row, col).
+
+        This is the same test as Alien's collides() method, but it is done
+        against the position arrays, so the Alien object does not need to be
+        up to date. It returns False if the alien is dead or the bolt was not
+        fired by the player.
+
+        Parameter row: The row of the alien
+        Precondition: row is an int in 0..ALIEN_ROWS-1
+
+        Parameter col: The column of the alien
+        Precondition: col is an int in 0..ALIENS_IN_ROW-1
+
+        Parameter bolt: The laser bolt to check
+        Precondition: bolt is of class Bolt
+        """
+        if not bolt.isPlayerBolt():
+            return False
+        return self._overlaps(row, col, bolt.x, bolt.y, bolt.width, bolt.height)
+
+    def hits(self, bolt):
+        """
+        Returns a list of (row, col) tuples for the aliens the bolt collides with.
+
+        This is a grid broadphase. The aliens always form a regular grid, with
+        ALIEN_WIDTH+ALIEN_H_SEP between columns and ALIEN_HEIGHT+ALIEN_V_SEP
+        between rows, so the bolt position maps straight to the handful of
+        cells it can overlap. Only those cells are tested with collides().
+        It returns an empty list if the bolt was not fired by the player.
+
+        Parameter bolt: The laser bolt to check
+        Precondition: bolt is of class Bolt
+        """
+        if not bolt.isPlayerBolt():
+            return []
+        return self.hitsAt(bolt.x, bolt.y, bolt.width, bolt.height)
+
+    def hitsAt(self, x, y, width=BOLT_WIDTH, height=BOLT_HEIGHT):
+        """
+        Returns a list of (row, col) tuples for the aliens a player bolt at
+        (x, y) collides with.
+
+        This is the same test as hits(), for a bolt given only by its position
+        and size (such as a bolt in a BoltManager).
+
+        Parameter x: The horizontal coordinate of the bolt center
+        Precondition: x is an int or float
+
+        Parameter y: The vertical coordinate of the bolt center
+        Precondition: y is an int or float
+
+        Parameter width: The width of the bolt
+        Precondition: width is an int or float > 0
+
+        Parameter height: The height of the bolt
+        Precondition: height is an int or float > 0
+        """
+        cwidth = ALIEN_WIDTH+ALIEN_H_SEP
+        cheight = ALIEN_HEIGHT+ALIEN_V_SEP
+        xreach = width+ALIEN_WIDTH/2.0
+        yreach = height+ALIEN_HEIGHT/2.0
+        x0 = self._xs[0, 0]
+        y0 = self._ys[0, 0]
+        cmin = max(int(math.floor((x-xreach-x0)/cwidth)), 0)
+        rows, cols = self._alive.shape
+        cmax = min(int(math.floor((x+xreach-x0)/cwidth)), cols-1)
+        rmin = max(int(math.floor((y0-y-yreach)/cheight)), 0)
+        rmax = min(int(math.floor((y0-y+yreach)/cheight)), rows-1)
+        result = []
+        for row in range(rmin, rmax+1):
+            for col in range(cmin, cmax+1):
+                if self._overlaps(row, col, x, y, width, height):
+                    result.append((row, col))
+        return result
+
+    def _overlaps(self, row, col, x, y, width, height):
+        """
+        Returns True if a bolt at (x, y) touches the alive alien at (row, col).
+
+        This is Alien's four corner test: a corner (x +/- width, y +/- height)
+        of the bolt must be inside the alien.
+
+        Parameter row: The row of the alien
+        Precondition: row is an int in 0..ALIEN_ROWS-1
+
+        Parameter col: The column of the alien
+        Precondition: col is an int in 0..ALIENS_IN_ROW-1
+
+        Parameter x: The horizontal coordinate of the bolt center
+        Precondition: x is an int or float
+
+        Parameter y: The vertical coordinate of the bolt center
+        Precondition: y is an int or float
+
+        Parameter width: The width of the bolt
+        Precondition: width is an int or float > 0
+
+        Parameter height: The height of the bolt
+        Precondition: height is an int or float > 0
+        """
+        if not self._alive[row, col]:
+            return False
+        ax = self._xs[row, col]
+        ay = self._ys[row, col]
+        inx = abs(x+width-ax) < ALIEN_WIDTH/2.0 \
+        or abs(x-width-ax) < ALIEN_WIDTH/2.0
+        iny = abs(y+height-ay) < ALIEN_HEIGHT/2.0 \
+        or abs(y-height-ay) < ALIEN_HEIGHT/2.0
+        return inx and iny
+
+    # METHOD TO DRAW THE FORMATION
+    def snapshot(self):
+        """
+        Remembers where the formation is, for draw() to start from.
+        """
+        self._x0 = float(self._xs[0, 0])
+        self._y0 = float(self._ys[0, 0])
+
+    def draw(self, view, alpha=1.0):
+        """
+        Draws every alive alien to the view.
+
+        The formation is drawn alpha of the way from where it was at the last
+        snapshot to where it is now. If the formation has changed since the
+        last draw, the vertices of the batch are first rewritten from the
+        arrays in one pass. A formation drawn part of the way through a step
+        is rewritten again at the next draw.
+
+        Parameter view: The view to draw the aliens to.
+        Precondition: view is an instance of GView
+
+        Parameter alpha: How far to draw the formation past the last snapshot
+        Precondition: alpha is a float in 0..1
+        """
+        dx = (self._x0-self._xs[0, 0])*(1-alpha)
+        dy = (self._y0-self._ys[0, 0])*(1-alpha)
+        if dx != 0 or dy != 0:
+            self._batch.place(self._xs+dx, self._ys+dy, self._alive)
+            self._dirty = True
+        elif self._dirty:
+            self._batch.place(self._xs, self._ys, self._alive)
+            self._dirty = False
+        self._batch.draw(view)
@@ -0,0 +1,229 @@
+"""
+Replay module for Alien Invaders
+
+This module records games so that they can be played again, frame for
+frame, without recording any video. A wave is completely determined by the
+seed of its random generator and the input it gets every frame, so that is
+all a replay stores.
+
+A replay file is a little-endian binary file. It starts with a header of
+the 4 bytes b'INVR', a 1 byte format version and the 8 byte signed seed of
+the wave. Every call to Wave.update then adds a 9 byte frame: 1 byte of
+flags followed by the 8 byte float dt. The flags are
+
+    bit 0:    the 'left' key is down
+    bit 1:    the 'right' key is down
+    bit 2:    the 'up' key is down
+    bit 3:    setNewShip was called before this frame
+    bits 4-6: the state passed to Wave.update
+
+Cole Breen (ctb93) Luke Kulm (lbk73)
+December 9, 2021
+"""
+from consts import *
+import struct
+
+# The first 4 bytes of every replay file
+REPLAY_MAGIC = b'INVR'
+# The version of the replay format
+REPLAY_VERSION = 1
+# The keys recorded in each frame, in bit order
+REPLAY_KEYS = ('left','right','up')
+
+# Flag for a new ship before a frame
+_NEWSHIP = 8
+# The struct format of the header and a single frame
+_HEADER = struct.Struct('<4sBq')
+_FRAME  = struct.Struct('<Bd')
+
+
+class ReplayRecorder(object):
+    """
+    A class to record the frames of a wave to a replay file.
+
+    To record a wave, pass a recorder to the Wave initializer together with
+    the seed of that wave. The wave then logs every frame to the recorder.
+    Frames are buffered, and written to disk every REPLAY_FLUSH frames and
+    when the recorder is closed.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _file: the file the replay is written to
+    # Invariant: _file is a binary file open for writing, or None once closed
+    #
+    # Attribute _flags: extra flags for the next frame
+    # Invariant: _flags is an int, either 0 or _NEWSHIP
+    #
+    # Attribute _frames: the number of frames recorded so far
+    # Invariant: _frames is an int >= 0
+
+    # Number of frames between writes to disk
+    REPLAY_FLUSH = 60
+
+    def getFrames(self):
+        """
+        Returns the number of frames recorded so far.
+        """
+        return self._frames
+
+    def __init__(self, path, seed):
+        """
+        Initializes a recorder writing to the file path.
+
+        Parameter path: The name of the replay file
+        Precondition: path is a string naming a file that may be written
+
+        Parameter seed: The seed of the wave being recorded
+        Precondition: seed is an int that fits in 64 bits
+        """
+        self._file = open(path,'wb')
+        self._file.write(_HEADER.pack(REPLAY_MAGIC,REPLAY_VERSION,seed))
+        self._flags = 0
+        self._frames = 0
+
+    def record(self, input, state, dt):
+        """
+        Records a single frame.
+
+        Parameter input: user input
+        Precondition: input is an instance of GInput
+
+        Parameter state: The current state of the game
+        Precondition: state is an int in 0..7
+
+        Parameter dt: amount of time since last frame
+        Precondition: dt is a float
+        """
+        flags = self._flags | (state << 4)
+        for bit in range(len(REPLAY_KEYS)):
+            if input.is_key_down(REPLAY_KEYS[bit]):
+                flags |= 1 << bit
+        self._file.write(_FRAME.pack(flags,dt))
+        self._flags = 0
+        self._frames += 1
+        if self._frames % self.REPLAY_FLUSH == 0:
+            self._file.flush()
+
+    def newShip(self):
+        """
+        Records that a new ship is created before the next frame.
+        """
+        self._flags = _NEWSHIP
+
+    def close(self):
+        """
+        Writes any buffered frames and closes the replay file.
+        """
+        if not self._file is None:
+            self._file.close()
+            self._file = None
+
+
+class ReplayInput(object):
+    """
+    A class to play back the keys of a single recorded frame.
+
+    It has the same query methods as GInput, so Wave cannot tell it apart
+    from a keyboard.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _flags: the flags of the current frame
+    # Invariant: _flags is an int in 0..255
+
+    @property
+    def keys(self):
+        """
+        The keys held down in the current frame, as a tuple of strings.
+        """
+        return tuple(key for key in REPLAY_KEYS if self.is_key_down(key))
+
+    @property
+    def key_count(self):
+        """
+        The number of keys held down in the current frame.
+        """
+        return len(self.keys)
+
+    def __init__(self, flags=0):
+        """
+        Initializes the input with the flags of a frame.
+
+        Parameter flags: The flags of the frame
+        Precondition: flags is an int in 0..255
+        """
+        self._flags = flags
+
+    def setFlags(self, flags):
+        """
+        Moves the input to the frame with the given flags.
+
+        Parameter flags: The flags of the frame
+        Precondition: flags is an int in 0..255
+        """
+        self._flags = flags
+
+    def is_key_down(self, key):
+        """
+        Returns True if key is held down in the current frame.
+
+        Parameter key: The key to test
+        Precondition: key is a string
+        """
+        if key in REPLAY_KEYS:
+            return bool(self._flags & (1 << REPLAY_KEYS.index(key)))
+        return False
+
+
+def load(path):
+    """
+    Returns the tuple (seed, frames) stored in the replay file path.
+
+    Each frame is a tuple (flags, dt).
+
+    Parameter path: The name of the replay file
+    Precondition: path is a string naming a replay file
+    """
+    with open(path,'rb') as file:
+        data = file.read()
+    magic, version, seed = _HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise IOError('%s is not a replay file' % repr(path))
+    body = data[_HEADER.size:]
+    body = body[:len(body)-len(body)%_FRAME.size]
+    return (seed,list(_FRAME.iter_unpack(body)))
+
+
+def replay(path, observer=None, config=None):
+    """
+    Plays the replay file path again through Wave.update and returns the Wave.
+
+    The wave is created with the recorded seed, and every recorded frame is
+    passed to Wave.update with the recorded keys, state and dt. If the
+    observer is not None, it is called after each frame with the frame number
+    and the wave, which is where to put breakpoints or timers.
+
+    The file does not store the settings of the wave, so a wave recorded
+    with settings other than the defaults must be replayed with the same
+    config.
+
+    Parameter path: The name of the replay file
+    Precondition: path is a string naming a replay file
+
+    Parameter observer: A function to call after every frame
+    Precondition: observer is None or a function taking an int and a Wave
+
+    Parameter config: The settings the wave was recorded with
+    Precondition: config is a GameConfig object, or None for the defaults
+    """
+    from wave import Wave
+    seed, frames = load(path)
+    wave = Wave(seed,None,None,config)
+    input = ReplayInput()
+    for number in range(len(frames)):
+        flags, dt = frames[number]
+        if flags & _NEWSHIP:
+            wave.setNewShip()
+        input.setFlags(flags)
+        wave.update(input,(flags >> 4) & 7,dt)
+        if not observer is None:
+            observer(number,wave)
+    return wave
@@ -0,0 +1,306 @@
+"""
+Multiprocess rollout module for Alien Invaders
+
+This module contains the class RolloutPool, which plays many headless waves
+of Alien Invaders on every core of the machine. We use it for the nightly
+balance sweeps. Each game is a seed and a GameConfig with the settings
+for ALIEN_ROWS, ALIENS_IN_ROW, ALIEN_SPEED and BOLT_RATE, and the function
+grid builds every combination of them.
+
+The games are split into contiguous shards, and each worker process plays
+a shard with a Simulation from simulate.py. The tasks and the results are
+never pickled. They are stored in two NumPy arrays in shared memory, with
+one row per game. The workers read their tasks from the first array and
+write their results straight into the second one, and only send back the
+bounds of each shard when it is finished. So the cost of the pool does not
+grow with the number of games, and the results can be read while the other
+shards are still being played.
+
+Cole Breen (ctb93) Luke Kulm (lbk73)
+December 9, 2021
+"""
+import simulate     # Must come before game2d, to guarantee the headless backend
+
+import itertools
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from consts import *
+
+# The columns of each task
+TASK_FIELDS = ('seed','rows','perrow','speed','rate')
+# The columns of each result
+RESULT_FIELDS = ('won','lost','frames','aliens','lives')
+# The maximum number of frames in each game (about 10 minutes at 60 FPS)
+MAX_FRAMES = 36000
+# The number of shards given to each worker, to balance the load
+SHARDS_PER_WORKER = 4
+# The seeds must be below this value, so that a float stores them exactly
+MAX_SEED = 2**53
+
+
+# HELPER FUNCTIONS
+def grid(seeds, rows=(ALIEN_ROWS,), perrow=(ALIENS_IN_ROW,),
+         speed=(ALIEN_SPEED,), rate=(BOLT_RATE,)):
+    """
+    Returns an (N, 5) array of tasks, one for every combination of values.
+
+    The columns of the array are TASK_FIELDS. The seeds vary fastest, so
+    the games of one configuration are next to each other.
+
+    Parameter seeds: The seeds of the games
+    Precondition: seeds is a sequence of ints in 0..MAX_SEED-1
+
+    Parameter rows: The values of ALIEN_ROWS
+    Precondition: rows is a sequence of ints in 1..10
+
+    Parameter perrow: The values of ALIENS_IN_ROW
+    Precondition: perrow is a sequence of ints in 1..15
+
+    Parameter speed: The values of ALIEN_SPEED
+    Precondition: speed is a sequence of floats > 0
+
+    Parameter rate: The values of BOLT_RATE
+    Precondition: rate is a sequence of ints >= 1
+    """
+    for seed in seeds:
+        assert isinstance(seed,(int,np.integer)) and 0 <= seed < MAX_SEED, \
+            'seed %s is not a valid int' % repr(seed)
+    product = itertools.product(rows,perrow,speed,rate,seeds)
+    return np.array([(s,r,p,v,b) for (r,p,v,b,s) in product],
+        dtype=float).reshape(-1,len(TASK_FIELDS))
+
+
+def sweep(sim):
+    """
+    Returns the keys held down by the default player of a rollout.
+
+    The player always fires, and sweeps right for a second and then left
+    for a second.
+
+    Parameter sim: The game being played
+    Precondition: sim is a Simulation object
+    """
+    return ('up','right') if sim.getFrames() % 120 < 60 else ('up','left')
+
+
+def configure(task):
+    """
+    Returns the GameConfig of a task.
+
+    Parameter task: The game to play
+    Precondition: task is a sequence of numbers in TASK_FIELDS order
+    """
+    seed, rows, perrow, speed, rate = task
+    return GameConfig(alien_rows=int(rows),aliens_in_row=int(perrow),
+        alien_speed=float(speed),bolt_rate=int(rate))
+
+
+def play(task, policy=sweep, max_frames=MAX_FRAMES, dt=1/60):
+    """
+    Plays one game and returns its result, a tuple in RESULT_FIELDS order.
+
+    The game is over when it is won or lost, or after max_frames frames. The
+    game gets its own GameConfig, so it does not change the settings of any
+    other game in this process.
+
+    Parameter task: The game to play
+    Precondition: task is a sequence of numbers in TASK_FIELDS order
+
+    Parameter policy: The function choosing the keys for each frame
+    Precondition: policy is a function taking a Simulation and returning an
+    iterable of strings
+
+    Parameter max_frames: The maximum number of frames to play
+    Precondition: max_frames is an int > 0
+
+    Parameter dt: The time in seconds of a single frame
+    Precondition: dt is a float > 0
+    """
+    sim = simulate.Simulation(dt,int(task[0]),None,configure(task))
+    sim.run(policy,max_frames)
+    game = sim.getWave()
+    return (game.win(), game.lose(), sim.getFrames(),
+        game.getAliens().getCount(), game.getLives())
+
+
+def _attach(name, shape):
+    """
+    Returns the tuple (memory, array) of an existing shared memory block.
+
+    Parameter name: The name of the shared memory block
+    Precondition: name is a string naming a block of at least shape floats
+
+    Parameter shape: The shape of the array
+    Precondition: shape is a tuple of ints >= 0
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    return (memory, np.ndarray(shape,dtype=float,buffer=memory.buf))
+
+
+def _work(job):
+    """
+    Plays the games of one shard in a worker, and returns its bounds.
+
+    The tasks are read from, and the results written to, the shared memory
+    blocks named in job.
+
+    Parameter job: The shard to play
+    Precondition: job is a tuple (tasks, results, n, start, stop, policy,
+    max_frames, dt) where tasks and results are the names of shared memory
+    blocks with n rows, and start..stop-1 are the rows to play
+    """
+    tname, rname, n, start, stop, policy, max_frames, dt = job
+    tmem, tasks = _attach(tname,(n,len(TASK_FIELDS)))
+    rmem, results = _attach(rname,(n,len(RESULT_FIELDS)))
+    try:
+        for row in range(start,stop):
+            results[row] = play(tasks[row],policy,max_frames,dt)
+    finally:
+        del tasks, results
+        tmem.close()
+        rmem.close()
+    return (start, stop)
+
+
+class RolloutPool(object):
+    """
+    A class to play many headless games on every core of the machine.
+
+    The method stream plays an array of tasks (such as the one made by the
+    function grid) and yields the results of each shard as it is finished.
+    The method run plays them all and returns every result at once:
+
+        with RolloutPool() as pool:
+            results = pool.run(grid(range(100),speed=(0.5,1.0)))
+
+    The results have one row per task, with the columns in RESULT_FIELDS.
+    The policy must be a function at the top level of a module, so that the
+    worker processes can find it.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _pool: the worker processes
+    # Invariant: _pool is a multiprocessing Pool, or None once closed
+    #
+    # Attribute _processes: the number of worker processes
+    # Invariant: _processes is an int > 0
+    #
+    # Attribute _policy: the function choosing the keys of every game
+    # Invariant: _policy is a top level function taking a Simulation
+    #
+    # Attribute _max_frames: the maximum number of frames in each game
+    # Invariant: _max_frames is an int > 0
+    #
+    # Attribute _dt: the time in seconds of a single frame
+    # Invariant: _dt is a float > 0
+
+    # GETTERS
+    def getProcesses(self):
+        """
+        Returns the number of worker processes.
+        """
+        return self._processes
+
+    # INITIALIZER
+    def __init__(self, processes=None, policy=sweep, max_frames=MAX_FRAMES,
+                 dt=1/60):
+        """
+        Initializes a pool of worker processes.
+
+        Parameter processes: The number of worker processes
+        Precondition: processes is an int > 0, or None for one per core
+
+        Parameter policy: The function choosing the keys for each frame
+        Precondition: policy is a top level function taking a Simulation and
+        returning an iterable of strings
+
+        Parameter max_frames: The maximum number of frames in each game
+        Precondition: max_frames is an int > 0
+
+        Parameter dt: The time in seconds of a single frame
+        Precondition: dt is a float > 0
+        """
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        assert type(processes) == int and processes > 0, \
+            'processes %s is not a valid int' % repr(processes)
+        self._processes = processes
+        self._policy = policy
+        self._max_frames = max_frames
+        self._dt = dt
+        # Share one tracker of the shared memory blocks with every worker
+        resource_tracker.ensure_running()
+        self._pool = multiprocessing.Pool(processes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    # METHODS TO PLAY THE GAMES
+    def stream(self, tasks):
+        """
+        Plays every task, yielding the results of each shard when finished.
+
+        Each value yielded is a tuple (start, results), where results is an
+        array with the results of the tasks start..start+len(results)-1.
+        The shards are yielded in the order they finish, not in task order.
+
+        Parameter tasks: The games to play
+        Precondition: tasks is an (N, 5) array with columns TASK_FIELDS, and
+        every seed is an int in 0..MAX_SEED-1
+        """
+        tasks = np.asarray(tasks,dtype=float).reshape(-1,len(TASK_FIELDS))
+        seeds = tasks[:,0]
+        assert ((seeds >= 0) & (seeds < MAX_SEED)
+            & (seeds == np.floor(seeds))).all(), 'the seeds are not valid ints'
+        n = len(tasks)
+        if n == 0:
+            return
+        size = max(1,-(-n//(self._processes*SHARDS_PER_WORKER)))
+        tmem = shared_memory.SharedMemory(create=True,size=tasks.nbytes)
+        rmem = shared_memory.SharedMemory(create=True,
+            size=n*len(RESULT_FIELDS)*8)
+        results = None
+        try:
+            np.ndarray(tasks.shape,dtype=float,buffer=tmem.buf)[:] = tasks
+            results = np.ndarray((n,len(RESULT_FIELDS)),dtype=float,
+                buffer=rmem.buf)
+            jobs = [(tmem.name,rmem.name,n,start,min(start+size,n),
+                self._policy,self._max_frames,self._dt)
+                for start in range(0,n,size)]
+            for (start, stop) in self._pool.imap_unordered(_work,jobs):
+                yield (start, results[start:stop].copy())
+        finally:
+            results = None
+            tmem.close()
+            tmem.unlink()
+            rmem.close()
+            rmem.unlink()
+
+    def run(self, tasks):
+        """
+        Returns an (N, 5) array with the results of every task, in order.
+
+        The columns of the array are RESULT_FIELDS.
+
+        Parameter tasks: The games to play
+        Precondition: tasks is an (N, 5) array with columns TASK_FIELDS, and
+        every seed is an int in 0..MAX_SEED-1
+        """
+        tasks = np.asarray(tasks,dtype=float).reshape(-1,len(TASK_FIELDS))
+        results = np.zeros((len(tasks),len(RESULT_FIELDS)))
+        for (start, rows) in self.stream(tasks):
+            results[start:start+len(rows)] = rows
+        return results
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        if not self._pool is None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
@@ -0,0 +1,133 @@
+"""
+Headless simulation module for Alien Invaders
+
+This module plays a single wave of Alien Invaders without a window. It uses
+the headless backend of game2d, so it never imports Kivy and allocates no
+graphics. The keys are scripted by the caller instead of read from a
+keyboard, which allows us to run thousands of games in a plain Python
+process (for example, on a build machine with no display).
+
+The game rules all stay in Wave. This module only replaces the parts of
+Invaders that need a window: it passes the input to Wave every frame and
+restores the ship immediately (instead of waiting for the player to press
+'s') whenever a life is lost.
+
+To guarantee the headless backend, this module must be imported before
+anything else imports game2d.
+
+Cole Breen (ctb93) Luke Kulm (lbk73)
+December 9, 2021
+"""
+import os
+os.environ.setdefault('GAME2D_HEADLESS','1')
+
+from consts import *
+from game2d.headless import GInput
+from wave import Wave
+
+
+class Simulation(object):
+    """
+    A class to play a single wave of Alien Invaders without a window.
+
+    Each call to the method step advances the game one frame with the given
+    keys held down. The wave is always updated in STATE_ACTIVE, as the other
+    states only exist to show messages to the player.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _wave: the wave being played
+    # Invariant: _wave is a Wave object
+    #
+    # Attribute _input: the scripted input handed to the wave
+    # Invariant: _input is a headless GInput object
+    #
+    # Attribute _dt: the time in seconds of a single frame
+    # Invariant: _dt is a float > 0
+    #
+    # Attribute _frames: the number of frames played so far
+    # Invariant: _frames is an int >= 0
+
+    # GETTERS AND SETTERS
+    def getWave(self):
+        """
+        Returns the Wave being played.
+        """
+        return self._wave
+
+    def getFrames(self):
+        """
+        Returns the number of frames played so far.
+        """
+        return self._frames
+
+    def isOver(self):
+        """
+        Returns True if the wave has been won or lost, False otherwise.
+        """
+        return self._wave.win() or self._wave.lose()
+
+    # INITIALIZER
+    def __init__(self, dt=1/60, rng=None, recorder=None, config=None):
+        """
+        Initializes a new simulation with a brand new Wave.
+
+        Parameter dt: The time in seconds of a single frame
+        Precondition: dt is a float > 0
+
+        Parameter rng: The source of random choices for the wave
+        Precondition: rng is None (for the random module), an int seed, or a
+        random.Random object
+
+        Parameter recorder: The recorder to log every frame to for replays
+        Precondition: recorder is a ReplayRecorder object or None
+
+        Parameter config: The settings of the wave
+        Precondition: config is a GameConfig object, or None for the defaults
+        """
+        self._wave = Wave(rng,recorder,None,config)
+        self._input = GInput()
+        self._dt = dt
+        self._frames = 0
+
+    # METHODS TO PLAY THE GAME
+    def step(self, keys=()):
+        """
+        Plays a single frame with exactly the given keys held down.
+
+        If the ship was destroyed in this frame and there are lives left, a new
+        ship is created at once. Returns True if the wave is over after this
+        frame, False otherwise. Once the wave is over, this method does nothing.
+
+        Parameter keys: The keys held down for this frame
+        Precondition: keys is an iterable of strings, such as 'left', 'right'
+        or 'up'
+        """
+        if self.isOver():
+            return True
+        self._input.set_keys(keys)
+        self._wave.update(self._input,STATE_ACTIVE,self._dt)
+        self._frames += 1
+        if self._wave.getReset() and self._wave.getLives() > 0:
+            self._wave.setNewShip()
+        return self.isOver()
+
+    def run(self, policy, max_frames=None):
+        """
+        Plays the wave until it is over or max_frames frames have been played.
+
+        The function policy is called once per frame with this simulation as
+        its argument, and must return the keys to hold down for that frame.
+        Returns True if the wave is over, False otherwise.
+
+        Parameter policy: The function choosing the keys for each frame
+        Precondition: policy is a function taking a Simulation and returning an
+        iterable of strings
+
+        Parameter max_frames: The maximum number of frames to play
+        Precondition: max_frames is an int >= 0 or None (for no limit)
+        """
+        while not self.isOver():
+            if max_frames is not None and self._frames >= max_frames:
+                return False
+            self.step(policy(self))
+        return True
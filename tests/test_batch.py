@@ -0,0 +1,82 @@
+"""
+Tests for the batched waves of Alien Invaders
+
+BatchWave plays many waves at once with NumPy. It has its own random
+generator, so it cannot play the same games as Wave, but it follows the
+same rules. These tests check that it wins and loses about as often as a
+Simulation, using the headless backend of game2d.
+
+Run them from the root folder of the game with
+
+    python -m pytest tests
+
+Cole Breen (ctb93) Luke Kulm (lbk73)
+December 9, 2021
+"""
+import os
+import sys
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import simulate     # Must come before game2d, to guarantee the headless backend
+
+import numpy as np
+import batch
+from consts import *
+
+# The seed of the batch
+SEED = 1110
+# The settings of the rate comparison, so that about half the waves are won
+RATES = GameConfig(alien_rows=2,aliens_in_row=4,alien_speed=0.5,bolt_rate=10)
+# The number of waves played by Simulation in the rate comparison
+SIM_GAMES = 20
+# The number of waves played by BatchWave in the rate comparison
+BATCH_GAMES = 200
+# The largest difference allowed between the win rates of the two
+RATE_TOLERANCE = 0.2
+# The maximum number of frames in each wave
+MAX_FRAMES = 20000
+
+
+# HELPER FUNCTIONS
+def sweep(sim):
+    """
+    Returns the keys held down by the scripted player of a Simulation.
+
+    The player always fires. It moves left to the edge of the screen, and
+    then sweeps across the whole screen and back every 320 frames.
+
+    Parameter sim: The game being played
+    Precondition: sim is a Simulation object
+    """
+    return ('up','left') if (sim.getFrames()+80) % 320 < 160 else ('up','right')
+
+
+def batch_sweep(games):
+    """
+    Returns the keys (left, right, fire) of sweep for every game of a batch.
+
+    Parameter games: The games being played
+    Precondition: games is a BatchWave object
+    """
+    left = (games.getFrames()+80) % 320 < 160
+    return (left,~left,np.ones_like(left))
+
+
+# TESTS
+def test_batch_rates():
+    """
+    Tests that BatchWave wins and loses as often as Simulation.
+
+    The two use different random generators, so only the rates must agree.
+    """
+    won = 0
+    for seed in range(SIM_GAMES):
+        sim = simulate.Simulation(1/60,seed,None,RATES)
+        assert sim.run(sweep,MAX_FRAMES)
+        won += sim.getWave().win()
+
+    games = batch.BatchWave(BATCH_GAMES,RATES,seed=SEED)
+    bwon, blost, lives = games.run(batch_sweep,MAX_FRAMES)
+    assert games.isOver()
+    assert (bwon != blost).all()
+    assert abs(won/SIM_GAMES-bwon.mean()) < RATE_TOLERANCE
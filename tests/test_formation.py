@@ -0,0 +1,51 @@
+"""
+Tests for the alien formation of Alien Invaders
+
+Formation finds the aliens hit by a bolt with a grid broadphase instead of
+testing every alien. These tests check that it finds exactly the aliens
+that Alien.collides would, using the headless backend of game2d.
+
+Run them from the root folder of the game with
+
+    python -m pytest tests
+
+Cole Breen (ctb93) Luke Kulm (lbk73)
+December 9, 2021
+"""
+import os
+import sys
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import simulate     # Must come before game2d, to guarantee the headless backend
+
+import numpy as np
+import models
+from consts import *
+
+
+# TESTS
+def test_formation_hits():
+    """
+    Tests that Formation.hitsAt agrees with Alien.collides for every alien.
+
+    A few aliens are killed first, and the bolts are placed on a grid
+    covering the formation and its edges.
+    """
+    aliens = models.Formation()
+    for (row, col) in ((0,0),(1,3),(2,5),(ALIEN_ROWS-1,ALIENS_IN_ROW-1)):
+        aliens.kill(row,col)
+    aliens.shift(7,-11)
+
+    left = aliens.getX(0,0)-ALIEN_WIDTH
+    right = aliens.getX(0,ALIENS_IN_ROW-1)+ALIEN_WIDTH
+    top = aliens.getY(0,0)+ALIEN_HEIGHT
+    bottom = aliens.getY(ALIEN_ROWS-1,0)-ALIEN_HEIGHT
+    alive = [((row, col), models.Alien(aliens.getX(row,col)-ALIEN_WIDTH/2,
+        aliens.getY(row,col)+ALIEN_HEIGHT/2,ALIEN_IMAGES[0]))
+        for row in range(ALIEN_ROWS) for col in range(ALIENS_IN_ROW)
+        if aliens.isAlive(row,col)]
+    for x in np.arange(left,right,3.5).tolist():
+        for y in np.arange(bottom,top,3.5).tolist():
+            bolt = models.Bolt(x,y,BOLT_SPEED)
+            expected = [index for (index, alien) in alive if alien.collides(bolt)]
+            assert sorted(aliens.hitsAt(x,y)) == expected, (x, y)
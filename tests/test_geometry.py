@@ -0,0 +1,74 @@
+"""
+Tests for the geometry of the headless backend of game2d
+
+The headless classes promise the same geometry as the Kivy classes, so that
+a game simulated without a window plays exactly as it does on screen. These
+tests build the same shape with both backends and compare their answers.
+The Kivy shapes are never drawn, so no window is needed, but the tests are
+skipped if Kivy is not installed.
+
+Run them from the root folder of the game with
+
+    python -m pytest tests
+
+Cole Breen (ctb93) Luke Kulm (lbk73)
+December 9, 2021
+"""
+import os
+import sys
+
+os.environ.setdefault('KIVY_NO_ARGS','1')
+os.environ.setdefault('KIVY_NO_WINDOW','1')
+os.environ.setdefault('GAME2D_HEADLESS','1')   # For the other test modules
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from game2d import headless
+
+# Points inside, on the scaled edge and outside of a 20x20 shape at the origin
+POINTS = [(0,0),(5,5),(9,0),(14,0),(0,14),(19,19),(25,0)]
+
+
+def backends():
+    """
+    Returns the tuple (kivy, headless) of the modules with GRectangle.
+
+    The test is skipped if Kivy is not installed.
+    """
+    pytest.importorskip('kivy')
+    from game2d import grectangle
+    return (grectangle,headless)
+
+
+@pytest.mark.parametrize('scale,angle',[(1,0),(2,0),((2,0.5),0),(2,30),(0.5,45)])
+def test_rectangle_contains(scale, angle):
+    """
+    Tests that both backends agree on which points a rectangle contains.
+
+    An unrotated shape ignores its scale in both backends, and a rotated
+    one undoes both rotation and scale.
+    """
+    results = []
+    for module in backends():
+        shape = module.GRectangle(x=0,y=0,width=20,height=20)
+        shape.scale = scale
+        shape.angle = angle
+        results.append(([shape.contains(p) for p in POINTS],
+            shape.contains_many(POINTS).tolist()))
+    assert results[0] == results[1]
+    assert results[1][0] == results[1][1]
+
+
+@pytest.mark.parametrize('scale,angle',[(2,0),(2,30)])
+def test_ellipse_contains(scale, angle):
+    """
+    Tests that both backends agree on which points an ellipse contains.
+    """
+    results = []
+    for module in backends():
+        shape = module.GEllipse(x=0,y=0,width=20,height=20)
+        shape.scale = scale
+        shape.angle = angle
+        results.append(([shape.contains(p) for p in POINTS],
+            shape.contains_many(POINTS).tolist()))
+    assert results[0] == results[1]
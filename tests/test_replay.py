@@ -0,0 +1,70 @@
+"""
+Tests for the replays of Alien Invaders
+
+A wave is completely determined by its seed and its input, so a replay
+file must play back to exactly the state of the wave it recorded. These
+tests check that without a window, using the headless backend of game2d.
+
+Run them from the root folder of the game with
+
+    python -m pytest tests
+
+Cole Breen (ctb93) Luke Kulm (lbk73)
+December 9, 2021
+"""
+import os
+import sys
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import simulate     # Must come before game2d, to guarantee the headless backend
+
+import replay
+from consts import *
+
+# The seed of the recorded wave
+SEED = 1110
+
+
+# HELPER FUNCTIONS
+def sweep(sim):
+    """
+    Returns the keys held down by the scripted player of a Simulation.
+
+    The player always fires. It moves left to the edge of the screen, and
+    then sweeps across the whole screen and back every 320 frames.
+
+    Parameter sim: The game being played
+    Precondition: sim is a Simulation object
+    """
+    return ('up','left') if (sim.getFrames()+80) % 320 < 160 else ('up','right')
+
+
+def state(wave):
+    """
+    Returns a tuple describing everything on screen in wave.
+
+    Parameter wave: The wave to describe
+    Precondition: wave is a Wave object
+    """
+    ship = wave.getShip()
+    xs, ys, vs = wave.getBolts().getArrays()
+    aliens = wave.getAliens()
+    return (wave.win(), wave.lose(), wave.getLives(), wave.getDirection(),
+        None if ship is None else ship.getX(), aliens.getX(0,0),
+        aliens.getY(0,0), aliens.getAlive().tolist(), xs.tolist(),
+        ys.tolist(), vs.tolist())
+
+
+# TESTS
+def test_replay(tmp_path):
+    """
+    Tests that replaying a recorded Simulation ends in the same state.
+    """
+    path = str(tmp_path/'wave.rpl')
+    recorder = replay.ReplayRecorder(path,SEED)
+    sim = simulate.Simulation(1/60,SEED,recorder)
+    sim.run(sweep,3000)
+    recorder.close()
+
+    assert recorder.getFrames() == sim.getFrames()
+    assert state(replay.replay(path)) == state(sim.getWave())
@@ -16,11 +16,15 @@ answer.
 Cole Breen (ctb93) Luke Kulm (lbk73)
 December 9, 2021
 """
-from game2d import *
+from game2d import GPath
 from consts import *
 from models import *
+import contextlib
 import random
 
+# The section used for every stage of a wave that is not profiled
+_UNTIMED = contextlib.nullcontext()
+
 # PRIMARY RULE: Wave can only access attributes in models.py via getters/setters
 # Wave is NOT allowed to access anything in app.py (Subcontrollers are not
 # permitted to access anything in their parent. To see why, take CS 3152)
@@ -54,16 +58,17 @@ class Wave(object):
     # Attribute _ship: the player ship to control
     # Invariant: _ship is a Ship object or None
     #
-    # Attribute _aliens: the 2d list of aliens in the wave
-    # Invariant: _aliens is a rectangular 2d list containing Alien objects or None
+    # Attribute _aliens: the formation of aliens in the wave
+    # Invariant: _aliens is a Formation object
     #
     # Attribute _bolts: the laser bolts currently on screen, initially empty
-    # Invariant: _bolts is a list of Bolt objects, possibly empty
+    # Invariant: _bolts is a BoltManager object
     #
     # Attribute _dline: the defensive line being protected
     # Invariant : _dline is a GPath object
     #
-    # Attribute _lives: the number of lives left, initially set to SHIP_LIVES
+    # Attribute _lives: the number of lives left, initially the ship lives of
+    #                   the GameConfig
     # Invariant: _lives is an int >= 0
     #
     # Attribute _time: the amount of time since the last Alien "step" that
@@ -75,11 +80,12 @@ class Wave(object):
     # Invariant: _direction is a string, either 'right' or 'left'
     #
     # Attribute _bolt_rate: the rate at which the bolt fires
-    # Invariant: _bolt_rate is a random int between 1 and the constant BOLT_RATE
+    # Invariant: _bolt_rate is a random int between 1 and the bolt rate of the
+    #            GameConfig
     #
     # Attribute _alien_steps: the number of steps the aliens have taken since
     #            the last bolt fired from the aliens
-    # Invariant: _bolt_steps is an int >=0 and <=BOLT_RATE that starts at 0
+    # Invariant: _bolt_steps is an int >=0 and <=_bolt_rate that starts at 0
     #
     # Attribute _animator: A coroutine for performing an animation, initially
     #                       equal to None
@@ -91,6 +97,24 @@ class Wave(object):
     # Attribute _reset: the reset status of the ship, initially set to False
     # Invarient: _reset is a boolean either True or False
     #
+    # Attribute _rng: the source of every random choice in this wave
+    # Invariant: _rng is the random module or a random.Random object
+    #
+    # Attribute _recorder: the replay recorder for this wave, if any
+    # Invariant: _recorder is a ReplayRecorder object or None
+    #
+    # Attribute _profiler: the profiler timing the stages of update, if any
+    # Invariant: _profiler is a Profiler object or None
+    #
+    # Attribute _config: the settings of this wave
+    # Invariant: _config is a GameConfig object
+    #
+    # Attribute _shipx: the x value of the ship at the start of the last update
+    # Invariant: _shipx is a float, or None if the ship is newer than that
+    #
+    # Attribute _shipview: the copy of the ship drawn between two positions
+    # Invariant: _shipview is a Ship object, or None until first needed
+    #
     # You may change any attribute above, as long as you update the invariant
     # You may also add any new attributes as long as you document them.
     # LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
@@ -110,15 +134,53 @@ class Wave(object):
         """
         return self._lives
 
+    def getShip(self):
+        """
+        Returns the player ship, or None if it was destroyed.
+        """
+        return self._ship
+
+    def getAliens(self):
+        """
+        Returns the Formation of aliens in this wave.
+        """
+        return self._aliens
+
+    def getBolts(self):
+        """
+        Returns the BoltManager with the bolts on screen.
+        """
+        return self._bolts
+
+    def getConfig(self):
+        """
+        Returns the GameConfig with the settings of this wave.
+        """
+        return self._config
+
+    def getDirection(self):
+        """
+        Returns the direction the aliens are marching, 'right' or 'left'.
+        """
+        return self._direction
+
+    def isExploding(self):
+        """
+        Returns True if the ship is exploding, False otherwise.
+        """
+        return not self._animator is None
+
     def setNewShip(self):
         """
         Sets a new ship as a default ship using the ship initializer
         _ship_init()
         """
+        if not self._recorder is None:
+            self._recorder.newShip()
         self._ship_init()
 
     # INITIALIZER (standard form) TO CREATE SHIP AND ALIENS
-    def __init__(self):
+    def __init__(self, rng=None, recorder=None, profiler=None, config=None):
         """
         Initializes a new Wave object.
 
@@ -127,51 +189,64 @@ class Wave(object):
 
         This function uses helper methods for initialization of the ship,
         aliens, and defense line to initialize each for the start of the game.
-        """
+
+        All of the random choices of the wave (when the aliens fire, and which
+        alien fires) are drawn from rng. Two waves with equally seeded rngs
+        that get the same input play exactly the same game.
+
+        The size of the grid of aliens, their speed and rate of fire, and the
+        rules of the ship and bolts are the settings of config. The models of
+        the wave are made with the same config.
+
+        Parameter rng: The source of random choices
+        Precondition: rng is None (for the random module), an int seed, or a
+        random.Random object
+
+        Parameter recorder: The recorder to log every frame to for replays
+        Precondition: recorder is a ReplayRecorder object or None
+
+        Parameter profiler: The profiler to time the stages of update with
+        Precondition: profiler is a Profiler object or None
+
+        Parameter config: The settings of this wave
+        Precondition: config is a GameConfig object, or None for the defaults
+        """
+        if config is None:
+            config = GameConfig()
+        self._config = config
+        if rng is None:
+            rng = random
+        elif type(rng) == int:
+            rng = random.Random(rng)
+        self._rng = rng
+        self._recorder = recorder
+        self._profiler = profiler
         self._alien_init()
         self._ship_init()
         self._dline_init()
         self._time = 0
         self._direction = 'right'
-        self._bolts = []
-        self._bolt_rate = random.randint(1,BOLT_RATE)
+        self._bolts = BoltManager()
+        self._bolt_rate = self._rng.randint(1,config.getBoltRate())
         self._alien_steps = 0
         self._animator = None
         self._ship_hurt = None
-        self._lives = SHIP_LIVES
+        self._lives = config.getShipLives()
+        self._shipview = None
 
     def _alien_init(self):
         """
         Helper method for initializer that creates the aliens and stores them
         inside of attribute self._aliens.
 
-        This method creates a wave of Alien objects, that are ALIEN_H_SEP and
+        This method creates a Formation of aliens, that are ALIEN_H_SEP and
         ALIEN_V_SEP apart from each other. The left edge of the wave is
         ALIEN_H_SEP from the left edge of the window, and the top edge of the
         wave is ALIEN_CEILING from the top of the window. There are ALIEN_ROWS
-        rows and ALIENS_IN_ROW aliens per row. The wave of aliens is stored as
-        a 2-d list of Alien objects in self._aliens.
-        """
-        self._aliens = None
-        for x in range(ALIEN_ROWS):
-            row = []
-            left_edge = ALIEN_H_SEP
-            top_edge = GAME_HEIGHT-ALIEN_CEILING-x*(ALIEN_V_SEP+ALIEN_HEIGHT)
-            imgval = (ALIEN_ROWS)-(x)
-            if imgval%6 == 1 or imgval%6 == 2:
-                image = ALIEN_IMAGES[0]
-            if imgval%6 == 3 or imgval%6 == 4:
-                image = ALIEN_IMAGES[1]
-            if imgval%6 == 5 or imgval%6 == 0:
-                image = ALIEN_IMAGES[2]
-            for y in range(ALIENS_IN_ROW):
-                newalien = Alien(left_edge,top_edge,image)
-                row = row + [newalien]
-                left_edge = left_edge + ALIEN_WIDTH + ALIEN_H_SEP
-            if self._aliens == None:
-                self._aliens = [row]
-            elif self._aliens != None:
-                self._aliens = self._aliens + [row]
+        rows and ALIENS_IN_ROW aliens per row. The positions of the aliens are
+        stored in the arrays of the Formation, not in the Alien objects.
+        """
+        self._aliens = Formation(self._config)
 
     def _ship_init(self):
         """
@@ -182,7 +257,8 @@ class Wave(object):
         """
         self._ship = None
         self._reset = False
-        self._ship = Ship(GAME_WIDTH/2-SHIP_WIDTH/2)
+        self._ship = Ship(GAME_WIDTH/2-SHIP_WIDTH/2,self._config)
+        self._shipx = None
 
     def _dline_init(self):
         """
@@ -190,10 +266,12 @@ class Wave(object):
         The black defense line initialized is line of height of 2 and a width of
         GAME_WIDTH using a constructor of class GPath and setting it to
         attribute self._dline. The line also tells the player how far the aliens
-        can move until the player loses the game.
+        can move until the player loses the game. Its height is the defense
+        line of the GameConfig.
         """
+        line = self._config.getDefenseLine()
         self._dline = (GPath(linewidth=2,
-        points=[0,DEFENSE_LINE,GAME_WIDTH,DEFENSE_LINE], linecolor = [0,0,0,1]))
+        points=[0,line,GAME_WIDTH,line], linecolor = [0,0,0,1]))
 
     # UPDATE METHOD TO MOVE THE SHIP, ALIENS, AND LASER BOLTS
     def update(self,input,state,dt):
@@ -204,6 +282,14 @@ class Wave(object):
         them, deleting them, and performing any other operations like explosion
         courotine.
 
+        If this wave has a profiler, the stages alien_move, bolt_update,
+        collide_aliens, collide_ship and animator are each timed in a section
+        of the same name.
+
+        Before anything moves, the positions of the ship, the bolts and the
+        aliens are remembered, so that draw can show them part of the way
+        between this update and the previous one.
+
         Parameter input: user input
         Precondition: input is an instance of GInput
 
@@ -215,18 +301,39 @@ class Wave(object):
         Parameter dt: amount of time since last frame
         Precondition: dt is a float
         """
+        if not self._recorder is None:
+            self._recorder.record(input,state,dt)
+        self._snapshot()
         if self._animator is None:
             self.left_right_ship(input,state)
-        self.alien_move(dt)
-        self.bolt_update(input,state)
-        if self._bolt_rate == self._alien_steps:
-            alien = self.pick_alien(self.nonempty())
-            self.alien_bolt(alien)
-            self._bolt_rate = random.randint(1,BOLT_RATE)
-            self._alien_steps = 0
-        self.collide_aliens()
+        with self._stage('alien_move'):
+            self.alien_move(dt)
+        with self._stage('bolt_update'):
+            self.bolt_update(input,state)
+            if self._bolt_rate == self._alien_steps:
+                alien = self.pick_alien(self.nonempty())
+                self.alien_bolt(alien)
+                self._bolt_rate = self._rng.randint(1,self._config.getBoltRate())
+                self._alien_steps = 0
+        with self._stage('collide_aliens'):
+            self.collide_aliens()
         if self._animator is None:
-            self.collide_ship()
+            with self._stage('collide_ship'):
+                self.collide_ship()
+        with self._stage('animator'):
+            self.animate_ship(dt)
+
+    def animate_ship(self,dt):
+        """
+        Runs the explosion of the ship one frame, starting it if the ship was
+        just hurt.
+
+        When the explosion coroutine finishes, the ship is removed, every bolt
+        is cleared and a life is lost.
+
+        Parameter dt: amount of time since last frame
+        Precondition: dt is a float
+        """
         if not self._animator is None:
             try:
                 self._animator.send(dt)
@@ -234,18 +341,33 @@ class Wave(object):
                 self._animator = None
                 self._ship_hurt = None
                 self._ship = None
-                self._bolts = []
+                self._bolts.clear()
                 self._reset = True
                 self._lives -= 1
         elif self._ship_hurt == 'hurt':
             self._animator = self._ship.animate_explosion()
             next(self._animator)
 
+    def _stage(self,name):
+        """
+        Returns the profiler section to time the stage name of update.
+
+        If this wave has no profiler, this is a context manager that does
+        nothing.
+
+        Parameter name: The name of the stage
+        Precondition: name is a string
+        """
+        if self._profiler is None:
+            return _UNTIMED
+        return self._profiler.section(name)
+
     def left_right_ship(self,input,state):
         """
-        If the state is active then moves the ship to the left a SHIP_MOVEMENT
-        amount if the player presses the left key, and moves the ship to the
-        right a SHIP_MOVEMENT amount if the player presses the right key.
+        If the state is active then moves the ship to the left by the ship
+        movement of the GameConfig if the player presses the left key, and
+        moves the ship to the right by the same amount if the player presses
+        the right key.
 
         Parameter input: user input
         Precondition: input is an instance of GInput
@@ -258,10 +380,10 @@ class Wave(object):
         if state == STATE_ACTIVE:
             if self._ship != None and input.is_key_down('left') \
             and self.restrict_ship('Left'):
-                self._ship.setX(-SHIP_MOVEMENT)              #move left
+                self._ship.setX(-self._config.getShipMovement()) #move left
             if self._ship != None and input.is_key_down('right') \
             and self.restrict_ship('Right'):
-                self._ship.setX(SHIP_MOVEMENT)
+                self._ship.setX(self._config.getShipMovement())
 
     def restrict_ship(self, dir):
         """
@@ -271,11 +393,12 @@ class Wave(object):
         Parameter dir: The direction of movement.
         Precondition: is a string either 'Left' or 'Right' or neither.
         """
+        movement = self._config.getShipMovement()
         if self._ship != None and dir == 'Left' \
-        and (self._ship.getX()-SHIP_WIDTH/2-SHIP_MOVEMENT)<0:
+        and (self._ship.getX()-SHIP_WIDTH/2-movement)<0:
             return False
         if self._ship != None and dir == 'Right' \
-        and (self._ship.getX()+SHIP_WIDTH/2+SHIP_MOVEMENT)> GAME_WIDTH:
+        and (self._ship.getX()+SHIP_WIDTH/2+movement)> GAME_WIDTH:
             return False
         else:
             return True
@@ -294,33 +417,25 @@ class Wave(object):
         """
         if self._ship != None and state == STATE_ACTIVE \
         and input.is_key_down('up') and self._animator is None:
-            no_bolt = True
-            for bolt in self._bolts:
-                if bolt.isPlayerBolt():            #comment out for machine gun
-                    no_bolt = False
-            if no_bolt == True:
-                self._bolts.append(Bolt(self._ship.getX(),self._ship.getY()+\
-                SHIP_HEIGHT/2,BOLT_SPEED))
-        copy = self._bolts[:]
-        for bolt in self._bolts:
-            bolt.bolt_move()
-            if bolt.bolt_remove():
-                copy.remove(bolt)
-        self._bolts = copy
+            if not self._bolts.hasPlayerBolt():     #comment out for machine gun
+                self._bolts.fire(self._ship.getX(),self._ship.getY()+\
+                SHIP_HEIGHT/2,self._config.getBoltSpeed())
+        self._bolts.move()
 
     def alien_bolt(self, alien):
         """
-        Creates a bolt object (alien bolt) and appends it to self._bolts
+        Fires a bolt (alien bolt) from the manager self._bolts
 
         This method uses the aliens position and ALIEN_HEIGHT to determine the
-        bolts starting position and the velocity is -BOLT_SPEED because the bolt
-        is moving down.
+        bolts starting position and the velocity is minus the bolt speed of the
+        GameConfig because the bolt is moving down.
 
         Parameter alien: the alien that the bolt will be drawn under
         Precondition: alien is a valid instance of alien from self._aliens
         """
-        self._bolts.append(Bolt(self._aliens[alien[0]][alien[1]].getX(), \
-        self._aliens[alien[0]][alien[1]].getY()-ALIEN_HEIGHT/2,-BOLT_SPEED))
+        self._bolts.fire(self._aliens.getX(alien[0],alien[1]), \
+        self._aliens.getY(alien[0],alien[1])-ALIEN_HEIGHT/2, \
+        -self._config.getBoltSpeed())
 
     def alien_move(self,dt):
         """
@@ -330,9 +445,10 @@ class Wave(object):
         Parameter dt: amount of time since last frame
         Precondition: dt is a float
         """
-        if self._time < ALIEN_SPEED:
+        speed = self._config.getAlienSpeed()
+        if self._time < speed:
             self._time += dt
-        if self._time >= ALIEN_SPEED:
+        if self._time >= speed:
             if(self._direction == 'right'):
                 self.move_aliens_right()
                 self._alien_steps += 1
@@ -349,21 +465,15 @@ class Wave(object):
         Invokes the method rightmost() to determine if the right most alien is too
         close to the right edge of the window. If so, it moves the aliens down
         and sets self._direction to 'left'. Otherwise the aliens are moved right
-        by ALIEN_H_WALK.
-        """
-        if self.rightmost().getX() + ALIEN_WIDTH/2 + ALIEN_H_SEP > GAME_WIDTH:
-            for xval in range(len(self._aliens)):
-                for yval in range(len(self._aliens[xval])):
-                    if self._aliens[xval][yval] != None:
-                        self._aliens[xval][yval].\
-                        setY(self._aliens[xval][yval].getY()-ALIEN_H_WALK)
+        by ALIEN_H_WALK. Either way, the whole formation is moved in one step.
+        """
+        right = self.rightmost()
+        if self._aliens.getX(right[0],right[1]) + ALIEN_WIDTH/2 + ALIEN_H_SEP \
+        > GAME_WIDTH:
+            self._aliens.shift(0,-ALIEN_H_WALK)
             self._direction = 'left'
             return None
-        for xval in range(len(self._aliens)):
-            for yval in range(len(self._aliens[xval])):
-                if self._aliens[xval][yval] != None:
-                    self._aliens[xval][yval]\
-                    .setX(self._aliens[xval][yval].getX()+ALIEN_H_WALK)
+        self._aliens.shift(ALIEN_H_WALK,0)
 
     def move_aliens_left(self):
         """
@@ -373,203 +483,165 @@ class Wave(object):
         Invokes the method leftmost() to determine if the left most alien is too
         close to the left edge of the window. If so, it moves the aliens down
         and sets self._direction to 'right'. Otherwise the aliens are moved left
-        by ALIEN_H_WALK.
-        """
-        if self.leftmost().getX() - ALIEN_WIDTH/2 - ALIEN_H_SEP < 0:
-            for xval in range(len(self._aliens)):
-                for yval in range(len(self._aliens[xval])):
-                    if self._aliens[xval][yval] != None:
-                        self._aliens[xval][yval]\
-                        .setY(self._aliens[xval][yval].getY()-ALIEN_H_WALK)
+        by ALIEN_H_WALK. Either way, the whole formation is moved in one step.
+        """
+        left = self.leftmost()
+        if self._aliens.getX(left[0],left[1]) - ALIEN_WIDTH/2 - ALIEN_H_SEP < 0:
+            self._aliens.shift(0,-ALIEN_H_WALK)
             self._direction = 'right'
             return None
-        for xval in range(len(self._aliens)):
-            for yval in range(len(self._aliens[xval])):
-                if self._aliens[xval][yval] != None:
-                    self._aliens[xval][yval]\
-                    .setX(self._aliens[xval][yval].getX()-ALIEN_H_WALK)
+        self._aliens.shift(-ALIEN_H_WALK,0)
 
     def nonempty(self):
         """
-        Returns a list of indices representing columns that are nonempty.
+        Returns a tuple of indices representing columns that are nonempty.
 
-        This method loops over self._aliens and determines which columns are
-        nonempty. This collumn is then added to the accumulator nonempties.
-        At the end, the accumulator nonempties is returned.
+        The formation keeps this index up to date as aliens are killed, so
+        this method does not scan self._aliens.
         """
-        nonempties = []
-        for x in range(ALIENS_IN_ROW):
-            empty = True
-            for y in range(ALIEN_ROWS):
-                if self._aliens[y][x] != None:
-                    empty = False
-            if empty == False:
-                nonempties = nonempties + [x]
-        return nonempties
+        return self._aliens.columns()
 
     def pick_alien(self,indices):
         """
         Returns a 2-element tuple with the index representation of an alien.
 
-        This method invokes the random module's choice function to determine a
+        This method invokes the choice method of self._rng to determine a
         random collumn index from the provided indices. Using that index, it
-        determines the alien that is lowest and returns the index representation
+        looks up the alien that is lowest and returns the index representation
         inside of a tuple.
 
         Parameter indices: Indices representing the non-empty collums of self._aliens
-        Precondition: indices is a nonempty list of ints
-        """
-        index = random.choice(indices)
-        row = None
-        rowtest = ALIEN_ROWS-1
-        while row == None:
-            if self._aliens[rowtest][index] != None:
-                row = rowtest
-            if self._aliens[rowtest][index] == None:
-                rowtest -= 1
-        return (row,index)
+        Precondition: indices is a nonempty list or tuple of ints
+        """
+        index = self._rng.choice(indices)
+        return (self._aliens.lowest(index),index)
 
     def leftmost(self):
         """
-        Returns the leftmost Alien object that is closest to the bottom of the
-        window (nonempty) in self._aliens.
+        Returns a 2-element tuple with the index representation of the leftmost
+        alien that is closest to the bottom of the window.
 
-        This method invokes the wave's nonempty() method to find the index of
-        the left-most non-empty collumn. It then uses a while loop to determine
-        which alien is lowest.
+        Both the left-most non-empty collumn and the lowest alien in that
+        column are maintained by the formation, so this takes constant time.
         """
-        left = self.nonempty()[0]
-        row = None
-        rowtest = ALIEN_ROWS-1
-        while row == None:
-            if self._aliens[rowtest][left] != None:
-                row = rowtest
-            if self._aliens[rowtest][left] == None:
-                rowtest -= 1
-        return self._aliens[row][left]
+        left = self._aliens.leftColumn()
+        return (self._aliens.lowest(left),left)
 
     def rightmost(self):
         """
-        Returns the rightmost Alien object that is closest to the bottom of the
-        window (nonempty) in self._aliens.
+        Returns a 2-element tuple with the index representation of the
+        rightmost alien that is closest to the bottom of the window.
 
-        This function invokes the wave's nonempty() method to find the index of
-        the rightmost non-empty collumn. It then uses a while loop to determine
-        which alien is lowest.
+        Both the rightmost non-empty collumn and the lowest alien in that
+        column are maintained by the formation, so this takes constant time.
         """
-        right = self.nonempty()[-1]
-        row = None
-        rowtest = ALIEN_ROWS-1
-        while row == None:
-            if self._aliens[rowtest][right] != None:
-                row = rowtest
-            if self._aliens[rowtest][right] == None:
-                rowtest -= 1
-        return self._aliens[row][right]
+        right = self._aliens.rightColumn()
+        return (self._aliens.lowest(right),right)
 
     def lose(self):
         """
         Returns False if you have not lost and True if you have lost the game.
 
-        Local variable lose, initialy set to False, tracks whether any aliens
-        are below the self._dline. Loops over self._aliens and if any Aliens are
-        below the self._dline, lose is set to True. If self._lives == 0, returns
-        True. If lose == True, returns True. Otherwise, it returns lose (which
-        will be False).
-        """
-        lose = False
-        for x in range(len(self._aliens)):
-            for y in range(len(self._aliens[0])):
-                if self._aliens[len(self._aliens)-x-1][y] != None:
-                    if self._aliens[len(self._aliens)-x\
-                    -1][y].getY()-ALIEN_HEIGHT/2 < DEFENSE_LINE:
-                        lose = True
+        You have lost if self._lives == 0, or if the bottom of any alive alien
+        in the formation is below the defense line of the GameConfig.
+        """
         if self._lives == 0:
             return True
-        if lose == True:
-            return True
-        return lose
+        return self._aliens.below(self._config.getDefenseLine())
 
     def win(self):
         """
         Returns True if player has won. Otherwise, returns False.
 
-        Loops over self._aliens and determines if any of the indices are not
-        equal to None. If there is an index that does not equal None, False is
-        returned. If after looping through self._aliens, and all of the indices
-        are determined to be None, True is returned indicating that you won.
+        The player has won once there are no alive aliens in the formation.
         """
-        for x in range(len(self._aliens)):
-            for y in range(len(self._aliens[0])):
-                if self._aliens[x][y] != None:
-                    return False
-        return True
+        return self._aliens.getCount() == 0
 
     # DRAW METHOD TO DRAW THE SHIP, ALIENS, DEFENSIVE LINE AND BOLTS
-    def draw(self, view):
+    def draw(self, view, alpha=1.0):
         """
         Draws the wave's objects to the view.
 
-        Loops through self._aliens and draws an alien to the view for every
-        index that does not equal None. If self._ship does not equal None, it
+        Draws the formation self._aliens, which draws every alive alien to the
+        view. If self._ship does not equal None, it
         draws a ship to the view. It draws the self._dline to the view. Finally,
-        it loops of the bolts in self._bolts and draws them to the view.
+        it draws the bolts in self._bolts to the view.
+
+        The ship, the aliens and the bolts are drawn alpha of the way from
+        where they were before the last update to where they are now. As the
+        ship is the model itself, a ship between two positions is drawn with
+        the copy self._shipview instead, so the real ship never moves.
 
         Paremter view: The view to draw the obects to.
         Precondition: view is an instance of GView
+
+        Parameter alpha: How far to draw the objects past the last update
+        Precondition: alpha is a float in 0..1
         """
-        for x in range(ALIEN_ROWS):
-            for y in range(ALIENS_IN_ROW):
-                if self._aliens[x][y] != None:
-                    self._aliens[x][y].draw(view)
+        self._aliens.draw(view,alpha)
         if self._ship != None:
-            self._ship.draw(view)
+            x = self._ship.getX()
+            if self._shipx is None or self._shipx == x or alpha >= 1:
+                self._ship.draw(view)
+            else:
+                if self._shipview is None:
+                    self._shipview = Ship(0,self._config)
+                self._shipview.x = self._shipx+(x-self._shipx)*alpha
+                self._shipview.frame = self._ship.frame
+                self._shipview.draw(view)
         self._dline.draw(view)
-        for bolt in self._bolts:
-            bolt.draw(view)
+        self._bolts.draw(view,alpha)
+
+    def _snapshot(self):
+        """
+        Remembers where the ship, the bolts and the aliens are, for draw.
+        """
+        self._shipx = None if self._ship is None else self._ship.getX()
+        self._bolts.snapshot()
+        self._aliens.snapshot()
 
     # HELPER METHODS FOR COLLISION DETECTION
     def collide_aliens(self):
         """
         Determines whether a ship bolt collided with any of the aliens using the
-        Alien class's collides() method.
+        Formation class's hitsAt() method.
 
         Local variable del_index determines the deletion index, and is -1
-        initially, inidcating no deletion index. If any of the bolts in self._bolts
-        hit an alien, as determined by Alien's collides() method, the index of
-        the alien hit in self._aliens is set to None. del_index is set to the
-        index of the bolt that collided with the Alien. Finally, if a bolt
-        struck an Alien (del_index != -1), the index of that bolt is removed
-        from self._bolts.
+        initially, inidcating no deletion index. The player bolts in self._bolts
+        are tested in the order they were fired. If any of them hit an alien,
+        as determined by Formation's hitsAt() method, the alien hit in
+        self._aliens is killed. hitsAt() only tests the grid cells a bolt can
+        overlap, so each bolt costs a constant number of tests. del_index is set
+        to the slot of the bolt that collided with the Alien. Finally, if a
+        bolt struck an Alien (del_index != -1), the bolt in that slot is
+        released from the manager self._bolts.
         """
         del_index = -1
-        for bolt_index in range(len(self._bolts)):
-            for x in range(ALIEN_ROWS):
-                for y in range(ALIENS_IN_ROW):
-                    if self._aliens[x][y] != None \
-                    and self._aliens[x][y].collides(self._bolts[bolt_index]):
-                        self._aliens[x][y] = None
-                        del_index = bolt_index
+        for bolt_index in self._bolts.playerBolts():
+            x = self._bolts.getX(bolt_index)
+            y = self._bolts.getY(bolt_index)
+            for row, col in self._aliens.hitsAt(x,y):
+                self._aliens.kill(row,col)
+                del_index = bolt_index
         if del_index != -1:
-            del self._bolts[del_index]
+            self._bolts.release(del_index)
 
     def collide_ship(self):
         """
-        Determines whether an alien bolt collided with the ship using the Ship
-        class's collides() method.
+        Determines whether an alien bolt collided with the ship using the
+        BoltManager class's lastHit() method.
 
-        Local variable del_index determines the deletion index, and is -1
-        initially, inidcating no deletion index. If any of the bolts in self._bolts
-        hit the ship, as determined by Ship's collides() method, the attribute
-        self._ship_hurt is set to 'hurt' and del_index is set to the index of
-        the bolt that collided with the ship. Finally, if a bolt struck the ship,
-        the index of that bolt is removed from self._bolts.
+        lastHit() tests every alien bolt in self._bolts against the edges of
+        the ship at once, with the same test as Ship's collides() method.
+        del_index is the slot of the last bolt fired that hit the ship, or -1
+        if there is none. If a bolt struck the ship, the attribute
+        self._ship_hurt is set to 'hurt' and the bolt in that slot is released
+        from the manager self._bolts.
         """
-        del_index = -1
-        for bolt_index in range(len(self._bolts)):
-            if self._ship != None \
-            and self._ship.collides(self._bolts[bolt_index]):
-                self._ship_hurt = 'hurt'
-                del_index = bolt_index
+        if self._ship == None:
+            return
+        del_index = self._bolts.lastHit(self._ship.left,self._ship.bottom,
+                                        self._ship.right,self._ship.top,False)
         if del_index != -1:
-            del self._bolts[del_index]
+            self._ship_hurt = 'hurt'
+            self._bolts.release(del_index)